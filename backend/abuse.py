@@ -0,0 +1,189 @@
+import ipaddress
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+from metrics import Counter
+
+# Pulls the email out of a raw JSON body without parsing the whole document
+EMAIL_FIELD = re.compile(rb'"email"\s*:\s*"([^"\\]{1,254})"')
+
+
+def extract_email(body: bytes) -> Optional[str]:
+    """The ``email`` the handler will see, or ``None``.
+
+    The regex is only trusted on plain bodies. A JSON escape (``b\\u006ft``,
+    or an escaped key) or a repeated key (the last one wins when decoded)
+    would make it disagree with pydantic, so those bodies are parsed.
+    """
+    if b"\\" not in body and body.count(b'"email"') <= 1:
+        match = EMAIL_FIELD.search(body)
+        return match.group(1).decode("utf-8", "replace") if match else None
+    try:
+        value = json.loads(body)
+    except ValueError:
+        return None
+    email = value.get("email") if isinstance(value, dict) else None
+    return email if isinstance(email, str) else None
+
+
+class SlidingWindowLimiter:
+    """Per-key request limiter: at most ``limit`` requests per ``window`` seconds.
+
+    Uses the sliding-window counter approximation: each key keeps only the
+    counts of the current and previous fixed windows, and the previous count
+    is weighted by how much of it still overlaps the sliding window. At most
+    ``max_keys`` keys are tracked; the least recently seen are forgotten
+    first, so a flood of distinct keys costs bounded memory. A ``limit`` of 0
+    disables the limiter.
+    """
+
+    def __init__(self, name: str, limit: int, window: float, max_keys: int = 100000):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Count a request for ``key``; 0 if allowed, else seconds until one would be"""
+        if self.limit <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        index = int(now // self.window)
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [index, 0, 0]
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+            if state[0] != index:
+                state[2] = state[1] if state[0] == index - 1 else 0
+                state[0], state[1] = index, 0
+
+        _, current, previous = state
+        elapsed = now - index * self.window
+        if previous * (1 - elapsed / self.window) + current < self.limit:
+            state[1] += 1
+            self.allowed += 1
+            return 0.0
+
+        self.rejected += 1
+        if current >= self.limit:
+            # Wait out this window, then until this window's count has decayed below the limit
+            return (self.window - elapsed) + self.window * (1 - self.limit / current)
+        # Never 0, which callers read as "allowed"
+        return max(self.window * (1 - (self.limit - current) / previous) - elapsed, 0.001)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "window": self.window,
+            "tracked_keys": len(self._keys),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+class AbuseShieldMiddleware:
+    """ASGI middleware shedding form spam before it reaches a handler.
+
+    Applies to POSTs on ``paths`` only. Requests are checked in order of
+    cost: the declared body size, the client IP's rate, then (after reading
+    the raw body) the rate for the submitted ``email``. A rejected request
+    never reaches pydantic, MongoDB or a vendor API. Rate rejections get a
+    429 with ``Retry-After``.
+
+    Behind ``proxy_hops`` reverse proxies the client IP is taken from
+    ``X-Forwarded-For``, counting hops from the right so clients can't spoof it.
+    If that still resolves to an address in ``trusted_proxies`` (a proxy
+    that didn't forward the client, or a misconfigured hop count), every
+    visitor would share one budget, so the IP limit is skipped and only the
+    email limit applies.
+    """
+
+    def __init__(self, app, paths: Iterable[str], ip_limiter: SlidingWindowLimiter, email_limiter: SlidingWindowLimiter,
+                 rejections: Counter, max_body_bytes: int = 16384, proxy_hops: int = 0, trusted_proxies: Iterable[str] = ()):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.ip_limiter = ip_limiter
+        self.email_limiter = email_limiter
+        self.rejections = rejections
+        self.max_body_bytes = max_body_bytes
+        self.proxy_hops = proxy_hops
+        self.trusted_proxies = [ipaddress.ip_network(network.strip()) for network in trusted_proxies if network.strip()]
+
+    def client_ip(self, scope) -> str:
+        if self.proxy_hops:
+            for name, value in scope.get("headers") or []:
+                if name == b"x-forwarded-for":
+                    hops = [hop.strip() for hop in value.decode("latin-1").split(",")]
+                    return hops[max(len(hops) - self.proxy_hops, 0)]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def is_proxy(self, ip: str) -> bool:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    async def reject(self, send, reason: str, status: int, detail: str, retry_after: float = None):
+        self.rejections.labels(reason=reason).inc()
+        headers = [(b"content-type", b"application/json")]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(max(math.ceil(retry_after), 1)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode()})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        for name, value in scope.get("headers") or []:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_body_bytes:
+                return await self.reject(send, "body_size", 413, "Request body too large")
+
+        client_ip = self.client_ip(scope)
+        if not self.is_proxy(client_ip):
+            retry_after = self.ip_limiter.hit(client_ip)
+            if retry_after:
+                return await self.reject(send, "ip", 429, "Too many requests", retry_after)
+
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                return await self.reject(send, "body_size", 413, "Request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+
+        email = extract_email(body)
+        if email:
+            retry_after = self.email_limiter.hit(email.strip().lower())
+            if retry_after:
+                return await self.reject(send, "email", 429, "Too many requests", retry_after)
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
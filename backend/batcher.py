@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into batch calls.
+
+    ``await batcher.submit(item)`` parks the item until ``max_size`` items are
+    waiting or ``max_wait`` seconds have passed since the first one, then
+    ``flush(items)`` runs once for the whole batch. ``flush`` returns one result
+    per item, in order; an ``Exception`` instance in that list is raised to the
+    caller of the matching item only.
+
+    If ``flush`` raises, every caller gets that exception, unless
+    ``isolate(error)`` says the error is about one item the batch can't
+    name (e.g. a reference to a deleted object); then each item is flushed
+    on its own, so the error reaches only the item it belongs to.
+    """
+
+    def __init__(self, name: str, flush: Callable[[List[Any]], Awaitable[List[Any]]], max_size: int = 50, max_wait: float = 0.2,
+                 isolate: Optional[Callable[[Exception], bool]] = None):
+        self.name = name
+        self.flush = flush
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.isolate = isolate
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._batches = 0
+        self._items = 0
+        self._failed_batches = 0
+        self._isolated_batches = 0
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_now)
+
+        return await future
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_one(self, item: Any) -> Any:
+        try:
+            return (await self.flush([item]))[0]
+        except Exception as e:
+            return e
+
+    async def _run(self, batch: list):
+        self._batches += 1
+        self._items += len(batch)
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            self._failed_batches += 1
+            if len(batch) > 1 and self.isolate is not None and self.isolate(e):
+                self._isolated_batches += 1
+                logging.warning(f"{self.name} batch of {len(batch)} failed, retrying items one by one: {e}")
+                results = await asyncio.gather(*(self._flush_one(item) for item, _ in batch))
+            else:
+                logging.error(f"{self.name} batch of {len(batch)} failed: {e}")
+                results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            # The caller may have given up (timeout / cancellation) while the batch was in flight
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "max_size": self.max_size,
+            "max_wait": self.max_wait,
+            "pending": len(self._pending),
+            "in_flight": len(self._tasks),
+            "batches": self._batches,
+            "items": self._items,
+            "failed_batches": self._failed_batches,
+            "isolated_batches": self._isolated_batches,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+        }
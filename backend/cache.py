@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable, Optional
+
+from pymongo import ASCENDING
+
+_MISSING = object()
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire ``ttl`` seconds after being set"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING or item[1] < time.monotonic():
+            if item is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def pop_value(self, value: Any):
+        """Drop every key currently mapped to ``value``"""
+        for key in [k for k, (v, _) in self._data.items() if v == value]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+class MongoBackedCache:
+    """Two-tier key/value cache: a ``TTLCache`` in front of a small MongoDB collection.
+
+    The collection survives restarts and is shared by every worker; its
+    documents expire through a TTL index on ``updated_at``.
+    """
+
+    def __init__(self, collection, key_field: str, value_field: str, max_size: int = 10000,
+                 ttl: float = 3600.0, persist_ttl: float = 30 * 24 * 3600):
+        self.collection = collection
+        self.key_field = key_field
+        self.value_field = value_field
+        self.persist_ttl = persist_ttl
+        self.local = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def ensure_indexes(self):
+        await self.collection.create_index(self.key_field, unique=True)
+        await self.collection.create_index(self.value_field)
+        await self.collection.create_index([("updated_at", ASCENDING)], expireAfterSeconds=int(self.persist_ttl))
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        doc = await self.collection.find_one({self.key_field: key}, {"_id": 0, self.value_field: 1})
+        if doc and doc.get(self.value_field) is not None:
+            value = doc[self.value_field]
+            self.local.set(key, value)
+            return value
+        return None
+
+    async def set(self, key: str, value: Any):
+        # Skip the write when this worker already knows the mapping
+        if self.local.get(key) == value:
+            return
+        self.local.set(key, value)
+        await self.collection.update_one(
+            {self.key_field: key},
+            {"$set": {self.value_field: value, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def invalidate(self, key: str):
+        self.local.pop(key)
+        await self.collection.delete_one({self.key_field: key})
+
+    async def invalidate_value(self, value: Any):
+        self.local.pop_value(value)
+        await self.collection.delete_many({self.value_field: value})
+
+    def stats(self) -> dict:
+        return self.local.stats()
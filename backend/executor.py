@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class BoundedExecutor:
+    """Run blocking SDK calls on a dedicated, size-limited thread pool.
+
+    Callers ``await executor.run(fn, *args, **kwargs)``; the call runs on one of
+    ``max_workers`` threads and the event loop stays free. At most
+    ``max_workers + max_queue`` calls may be in the pool at once, further
+    callers wait for a free slot instead of piling up unbounded work.
+    """
+
+    def __init__(self, name: str, max_workers: int = 8, max_queue: int = 64, default_timeout: Optional[float] = 10.0):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._slots = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._waiting = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._slots
+
+    def _invoke(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool, raising ``asyncio.TimeoutError`` after ``timeout`` seconds"""
+        timeout = self.default_timeout if timeout is None else timeout
+        slots = self._get_slots()
+
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            with self._lock:
+                self._queued += 1
+            future = self._pool.submit(self._invoke, fn, args, kwargs)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                # A call that has not started yet is dropped; a running one finishes in the background
+                if future.cancel():
+                    with self._lock:
+                        self._queued -= 1
+                self._timed_out += 1
+                logging.warning(f"{self.name} call {getattr(fn, '__name__', fn)} timed out after {timeout}s")
+                raise
+            except Exception:
+                self._failed += 1
+                raise
+            self._completed += 1
+            return result
+        finally:
+            slots.release()
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage for sizing ``max_workers`` / ``max_queue``"""
+        with self._lock:
+            active = self._active
+            queued = self._queued
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": active,
+            "queued": queued,
+            "waiting": self._waiting,
+            "saturation": round(active / self.max_workers, 3) if self.max_workers else 0.0,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
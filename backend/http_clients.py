@@ -0,0 +1,86 @@
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+
+class HttpClientRegistry:
+    """Application-scoped ``httpx.AsyncClient`` instances, one per outbound integration.
+
+    Each integration gets its own connection pool, so its limits apply per
+    upstream host, and connections are kept alive between requests instead of
+    paying a TCP/TLS handshake per call. Clients are created on startup and
+    closed on shutdown; ``get`` also creates one on first use.
+    """
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0, http2: bool = False):
+        self.defaults = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "http2": http2,
+        }
+        self._configs: Dict[str, dict] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def register(self, name: str, base_url: Optional[str] = None, **overrides):
+        """Declare an integration; ``overrides`` replace any of the registry defaults.
+
+        A ``transport`` override (e.g. ``httpx.MockTransport`` in tests) is
+        passed straight to the client.
+        """
+        self._configs[name] = {**self.defaults, "base_url": base_url, **overrides}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        config = self._configs.get(name) or {**self.defaults, "base_url": None}
+        http2 = config["http2"]
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logging.warning(f"HTTP/2 requested for {name} but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+
+        return httpx.AsyncClient(
+            base_url=config["base_url"] or "",
+            http2=http2,
+            transport=config.get("transport"),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(
+                connect=config["connect_timeout"],
+                read=config["read_timeout"],
+                write=config["read_timeout"],
+                pool=config["connect_timeout"],
+            ),
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(name)
+        return client
+
+    async def start(self):
+        for name in self._configs:
+            self.get(name)
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "max_connections": config["max_connections"],
+                "open": name in self._clients and not self._clients[name].is_closed,
+            }
+            for name, config in self._configs.items()
+        }
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from cache import TTLCache
+from metrics import Counter
+
+PROCESSING = "processing"
+DONE = "done"
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with a different body"""
+
+
+class IdempotencyStore:
+    """Stored responses for ``Idempotency-Key`` requests.
+
+    Each key is one MongoDB document that starts as a ``processing`` lease
+    and becomes the stored response once the original request finishes; a
+    TTL index on ``expires_at`` drops it after ``ttl`` seconds. Finished
+    responses are also kept in a ``TTLCache``, and duplicates arriving while
+    the original is still running in this process wait on it in memory
+    rather than polling. A lease older than ``lease_ttl`` seconds belongs to
+    a worker that died mid-request and is taken over.
+    """
+
+    def __init__(self, collection, ttl: float = 24 * 3600, lease_ttl: float = 30.0, max_size: int = 10000,
+                 poll_interval: float = 0.05):
+        self.collection = collection
+        self.ttl = ttl
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.local = TTLCache(max_size=max_size, ttl=ttl)
+        self._in_flight = {}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def _check(self, doc: dict, fingerprint: str) -> dict:
+        if doc["fingerprint"] != fingerprint:
+            raise IdempotencyConflict(doc["_id"])
+        return doc
+
+    async def _claim(self, key: str, fingerprint: str) -> Optional[dict]:
+        """Take the lease on ``key``; ``None`` on success, else the existing document"""
+        now = datetime.utcnow()
+        lease = {
+            "fingerprint": fingerprint,
+            "status": PROCESSING,
+            "locked_until": now + timedelta(seconds=self.lease_ttl),
+            "expires_at": now + timedelta(seconds=self.ttl),
+        }
+        try:
+            await self.collection.insert_one({"_id": key, **lease})
+            return None
+        except DuplicateKeyError:
+            pass
+        # Take over a lease abandoned by a crashed worker
+        taken = await self.collection.update_one(
+            {"_id": key, "fingerprint": fingerprint, "status": PROCESSING, "locked_until": {"$lt": now}},
+            {"$set": lease}
+        )
+        if taken.modified_count:
+            return None
+        doc = await self.collection.find_one({"_id": key})
+        return doc if doc else await self._claim(key, fingerprint)
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[dict]:
+        """The stored response for ``key``, or ``None`` once the caller owns the request.
+
+        Waits while another request with the same key is running. Raises
+        ``IdempotencyConflict`` if the key was used for a different body.
+        """
+        while True:
+            stored = self.local.get(key)
+            if stored is not None:
+                return self._check(stored, fingerprint)
+
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                stored = await asyncio.shield(pending)
+                if stored is not None:
+                    return self._check(stored, fingerprint)
+                continue
+
+            self._in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                doc = await self._claim(key, fingerprint)
+                while doc is not None and doc["status"] == PROCESSING:
+                    # Running in another worker; wait for it to finish or for its lease to lapse
+                    self._check(doc, fingerprint)
+                    await asyncio.sleep(self.poll_interval)
+                    doc = await self._claim(key, fingerprint)
+            except BaseException:
+                self._resolve(key, None)
+                raise
+            if doc is None:
+                return None
+            self.local.set(key, doc)
+            self._resolve(key, doc)
+            return self._check(doc, fingerprint)
+
+    def _resolve(self, key: str, stored: Optional[dict]):
+        pending = self._in_flight.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(stored)
+
+    async def complete(self, key: str, fingerprint: str, status: int, headers: list, body: bytes):
+        stored = {"_id": key, "fingerprint": fingerprint, "status": DONE,
+                  "response": {"status": status, "headers": headers, "body": body}}
+        self.local.set(key, stored)
+        self._resolve(key, stored)
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": {"status": DONE, "response": stored["response"]}, "$unset": {"locked_until": ""}}
+            )
+        except Exception as e:
+            logging.error(f"Failed to store idempotent response for {key}: {e}")
+
+    async def release(self, key: str):
+        """Forget a request that failed, so a retry runs it again"""
+        self._resolve(key, None)
+        try:
+            await self.collection.delete_one({"_id": key, "status": PROCESSING})
+        except Exception as e:
+            logging.error(f"Failed to release idempotency key {key}: {e}")
+
+    def stats(self) -> dict:
+        return {**self.local.stats(), "in_flight": len(self._in_flight)}
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware honouring ``Idempotency-Key`` on POSTs to ``paths``.
+
+    The first request with a key runs normally and its response is stored;
+    retries with the same key and body get that response back, marked with
+    ``Idempotent-Replayed: true``, without running the handler. Reusing a key
+    with a different body is a 422. Responses of 500 and above are not
+    stored, so a retry after a server error runs again.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, paths: Iterable[str], requests: Counter, max_key_length: int = 255):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+        self.requests = requests
+        self.max_key_length = max_key_length
+
+    @staticmethod
+    async def send_json(send, status: int, detail: str):
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode()})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        header = dict(scope.get("headers") or []).get(b"idempotency-key")
+        if header is None:
+            return await self.app(scope, receive, send)
+        if not header or len(header) > self.max_key_length:
+            return await self.send_json(send, 400, f"Idempotency-Key must be 1-{self.max_key_length} characters")
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+
+        key = f"{scope['path']}:{header.decode('latin-1')}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+        try:
+            stored = await self.store.begin(key, fingerprint)
+        except IdempotencyConflict:
+            self.requests.labels(outcome="conflict").inc()
+            return await self.send_json(send, 422, "Idempotency-Key was already used with a different request body")
+
+        if stored is not None:
+            self.requests.labels(outcome="replayed").inc()
+            response = stored["response"]
+            headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response["headers"]]
+            await send({"type": "http.response.start", "status": response["status"],
+                        "headers": headers + [(b"idempotent-replayed", b"true")]})
+            await send({"type": "http.response.body", "body": bytes(response["body"])})
+            return
+
+        self.requests.labels(outcome="new").inc()
+        response = {"status": 500, "headers": [], "body": []}
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [(name.decode("latin-1"), value.decode("latin-1"))
+                                       for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay, capture)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        if response["status"] >= 500:
+            await self.store.release(key)
+        else:
+            await self.store.complete(key, fingerprint, response["status"], response["headers"], b"".join(response["body"]))
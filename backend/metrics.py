@@ -0,0 +1,257 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple, Union
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Collector = Callable[[], Union[None, Awaitable[None]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(list(zip(self.labelnames, key)))} {_number(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class _Buckets:
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            pairs = list(zip(self.labelnames, key))
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Metric updates are thread-safe, so they can be recorded from executor
+    threads and pymongo's monitoring callbacks. Gauges that mirror some
+    component's state are refreshed by collectors, which run on every scrape.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector):
+        self._collectors.append(collector)
+
+    async def render(self) -> str:
+        for collector in self._collectors:
+            result = collector()
+            if asyncio.iscoroutine(result):
+                await result
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+def route_template(scope) -> str:
+    """The path template of the route an ASGI request will hit, e.g. ``/api/export/{collection}``"""
+    if "route_template" not in scope:
+        template = "unmatched"
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                template = getattr(route, "path", template)
+                break
+        scope["route_template"] = template
+    return scope["route_template"]
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each HTTP request by route template and status.
+
+    Latency runs until the last body chunk is sent, so streamed responses are
+    measured in full. Requests matching no route are recorded as "unmatched".
+    """
+
+    def __init__(self, app, duration: Histogram, in_flight: Gauge):
+        self.app = app
+        self.duration = duration
+        self.in_flight = in_flight
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        route = route_template(scope)
+        method = scope["method"]
+        status = {"code": 500}
+        in_flight = self.in_flight.labels(method=method, route=route)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            self.duration.labels(method=method, route=route, status=status["code"]).observe(time.perf_counter() - started)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener recording duration and failures per command and collection"""
+
+    def __init__(self, duration: Histogram, errors: Counter):
+        self.duration = duration
+        self.errors = errors
+        self._collections: Dict[tuple, str] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.command.get("collection", "")
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event) -> str:
+        return self._collections.pop((event.connection_id, event.request_id), "")
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        self.duration.labels(command=event.command_name, collection=collection).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        self.duration.labels(command=event.command_name, collection=collection).observe(event.duration_micros / 1e6)
+        self.errors.labels(command=event.command_name, collection=collection).inc()
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 
@@ -75,3 +75,34 @@ class Analytics(BaseModel):
     total_demo_requests: int
     total_trial_signups: int
     total_newsletter_subscribers: int
+
+
+class TimeseriesPoint(BaseModel):
+    bucket: datetime
+    form: str
+    plan_type: Optional[str] = None
+    count: int
+
+
+class LeadTimeseries(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    points: List[TimeseriesPoint]
+
+
+class BulkLeadResult(BaseModel):
+    row: int
+    status: str  # created | duplicate | invalid | error | rejected
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkIngestReport(BaseModel):
+    total: int
+    created: int
+    duplicates: int
+    invalid: int
+    failed: int
+    rejected: int = 0
+    results: List[BulkLeadResult]
@@ -0,0 +1,339 @@
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.results import UpdateResult
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+DEAD = "dead"
+
+
+class RetryLater(Exception):
+    """Raised by a handler when its side effect should be retried with backoff.
+
+    With ``consume_attempt=False`` the attempt does not count towards
+    ``max_attempts``, e.g. when the integration was never called because its
+    circuit breaker is open.
+    """
+
+    def __init__(self, message: str, delay: Optional[float] = None, consume_attempt: bool = True):
+        super().__init__(message)
+        self.delay = delay
+        self.consume_attempt = consume_attempt
+
+
+# handler(entry, progress) -> updates to $set on the lead document.
+# ``progress`` is persisted between attempts so completed steps are not repeated.
+OutboxHandler = Callable[[dict, dict], Awaitable[Optional[dict]]]
+
+
+class Outbox:
+    """Durable queue of lead side effects (CRM sync, bookings) stored in MongoDB.
+
+    Form handlers record the lead and its outbox entries together and return;
+    background workers claim entries, run the registered handler, and write the
+    result back onto the lead document. Failed entries are retried with
+    exponential backoff and parked as ``dead`` after ``max_attempts``.
+
+    Each worker claims up to ``batch_size`` due entries at once and runs them
+    concurrently, so a backlog (e.g. a bulk import) reaches the HubSpot
+    micro-batchers as full batches instead of a few items per worker.
+    """
+
+    def __init__(
+        self,
+        client,
+        db,
+        collection: str = "outbox",
+        max_attempts: int = 8,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 1.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        trace_context: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        self.client = client
+        self.db = db
+        self.collection = db[collection]
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        # Returns the caller's traceparent, stored on entries so handlers can continue the trace
+        self.trace_context = trace_context
+        self.use_transactions = False
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._workers = []
+        self._wakeup = None
+        self._stopping = False
+        self.batch_size = 1
+
+    def register(self, kind: str, handler: OutboxHandler):
+        self._handlers[kind] = handler
+
+    def make_entry(self, kind: str, lead_collection: str, lead_id: str, payload: dict) -> dict:
+        now = datetime.utcnow()
+        return {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "lead_collection": lead_collection,
+            "lead_id": lead_id,
+            "payload": payload,
+            "progress": {},
+            "status": PENDING,
+            "attempts": 0,
+            "last_error": None,
+            "next_attempt_at": now,
+            "lease_until": None,
+            "created_at": now,
+            "updated_at": now,
+            "traceparent": self.trace_context() if self.trace_context else None,
+        }
+
+    async def record_lead(self, lead_collection: str, lead_doc: dict, tasks: Dict[str, dict], unique_key: Optional[str] = None,
+                          notify: bool = True):
+        """Insert ``lead_doc`` and one outbox entry per ``{kind: payload}`` in ``tasks``.
+
+        With ``unique_key`` the lead is written as a single ``$setOnInsert``
+        upsert on that field; if a lead with the same value already exists
+        nothing is queued. Returns the ``InsertOneResult``, or the
+        ``UpdateResult`` whose ``upserted_id`` is ``None`` for a duplicate.
+        ``notify=False`` leaves the entries for the caller to ``claim`` and
+        run first; idle workers still pick them up on their next poll.
+        """
+        entries = [self.make_entry(kind, lead_collection, lead_doc["id"], payload) for kind, payload in tasks.items()]
+
+        async def write(session=None):
+            collection = self.db[lead_collection]
+            if unique_key is None:
+                result = await collection.insert_one(lead_doc, session=session)
+            else:
+                result = await collection.update_one(
+                    {unique_key: lead_doc[unique_key]},
+                    {"$setOnInsert": lead_doc},
+                    upsert=True,
+                    session=session
+                )
+                if result.upserted_id is None:
+                    return result
+            if entries:
+                await self.collection.insert_many(entries, session=session)
+            return result
+
+        try:
+            if self.use_transactions:
+                async with await self.client.start_session() as session:
+                    async with session.start_transaction():
+                        result = await write(session)
+            else:
+                result = await write()
+        except DuplicateKeyError:
+            if unique_key is None:
+                raise
+            # A concurrent upsert for the same value won the race on the unique index
+            return UpdateResult({"n": 1, "nModified": 0}, acknowledged=True)
+
+        if notify and entries and getattr(result, "upserted_id", True) is not None:
+            self._notify()
+        return result
+
+    async def enqueue(self, entries: list):
+        """Queue entries built with ``make_entry`` for leads that are already stored"""
+        if entries:
+            await self.collection.insert_many(entries, ordered=False)
+            self._notify()
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** max(attempts - 1, 0)))
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _claimable(now: datetime) -> dict:
+        return {
+            "$or": [
+                {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                # Entries whose worker died mid-attempt become claimable again
+                {"status": PROCESSING, "lease_until": {"$lt": now}},
+            ]
+        }
+
+    async def _claim(self, limit: int = 1) -> List[dict]:
+        """Claim up to ``limit`` due entries, oldest first"""
+        now = datetime.utcnow()
+        lease = {
+            "$set": {
+                "status": PROCESSING,
+                "lease_until": now + timedelta(seconds=self.lease_seconds),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        }
+        if limit == 1:
+            entry = await self.collection.find_one_and_update(
+                self._claimable(now), lease, sort=[("next_attempt_at", ASCENDING)], return_document=ReturnDocument.AFTER,
+            )
+            return [entry] if entry else []
+
+        candidates = await self.collection.find(self._claimable(now), {"id": 1}).sort("next_attempt_at", ASCENDING).limit(limit).to_list(limit)
+        if not candidates:
+            return []
+        # Re-checking the claim filter per document keeps entries another worker took in between out of this claim
+        token = str(uuid.uuid4())
+        lease["$set"]["claim_token"] = token
+        await self.collection.update_many({"id": {"$in": [c["id"] for c in candidates]}, **self._claimable(now)}, lease)
+        return await self.collection.find({"claim_token": token}).to_list(limit)
+
+    async def claim(self, lead_id: str, kind: str) -> Optional[dict]:
+        """Claim a lead's pending ``kind`` entry to run it right away; ``None`` if a worker already has it"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"lead_id": lead_id, "kind": kind, "status": PENDING},
+            {
+                "$set": {
+                    "status": PROCESSING,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def process(self, entry: dict) -> Optional[dict]:
+        """Run ``entry``'s handler and record the outcome.
+
+        Returns the updates written to the lead (``{}`` if none), or ``None``
+        if the attempt failed and the entry was rescheduled or parked.
+        """
+        handler = self._handlers.get(entry["kind"])
+        progress = dict(entry.get("progress") or {})
+
+        try:
+            if handler is None:
+                raise RuntimeError(f"No outbox handler registered for {entry['kind']}")
+            updates = await handler(entry, progress)
+        except Exception as e:
+            now = datetime.utcnow()
+            error = str(e) or e.__class__.__name__
+            consume_attempt = not isinstance(e, RetryLater) or e.consume_attempt
+            if consume_attempt and entry["attempts"] >= self.max_attempts:
+                logging.error(f"Outbox entry {entry['id']} ({entry['kind']}) dead after {entry['attempts']} attempts: {error}")
+                await self.collection.update_one(
+                    {"id": entry["id"]},
+                    {"$set": {"status": DEAD, "progress": progress, "last_error": error, "lease_until": None, "updated_at": now}},
+                )
+                await self.db[entry["lead_collection"]].update_one(
+                    {"id": entry["lead_id"]},
+                    {"$set": {f"sync_errors.{entry['kind']}": error}},
+                )
+                return None
+
+            delay = e.delay if isinstance(e, RetryLater) and e.delay is not None else self._backoff(entry["attempts"])
+            logging.warning(f"Outbox entry {entry['id']} ({entry['kind']}) attempt {entry['attempts']} failed, retrying in {delay:.1f}s: {error}")
+            await self.collection.update_one(
+                {"id": entry["id"]},
+                {
+                    "$set": {
+                        "status": PENDING,
+                        "progress": progress,
+                        "last_error": error,
+                        "next_attempt_at": now + timedelta(seconds=delay),
+                        "lease_until": None,
+                        "updated_at": now,
+                    },
+                    **({} if consume_attempt else {"$inc": {"attempts": -1}}),
+                },
+            )
+            return None
+
+        now = datetime.utcnow()
+        if updates:
+            await self.db[entry["lead_collection"]].update_one({"id": entry["lead_id"]}, {"$set": updates})
+        await self.collection.update_one(
+            {"id": entry["id"]},
+            {
+                "$set": {
+                    "status": DONE,
+                    "progress": progress,
+                    "last_error": None,
+                    "lease_until": None,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(seconds=self.retention_seconds),
+                }
+            },
+        )
+        return updates or {}
+
+    async def _run(self, worker_id: int, entry: dict):
+        try:
+            await self.process(entry)
+        except Exception as e:
+            # Bookkeeping failed; the lease expires and another attempt picks the entry up
+            logging.error(f"Outbox worker {worker_id} failed to record entry {entry['id']}: {e}")
+
+    async def _worker(self, worker_id: int):
+        while not self._stopping:
+            try:
+                entries = await self._claim(self.batch_size)
+            except Exception as e:
+                logging.error(f"Outbox worker {worker_id} failed to claim entries: {e}")
+                entries = []
+
+            if not entries:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await asyncio.gather(*(self._run(worker_id, entry) for entry in entries))
+
+    async def _detect_transactions(self) -> bool:
+        try:
+            hello = await self.client.admin.command("hello")
+        except Exception:
+            return False
+        # Multi-document transactions need a replica set or a sharded cluster
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    async def start(self, workers: int = 2, batch_size: int = 1):
+        self.batch_size = max(batch_size, 1)
+        self.use_transactions = await self._detect_transactions()
+        await self.collection.create_index([("status", ASCENDING), ("next_attempt_at", ASCENDING)])
+        await self.collection.create_index("id", unique=True)
+        await self.collection.create_index([("lead_id", ASCENDING), ("kind", ASCENDING)])
+        # Completed entries are dropped by MongoDB once their retention has passed
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(workers)]
+        logging.info(f"Outbox started with {workers} workers claiming up to {self.batch_size} entries (transactions: {self.use_transactions})")
+
+    async def stop(self):
+        self._stopping = True
+        self._notify()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def stats(self) -> dict:
+        # One count per status is answered from the (status, next_attempt_at) index instead of grouping every document
+        statuses = (PENDING, PROCESSING, DONE, DEAD)
+        counts = await asyncio.gather(*(self.collection.count_documents({"status": status}) for status in statuses))
+        return {"workers": len(self._workers), "transactions": self.use_transactions, **dict(zip(statuses, counts))}
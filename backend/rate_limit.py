@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Mapping, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+
+class RateGovernor:
+    """Token bucket for a vendor's API quota, shared by every worker process.
+
+    The quota is ``limit`` calls per ``interval`` seconds and ``daily_limit``
+    calls per UTC day. Budget lives in small MongoDB documents, one per
+    window and one per day; each process leases ``lease_size`` tokens at a
+    time with a single conditional ``$inc`` and spends them locally, so the
+    database sees one write per lease rather than one per call. Callers of
+    ``acquire()`` queue in order when the window is spent and continue once
+    the next window opens.
+
+    Rate-limit response headers (``observe``) and 429 responses
+    (``throttle``) are pushed into the shared documents, so every process
+    backs off when any one of them learns the budget is gone.
+    """
+
+    def __init__(self, name: str, collection, limit: int = 100, interval: float = 10.0, daily_limit: int = 250000,
+                 lease_size: int = 5, safety_margin: float = 0.9):
+        self.name = name
+        self.collection = collection
+        self.limit = limit
+        self.interval = interval
+        self.daily_limit = daily_limit
+        self.lease_size = lease_size
+        # Budget kept back for the vendor's rolling window not lining up with ours
+        self.window_budget = max(int(limit * safety_margin), 1)
+        self.daily_budget = max(int(daily_limit * safety_margin), 1)
+        self._lock = asyncio.Lock()
+        self._tokens = 0
+        self._token_window = None
+        self._paused_until = 0.0
+        self.waiting = 0
+        self.calls = 0
+        self.throttled = 0
+        self.remaining = None
+        self.daily_remaining = None
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def _window(self, now: float) -> int:
+        return int(now // self.interval)
+
+    async def _take(self, key: str, budget: int, amount: int, expires_at: datetime) -> bool:
+        try:
+            await self.collection.update_one(
+                {"_id": key, "used": {"$lte": budget - amount}},
+                {"$inc": {"used": amount}, "$setOnInsert": {"expires_at": expires_at}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # The document exists but has no room left for this lease
+            return False
+
+    async def _lease(self, window: int) -> int:
+        """Lease up to ``lease_size`` tokens for ``window``; 0 if the window or day is spent"""
+        now = datetime.utcnow()
+        day_key = f"{self.name}:day:{now.strftime('%Y-%m-%d')}"
+        window_key = f"{self.name}:window:{window}"
+        for amount in sorted({self.lease_size, 1}, reverse=True):
+            if not await self._take(day_key, self.daily_budget, amount, now + timedelta(days=2)):
+                continue
+            if await self._take(window_key, self.window_budget, amount, now + timedelta(seconds=self.interval * 6)):
+                return amount
+            await self.collection.update_one({"_id": day_key}, {"$inc": {"used": -amount}})
+        return 0
+
+    async def acquire(self):
+        """Wait for one call's worth of budget"""
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.time()
+                    if self._paused_until > now:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    window = self._window(now)
+                    if self._token_window != window:
+                        self._tokens, self._token_window = 0, window
+                    if self._tokens == 0:
+                        try:
+                            self._tokens = await self._lease(window)
+                        except Exception as e:
+                            # Never block HubSpot traffic on the coordination store; the vendor's 429s still apply
+                            logging.warning(f"{self.name} rate limit lease failed, proceeding unmetered: {e}")
+                            self._tokens = 1
+                    if self._tokens > 0:
+                        self._tokens -= 1
+                        self.calls += 1
+                        return
+                    # Window spent: wait for the next one, staggered so workers don't stampede
+                    next_window = (window + 1) * self.interval
+                    await asyncio.sleep(next_window - time.time() + random.uniform(0, 0.05 * self.interval))
+        finally:
+            self.waiting -= 1
+
+    @staticmethod
+    def _header(headers: Optional[Mapping], name: str) -> Optional[int]:
+        if not headers:
+            return None
+        for key, value in dict(headers).items():
+            if key.lower() == name:
+                try:
+                    return int(value)
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    async def _exhaust_window(self, used: int):
+        window = self._window(time.time())
+        await self.collection.update_one(
+            {"_id": f"{self.name}:window:{window}"},
+            {"$max": {"used": used}, "$setOnInsert": {"expires_at": datetime.utcnow() + timedelta(seconds=self.interval * 6)}},
+            upsert=True
+        )
+
+    async def observe(self, headers: Optional[Mapping]):
+        """Record the vendor's view of the remaining budget from response headers"""
+        remaining = self._header(headers, "x-hubspot-ratelimit-remaining")
+        daily_remaining = self._header(headers, "x-hubspot-ratelimit-daily-remaining")
+        if daily_remaining is not None:
+            self.daily_remaining = daily_remaining
+        if remaining is None:
+            return
+        self.remaining = remaining
+        if remaining < self.limit - self.window_budget:
+            # Other clients of the same app are spending budget we don't see
+            self._tokens = 0
+            try:
+                await self._exhaust_window(self.window_budget)
+            except Exception as e:
+                logging.warning(f"Failed to record {self.name} rate limit state: {e}")
+
+    async def throttle(self, headers: Optional[Mapping] = None):
+        """Back off after a 429: pause this process and mark the shared window as spent"""
+        self.throttled += 1
+        delay = self._header(headers, "retry-after")
+        if delay is None:
+            interval_ms = self._header(headers, "x-hubspot-ratelimit-interval-milliseconds")
+            delay = interval_ms / 1000 if interval_ms else self.interval
+        self._paused_until = max(self._paused_until, time.time() + delay)
+        self._tokens = 0
+        logging.warning(f"{self.name} rate limited, pausing calls for {delay:.1f}s")
+        try:
+            await self._exhaust_window(self.window_budget)
+        except Exception as e:
+            logging.warning(f"Failed to record {self.name} rate limit state: {e}")
+
+    async def stats(self) -> dict:
+        now = time.time()
+        window_doc = await self.collection.find_one({"_id": f"{self.name}:window:{self._window(now)}"})
+        day_doc = await self.collection.find_one({"_id": f"{self.name}:day:{datetime.utcnow().strftime('%Y-%m-%d')}"})
+        window_used = window_doc["used"] if window_doc else 0
+        day_used = day_doc["used"] if day_doc else 0
+        return {
+            "limit": self.limit,
+            "interval": self.interval,
+            "daily_limit": self.daily_limit,
+            "window_remaining": max(self.window_budget - window_used, 0),
+            "daily_remaining": max(self.daily_budget - day_used, 0),
+            "vendor_remaining": self.remaining,
+            "vendor_daily_remaining": self.daily_remaining,
+            "local_tokens": self._tokens,
+            "waiting": self.waiting,
+            "paused_for": round(max(self._paused_until - now, 0.0), 2),
+            "calls": self.calls,
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an integration whose circuit breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling window of call outcomes.
+
+    The breaker opens when at least ``failure_threshold`` of the last
+    ``window`` calls failed and they make up ``failure_rate`` of the window.
+    After ``reset_timeout`` seconds it lets ``half_open_max_calls`` probe
+    calls through; a successful probe closes it, a failed one reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, failure_rate: float = 0.5, window: int = 20,
+                 reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a call through again"""
+        if self.state == OPEN:
+            return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+        if self.state == HALF_OPEN and self._probes >= self.half_open_max_calls:
+            return min(self.reset_timeout, 1.0)
+        return 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a call made now would be rejected"""
+        return self.retry_after > 0
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self.opened += 1
+        logging.warning(f"{self.name} circuit opened for {self.reset_timeout:.0f}s")
+
+    def before_call(self):
+        if self.state == OPEN and time.monotonic() >= self._opened_at + self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probes = 0
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probes >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after)
+        if self.state == HALF_OPEN:
+            self._probes += 1
+
+    def release(self):
+        """Give back a half-open probe slot for a call that ended without an outcome"""
+        if self.state == HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    def record_success(self):
+        if self.state == HALF_OPEN:
+            logging.info(f"{self.name} circuit closed")
+            self.state = CLOSED
+            self._outcomes.clear()
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if self.state == CLOSED and failures >= self.failure_threshold and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "retry_after": round(self.retry_after, 2),
+            "recent_failures": self._outcomes.count(False),
+            "recent_calls": len(self._outcomes),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class AdaptiveTimeout:
+    """Deadline derived from recently observed latencies.
+
+    Until ``min_samples`` successful calls have been seen the deadline is
+    ``maximum``; after that it is ``multiplier`` times the ``percentile``
+    latency of the last ``window`` calls, clamped to [``minimum``, ``maximum``].
+
+    A call that runs out of time says the deadline is too tight, but yields
+    no latency to learn from, so ``timed_out`` widens the deadline to
+    ``multiplier`` times the one that expired. The widening decays by
+    ``backoff_decay`` per successful call, by which time the slower
+    latencies are in the window themselves.
+    """
+
+    def __init__(self, maximum: float, minimum: float = 1.0, percentile: float = 0.99, multiplier: float = 2.0,
+                 window: int = 200, min_samples: int = 20, backoff_decay: float = 0.9):
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.backoff_decay = backoff_decay
+        self._latencies = deque(maxlen=window)
+        self._backoff = 0.0
+
+    def observe(self, latency: float):
+        self._latencies.append(latency)
+        self._backoff *= self.backoff_decay
+
+    def timed_out(self, deadline: float):
+        self._backoff = min(max(self._backoff, deadline) * self.multiplier, self.maximum)
+
+    def current(self) -> float:
+        if len(self._latencies) < self.min_samples:
+            return self.maximum
+        ordered = sorted(self._latencies)
+        observed = ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+        return min(max(observed * self.multiplier, self.minimum, self._backoff), self.maximum)
+
+
+def is_vendor_fault(error: Exception) -> bool:
+    """Whether an error says the integration is unhealthy, not that the request was bad"""
+    status = getattr(error, "status", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status is None or status >= 500 or status == 429
+
+
+def is_timeout(error: Exception) -> bool:
+    return isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException))
+
+
+class IntegrationGuard:
+    """A circuit breaker plus adaptive deadline for one external integration.
+
+    ``call(fn)`` passes the current deadline to ``fn``, which must enforce it
+    (as an httpx timeout, ``asyncio.wait_for``, ...). Calls are rejected with
+    ``CircuitOpenError`` while the breaker is open. ``is_failure(result)``
+    lets a returned value (e.g. a 5xx response) count as a failure.
+    Half-open probes get the ``maximum`` deadline, so a vendor that has
+    merely become slower than the learned deadline can close the breaker.
+    """
+
+    def __init__(self, name: str, breaker: CircuitBreaker, timeout: AdaptiveTimeout,
+                 is_fault: Callable[[Exception], bool] = is_vendor_fault):
+        self.name = name
+        self.breaker = breaker
+        self.timeout = timeout
+        self.is_fault = is_fault
+
+    async def call(self, fn: Callable[[float], Awaitable[T]], is_failure: Optional[Callable[[T], bool]] = None) -> T:
+        self.breaker.before_call()
+        deadline = self.timeout.maximum if self.breaker.state == HALF_OPEN else self.timeout.current()
+        started = time.monotonic()
+        try:
+            result = await fn(deadline)
+        except Exception as e:
+            if is_timeout(e):
+                self.timeout.timed_out(deadline)
+            if self.is_fault(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the integration's health
+            self.breaker.release()
+            raise
+        if is_failure is not None and is_failure(result):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self.timeout.observe(time.monotonic() - started)
+        return result
+
+    def stats(self) -> dict:
+        return {**self.breaker.stats(), "timeout": round(self.timeout.current(), 3)}
@@ -0,0 +1,17 @@
+from typing import Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def build_lead(model: Type[M], payload: BaseModel, **fields) -> Tuple[M, dict]:
+    """The stored ``model`` for an already validated create ``payload``, plus its MongoDB document.
+
+    ``payload`` was validated when the request was parsed, so the stored
+    model is built with ``model_construct`` (only the ``id`` / timestamp
+    defaults run) instead of dumping and re-validating every field, and the
+    document is a shallow copy of its field values with ``fields`` added.
+    """
+    lead = model.model_construct(**payload.__dict__)
+    return lead, {**lead.__dict__, **fields}
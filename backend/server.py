@@ -1,55 +1,672 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from bootstrap import IMPORT_STARTED  # must stay the first import: it starts the startup clock
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pydantic import ValidationError
+import io
 import os
+import re
+import csv
+import json
+import zlib
+import uuid
+import base64
+import secrets
+import random
+import asyncio
 import logging
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Optional
 import httpx
 from models import (
     Contact, ContactCreate,
     NewsletterSubscriber, NewsletterCreate,
     DemoRequest, DemoRequestCreate,
     TrialSignup, TrialSignupCreate,
-    Analytics
+    Analytics, LeadTimeseries, TimeseriesPoint,
+    BulkIngestReport, BulkLeadResult
 )
-from retell import Retell
-from hubspot import HubSpot
-from hubspot.crm.contacts import SimplePublicObjectInputForCreate as ContactInput
-from hubspot.crm.contacts import SimplePublicObjectInput as ContactUpdateInput
-from hubspot.crm.deals import SimplePublicObjectInputForCreate as DealInput
-from hubspot.crm.objects.notes import SimplePublicObjectInputForCreate as NoteInput
+from abuse import AbuseShieldMiddleware, SlidingWindowLimiter
+from batcher import MicroBatcher
+from cache import MongoBackedCache, TTLCache
+from executor import BoundedExecutor
+from http_clients import HttpClientRegistry
+from idempotency import IdempotencyMiddleware, IdempotencyStore
+from metrics import MetricsRegistry, MongoCommandMetrics, RequestMetricsMiddleware
+from tracing import JsonFileExporter, MongoCommandTracing, OtlpHttpExporter, Tracer, TracingMiddleware
+from outbox import Outbox, RetryLater
+from rate_limit import RateGovernor
+from serialization import build_lead
+from slot_allocator import SlotAllocator
+from startup import StartupReport
+from resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError, IntegrationGuard, is_vendor_fault
+from warm_pool import WarmPool
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Import and startup timings, logged once the app is ready and served under /api/health/pools
+startup_report = StartupReport(IMPORT_STARTED)
+
+# Prometheus metrics, served at /metrics
+metrics = MetricsRegistry()
+request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and status", ("method", "route", "status")
+)
+requests_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests currently being served", ("method", "route"))
+integration_duration = metrics.histogram(
+    "integration_call_duration_seconds", "Latency of calls to external integrations", ("integration", "operation")
+)
+integration_errors = metrics.counter(
+    "integration_call_errors_total", "Failed calls to external integrations", ("integration", "operation")
+)
+mongo_duration = metrics.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("command", "collection")
+)
+mongo_errors = metrics.counter("mongo_command_errors_total", "Failed MongoDB commands", ("command", "collection"))
+
+# Request tracing; TRACING_EXPORTER is none, otlp (OTEL_EXPORTER_OTLP_ENDPOINT) or file (TRACING_FILE)
+tracing_exporter = os.environ.get('TRACING_EXPORTER', 'none').lower()
+trace_exporter = None
+if tracing_exporter == 'otlp':
+    trace_exporter = OtlpHttpExporter(
+        os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318'),
+        lambda: http_clients.get("otlp"),
+        service_name=os.environ.get('OTEL_SERVICE_NAME', 'gretta-backend'),
+    )
+elif tracing_exporter == 'file':
+    trace_exporter = JsonFileExporter(
+        os.environ.get('TRACING_FILE', str(ROOT_DIR / 'traces.jsonl')),
+        max_bytes=int(os.environ.get('TRACING_FILE_MAX_BYTES', str(50 * 1024 * 1024))),
+        backup_count=int(os.environ.get('TRACING_FILE_BACKUPS', '5')),
+    )
+tracer = Tracer(
+    os.environ.get('OTEL_SERVICE_NAME', 'gretta-backend'),
+    exporter=trace_exporter,
+    sample_rate=float(os.environ.get('TRACE_SAMPLE_RATE', '1.0')),
+)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[MongoCommandMetrics(mongo_duration, mongo_errors), MongoCommandTracing(tracer)]
+)
 db = client[os.environ['DB_NAME']]
 
-# Retell AI client
+# Lead side effects (CRM sync, bookings) are queued here and run by background workers
+outbox = Outbox(
+    client,
+    db,
+    max_attempts=int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '8')),
+    base_delay=float(os.environ.get('OUTBOX_BASE_DELAY', '2')),
+    trace_context=tracer.current_traceparent,
+)
+outbox_workers = int(os.environ.get('OUTBOX_WORKERS', '4'))
+# Entries each worker claims and runs at once; matching the HubSpot batch size lets backlogs fill whole batches
+outbox_claim_batch = int(os.environ.get('OUTBOX_CLAIM_BATCH', os.environ.get('HUBSPOT_BATCH_SIZE', '50')))
+bulk_chunk_size = int(os.environ.get('BULK_CHUNK_SIZE', '500'))
+bulk_max_rows = int(os.environ.get('BULK_MAX_ROWS', '50000'))
+bulk_max_body_bytes = int(os.environ.get('BULK_MAX_BODY_BYTES', str(20 * 1024 * 1024)))
+# Back-office endpoints (bulk import, exports) require this in an X-API-Key header; unset disables them
+admin_api_key = os.environ.get('ADMIN_API_KEY')
+bookings_page_size = int(os.environ.get('BOOKINGS_PAGE_SIZE', '100'))
+# counters: read the incrementally maintained totals; exact / estimated: count on every request
+analytics_mode = os.environ.get('ANALYTICS_MODE', 'counters')
+analytics_repair_interval = float(os.environ.get('ANALYTICS_REPAIR_INTERVAL', '3600'))
+export_batch_size = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+# Demo requests leave their side effects to the outbox like every other form (0). A positive value runs
+# them inline, concurrently, for up to this many seconds so the response can report them; unfinished
+# branches carry on in the background. Inline runs add vendor latency to the request, so keep it opt-in
+demo_side_effect_timeout = float(os.environ.get('DEMO_SIDE_EFFECT_TIMEOUT', '0'))
+background_tasks = []
+inline_side_effects = set()
+
+# Retell AI client, created at startup when RETELL_API_KEY is set
 retell_api_key = os.environ.get('RETELL_API_KEY')
-retell = Retell(api_key=retell_api_key) if retell_api_key else None
+retell_timeout = float(os.environ.get('RETELL_TIMEOUT', '10'))
+retell = None
+# Pre-created agent from the Retell dashboard
+retell_agent_id = os.environ.get('RETELL_AGENT_ID', "agent_c66728951e5ce6e61b79b01af9")
+retell_slots = asyncio.Semaphore(int(os.environ.get('RETELL_MAX_CONCURRENCY', '16')))
+
+# Shared outbound HTTP clients with pooled keep-alive connections, one per integration
+http_clients = HttpClientRegistry(
+    max_connections=int(os.environ.get('HTTP_MAX_CONNECTIONS', '20')),
+    max_keepalive_connections=int(os.environ.get('HTTP_MAX_KEEPALIVE', '10')),
+    keepalive_expiry=float(os.environ.get('HTTP_KEEPALIVE_EXPIRY', '30')),
+    connect_timeout=float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5')),
+    read_timeout=float(os.environ.get('HTTP_READ_TIMEOUT', '30')),
+    http2=os.environ.get('HTTP2_ENABLED', 'false').lower() == 'true',
+)
 
 # Cal.com API configuration
 cal_api_key = os.environ.get('CAL_API_KEY')
 cal_api_url = "https://api.cal.com/v2"
+# Bookings use the v1 API, which works with the API key
+cal_v1_url = os.environ.get('CAL_API_V1_URL', "https://api.cal.com/v1")
+
+# Event type IDs rarely change; availability is cached briefly and refreshed in the background
+cal_event_types = TTLCache(max_size=256, ttl=float(os.environ.get('CAL_EVENT_TYPE_TTL', '21600')))
+cal_slots = TTLCache(max_size=256, ttl=float(os.environ.get('CAL_SLOTS_TTL', '120')))
+cal_slots_refresh_interval = float(os.environ.get('CAL_SLOTS_REFRESH_INTERVAL', '30'))
+cal_slot_keys = {("gretta-ai", "30min")}
+# Slots are reserved in MongoDB before booking so concurrent demo requests across workers never pick the same one
+cal_slot_allocator = SlotAllocator(db.cal_slot_reservations, lease_seconds=float(os.environ.get('CAL_SLOT_LEASE', '60')))
+cal_booking_slot_attempts = int(os.environ.get('CAL_BOOKING_SLOT_ATTEMPTS', '3'))
+http_clients.register("cal")
+# Outgoing webhooks (Zapier etc.)
+http_clients.register("webhooks")
+if tracing_exporter == 'otlp':
+    http_clients.register("otlp")
 
-# HubSpot client
+# HubSpot client, created at startup when HUBSPOT_API_KEY is set
 hubspot_api_key = os.environ.get('HUBSPOT_API_KEY')
-hubspot_client = HubSpot(access_token=hubspot_api_key) if hubspot_api_key else None
+# HUBSPOT_API_BASE points the SDK at another host, e.g. the benchmark stand-in
+hubspot_api_base = os.environ.get('HUBSPOT_API_BASE')
+hubspot_client = None
+_hubspot_sdk = None
+
+
+def hubspot_sdk() -> SimpleNamespace:
+    """The HubSpot SDK request models, imported on first use; the SDK is slow to import"""
+    global _hubspot_sdk
+    if _hubspot_sdk is None:
+        from hubspot.crm import contacts, deals
+        from hubspot.crm.objects import notes
+        _hubspot_sdk = SimpleNamespace(
+            ContactBatchUpsert=contacts.BatchInputSimplePublicObjectBatchInputUpsert,
+            ContactUpsertInput=contacts.SimplePublicObjectBatchInputUpsert,
+            DealBatchInput=deals.BatchInputSimplePublicObjectBatchInputForCreate,
+            DealInput=deals.SimplePublicObjectBatchInputForCreate,
+            DealAssociation=deals.PublicAssociationsForObject,
+            DealAssociationSpec=deals.AssociationSpec,
+            NoteBatchInput=notes.BatchInputSimplePublicObjectBatchInputForCreate,
+            NoteInput=notes.SimplePublicObjectBatchInputForCreate,
+            NoteAssociation=notes.PublicAssociationsForObject,
+            NoteAssociationSpec=notes.AssociationSpec,
+        )
+    return _hubspot_sdk
+
+# The HubSpot SDK is synchronous, so its calls run on a dedicated thread pool
+hubspot_call_timeout = float(os.environ.get('HUBSPOT_CALL_TIMEOUT', '10'))
+hubspot_executor = BoundedExecutor(
+    "hubspot",
+    max_workers=int(os.environ.get('HUBSPOT_POOL_SIZE', '8')),
+    max_queue=int(os.environ.get('HUBSPOT_POOL_QUEUE', '64')),
+    default_timeout=hubspot_call_timeout,
+)
+
+# Private-app quota (calls per HUBSPOT_RATE_INTERVAL seconds and per day), shared by all workers via MongoDB
+hubspot_governor = RateGovernor(
+    "hubspot",
+    db.rate_limits,
+    limit=int(os.environ.get('HUBSPOT_RATE_LIMIT', '100')),
+    interval=float(os.environ.get('HUBSPOT_RATE_INTERVAL', '10')),
+    daily_limit=int(os.environ.get('HUBSPOT_DAILY_LIMIT', '250000')),
+    lease_size=int(os.environ.get('HUBSPOT_RATE_LEASE', '5')),
+)
+# 429s are retried after the advertised wait instead of failing the call
+hubspot_rate_retries = int(os.environ.get('HUBSPOT_RATE_RETRIES', '3'))
+
+# Contact upserts, notes and deals are coalesced into HubSpot batch API calls
+hubspot_batch_size = int(os.environ.get('HUBSPOT_BATCH_SIZE', '50'))
+hubspot_batch_wait = float(os.environ.get('HUBSPOT_BATCH_WAIT_MS', '200')) / 1000
+
+# email -> HubSpot contact ID, filled from upsert responses so follow-up calls skip the lookup
+hubspot_ids = MongoBackedCache(
+    db.hubspot_contact_ids,
+    key_field="email",
+    value_field="hubspot_id",
+    max_size=int(os.environ.get('HUBSPOT_ID_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('HUBSPOT_ID_CACHE_TTL', '3600')),
+)
 
-# Create the main app without a prefix
-app = FastAPI()
+
+def integration_guard(name: str, max_timeout: float, is_fault=is_vendor_fault) -> IntegrationGuard:
+    """Circuit breaker and latency-derived deadline for one integration, tuned by <NAME>_BREAKER_* env vars"""
+    prefix = name.upper()
+    return IntegrationGuard(
+        name,
+        CircuitBreaker(
+            name,
+            failure_threshold=int(os.environ.get(f'{prefix}_BREAKER_FAILURES', '5')),
+            failure_rate=float(os.environ.get(f'{prefix}_BREAKER_FAILURE_RATE', '0.5')),
+            reset_timeout=float(os.environ.get(f'{prefix}_BREAKER_RESET', '30')),
+        ),
+        AdaptiveTimeout(maximum=max_timeout, minimum=float(os.environ.get(f'{prefix}_MIN_TIMEOUT', '1'))),
+        is_fault=is_fault,
+    )
+
+
+# Deadlines start at the configured timeout and tighten to 2x the observed p99
+cal_timeout = float(os.environ.get('CAL_TIMEOUT', '10'))
+# HubSpot 429s are handled by the rate governor and don't count against the breaker
+hubspot_guard = integration_guard(
+    "hubspot", hubspot_call_timeout, is_fault=lambda e: getattr(e, "status", None) != 429 and is_vendor_fault(e)
+)
+cal_guard = integration_guard("cal", cal_timeout)
+retell_guard = integration_guard("retell", retell_timeout)
+integration_guards = (hubspot_guard, cal_guard, retell_guard)
+
+# Flood protection for the unauthenticated form endpoints; a limit of 0 disables that check
+abuse_max_keys = int(os.environ.get('ABUSE_MAX_KEYS', '100000'))
+ip_limiter = SlidingWindowLimiter(
+    "ip",
+    limit=int(os.environ.get('ABUSE_IP_LIMIT', '30')),
+    window=float(os.environ.get('ABUSE_IP_WINDOW', '60')),
+    max_keys=abuse_max_keys,
+)
+email_limiter = SlidingWindowLimiter(
+    "email",
+    limit=int(os.environ.get('ABUSE_EMAIL_LIMIT', '5')),
+    window=float(os.environ.get('ABUSE_EMAIL_WINDOW', '600')),
+    max_keys=abuse_max_keys,
+)
+abuse_rejections = metrics.counter("abuse_rejections_total", "Form submissions shed before reaching a handler", ("reason",))
+
+# Responses replayed for retried POSTs carrying an Idempotency-Key
+idempotency = IdempotencyStore(
+    db.idempotency_keys,
+    ttl=float(os.environ.get('IDEMPOTENCY_TTL', str(24 * 3600))),
+    lease_ttl=float(os.environ.get('IDEMPOTENCY_LEASE', '30')),
+    max_size=int(os.environ.get('IDEMPOTENCY_CACHE_SIZE', '10000')),
+)
+idempotency_requests = metrics.counter("idempotency_requests_total", "Requests carrying an Idempotency-Key by outcome", ("outcome",))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_services()
+    try:
+        yield
+    finally:
+        await stop_services()
+
+
+# Create the main app without a prefix; responses are encoded with orjson
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 
+async def require_admin_key(x_api_key: Optional[str] = Header(default=None)):
+    if not admin_api_key:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not x_api_key or not secrets.compare_digest(x_api_key.encode(), admin_api_key.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-API-Key")
+
+
+# ============ Database Indexes ============
+
+async def ensure_indexes():
+    """Create the indexes the lead endpoints rely on"""
+    index_specs = [
+        # Unique emails make the newsletter / trial de-duplication a single atomic upsert
+        ("newsletter_subscribers", "email", {"unique": True}),
+        ("trial_signups", "email", {"unique": True}),
+        # Outbox workers write sync results back by lead id
+        ("contacts", "id", {"unique": True}),
+        ("demo_requests", "id", {"unique": True}),
+        ("trial_signups", "id", {"unique": True}),
+        ("newsletter_subscribers", "id", {"unique": True}),
+        ("contacts", "created_at", {}),
+        # Keyset pagination of /api/webhook/bookings
+        ("demo_requests", [("created_at", 1), ("id", 1)], {}),
+        ("trial_signups", "created_at", {}),
+        ("newsletter_subscribers", "subscribed_at", {}),
+        # One document per (granularity, bucket, form, plan_type)
+        ("lead_rollups", [("granularity", 1), ("bucket", 1), ("form", 1), ("plan_type", 1)], {"unique": True}),
+    ]
+    for collection, field, options in index_specs:
+        try:
+            await db[collection].create_index(field, **options)
+        except Exception as e:
+            # e.g. pre-existing duplicate emails; the app still works, only slower / racier
+            logging.error(f"Could not create index {collection}.{field}: {e}")
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """A query-string datetime in the naive UTC that MongoDB stores, converting any offset"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# ============ Analytics Helpers ============
+
+ANALYTICS_COUNTERS_ID = "lead_totals"
+# When live rollup increments began and whether the one-off backfill ran, shared by all workers
+ROLLUP_STATE_ID = "rollup_backfill"
+rollup_backfill_lease = float(os.environ.get('ROLLUP_BACKFILL_LEASE', '600'))
+LEAD_COLLECTIONS = ["contacts", "demo_requests", "trial_signups", "newsletter_subscribers"]
+
+# Lead collection -> (form name used in rollups, timestamp field)
+LEAD_FORMS = {
+    "contacts": ("contact", "created_at"),
+    "demo_requests": ("demo", "created_at"),
+    "trial_signups": ("trial", "created_at"),
+    "newsletter_subscribers": ("newsletter", "subscribed_at"),
+}
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+
+def rollup_bucket(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_key(granularity: str, bucket: datetime, form: str, plan_type: Optional[str]) -> dict:
+    return {"granularity": granularity, "bucket": bucket, "form": form, "plan_type": plan_type}
+
+
+async def record_lead_created(collection: str, count: int = 1, created_at: datetime = None, plan_type: str = None):
+    """Bump the lifetime counter read by /api/analytics and the hourly / daily rollups"""
+    created_at = created_at or datetime.utcnow()
+    form = LEAD_FORMS[collection][0]
+    try:
+        await asyncio.gather(
+            db.analytics_counters.update_one(
+                {"_id": ANALYTICS_COUNTERS_ID},
+                {"$inc": {collection: count}, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            ),
+            db.lead_rollups.bulk_write([
+                UpdateOne(
+                    rollup_key(granularity, rollup_bucket(created_at, granularity), form, plan_type),
+                    {"$inc": {"count": count}},
+                    upsert=True
+                )
+                for granularity in ROLLUP_GRANULARITIES
+            ], ordered=False)
+        )
+    except Exception as e:
+        # The periodic recount repairs the totals; a rollup backfill repairs the buckets
+        logging.error(f"Error updating analytics counters for {collection}: {e}")
+
+
+async def backfill_lead_rollups(before: datetime = None):
+    """Rebuild the hourly / daily rollups from the raw lead collections created before ``before``.
+
+    Buckets that end by ``before`` are overwritten. The bucket containing
+    ``before`` is also receiving live increments, so its earlier leads are
+    added to it instead.
+    """
+    before = before or datetime.utcnow()
+    formats = {"hour": "%Y-%m-%dT%H:00:00", "day": "%Y-%m-%dT00:00:00"}
+    written = 0
+    for collection, (form, time_field) in LEAD_FORMS.items():
+        for granularity, date_format in formats.items():
+            live_bucket = rollup_bucket(before, granularity)
+            pipeline = [
+                {"$match": {time_field: {"$lt": before}}},
+                {"$group": {
+                    "_id": {
+                        "bucket": {"$dateToString": {"format": date_format, "date": f"${time_field}"}},
+                        "plan_type": {"$ifNull": ["$plan_type", None]},
+                    },
+                    "count": {"$sum": 1},
+                }},
+            ]
+            operations = []
+            async for row in db[collection].aggregate(pipeline, allowDiskUse=True):
+                bucket = datetime.fromisoformat(row["_id"]["bucket"])
+                key = rollup_key(granularity, bucket, form, row["_id"]["plan_type"])
+                update = {"$inc" if bucket >= live_bucket else "$set": {"count": row["count"]}}
+                operations.append(UpdateOne(key, update, upsert=True))
+                if len(operations) >= 1000:
+                    await db.lead_rollups.bulk_write(operations, ordered=False)
+                    written += len(operations)
+                    operations = []
+            if operations:
+                await db.lead_rollups.bulk_write(operations, ordered=False)
+                written += len(operations)
+    logging.info(f"Backfilled {written} lead rollup buckets")
+    return written
+
+
+async def register_live_rollups(started: datetime):
+    """Record when this worker began counting leads live; must run before it serves requests.
+
+    The earliest such time across workers is where the backfill stops, so
+    no lead is counted by both. Rollups that already exist without this
+    state were built by an earlier release and are not backfilled again.
+    """
+    status = "pending"
+    if await db.analytics_counters.find_one({"_id": ROLLUP_STATE_ID}, {"_id": 1}) is None:
+        if await db.lead_rollups.find_one({}, {"_id": 1}) is not None:
+            status = "done"
+    await db.analytics_counters.update_one(
+        {"_id": ROLLUP_STATE_ID},
+        {"$min": {"live_since": started}, "$setOnInsert": {"status": status}},
+        upsert=True
+    )
+
+
+async def start_lead_rollups():
+    """Backfill the rollups once, from whichever worker takes the backfill lease first"""
+    try:
+        now = datetime.utcnow()
+        state = await db.analytics_counters.find_one_and_update(
+            {"_id": ROLLUP_STATE_ID, "status": "pending",
+             "$or": [{"locked_until": {"$exists": False}}, {"locked_until": {"$lt": now}}]},
+            {"$set": {"locked_until": now + timedelta(seconds=rollup_backfill_lease)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if state is None:
+            return
+        await backfill_lead_rollups(state["live_since"])
+        await db.analytics_counters.update_one(
+            {"_id": ROLLUP_STATE_ID},
+            {"$set": {"status": "done", "backfilled_at": datetime.utcnow()}, "$unset": {"locked_until": ""}}
+        )
+    except Exception as e:
+        logging.error(f"Error backfilling lead rollups: {e}")
+
+
+async def count_leads(exact: bool = True) -> dict:
+    """Count every lead collection concurrently"""
+    if exact:
+        counts = await asyncio.gather(*(db[name].count_documents({}) for name in LEAD_COLLECTIONS))
+    else:
+        counts = await asyncio.gather(*(db[name].estimated_document_count() for name in LEAD_COLLECTIONS))
+    return dict(zip(LEAD_COLLECTIONS, counts))
+
+
+async def repair_analytics_counters():
+    """Recount the lead collections and overwrite the counters document"""
+    totals = await count_leads()
+    await db.analytics_counters.update_one(
+        {"_id": ANALYTICS_COUNTERS_ID},
+        {"$set": {**totals, "updated_at": datetime.utcnow(), "repaired_at": datetime.utcnow()}},
+        upsert=True
+    )
+    logging.info(f"Repaired analytics counters: {totals}")
+    return totals
+
+
+async def run_analytics_repair():
+    while True:
+        try:
+            await repair_analytics_counters()
+        except Exception as e:
+            logging.error(f"Error repairing analytics counters: {e}")
+        await asyncio.sleep(analytics_repair_interval)
+
+
+@contextmanager
+def track_integration(integration: str, operation: str, **attributes):
+    """Time an outbound call in a client span and count it as an error if it raises"""
+    with tracer.span(f"{integration}.{operation}", kind="client", integration=integration, operation=operation, **attributes) as span:
+        with integration_duration.labels(integration=integration, operation=operation).time():
+            try:
+                yield span
+            except Exception:
+                integration_errors.labels(integration=integration, operation=operation).inc()
+                raise
+
+
 # ============ HubSpot Integration Helpers ============
 
+async def hubspot_call(operation: str, fn, *args, **kwargs):
+    """Run a blocking HubSpot SDK ``*_with_http_info`` call off the event loop and return its data.
+
+    Calls wait for rate-limit budget, run behind the HubSpot breaker and
+    deadline, and feed the rate-limit response headers back to the governor.
+    """
+    async def call(deadline: float):
+        with track_integration("hubspot", operation):
+            return await hubspot_executor.run(fn, *args, timeout=deadline, _request_timeout=deadline, **kwargs)
+    
+    for attempt in range(hubspot_rate_retries + 1):
+        await hubspot_governor.acquire()
+        try:
+            data, _, headers = await hubspot_guard.call(call)
+        except Exception as e:
+            if getattr(e, "status", None) != 429 or attempt == hubspot_rate_retries:
+                raise
+            await hubspot_governor.throttle(getattr(e, "headers", None))
+            continue
+        await hubspot_governor.observe(headers)
+        return data
+
+
+class HubSpotBatchItemError(Exception):
+    """One input's error from a HubSpot batch response, routed to it by objectWriteTraceId"""
+
+    def __init__(self, message: str, category: str = None):
+        super().__init__(message)
+        self.category = category
+        self.status = 404 if category == "OBJECT_NOT_FOUND" else None
+
+
+def route_batch_results(response, keys: list) -> list:
+    """Match batch results and errors back to their inputs by objectWriteTraceId"""
+    results = {r.object_write_trace_id: r for r in (response.results or []) if r.object_write_trace_id}
+    errors = {}
+    unrouted = []
+    for error in getattr(response, "errors", None) or []:
+        trace_ids = (getattr(error, "context", None) or {}).get("objectWriteTraceId") or []
+        for trace_id in trace_ids:
+            errors[trace_id] = HubSpotBatchItemError(error.message, getattr(error, "category", None))
+        if not trace_ids:
+            unrouted.append(error.message)
+    return [
+        results.get(key) or errors.get(key)
+        or RuntimeError(f"HubSpot batch returned no result for {key}: {'; '.join(unrouted) or 'unknown error'}")
+        for key in keys
+    ]
+
+
+async def flush_contact_upserts(items: list) -> list:
+    """Upsert a batch of contacts keyed by email"""
+    sdk = hubspot_sdk()
+    # HubSpot rejects duplicate IDs within one batch; the latest submission wins
+    inputs = {}
+    for item in items:
+        key = item["email"].lower()
+        inputs[key] = sdk.ContactUpsertInput(
+            id_property="email",
+            id=item["email"],
+            object_write_trace_id=key,
+            properties=item["properties"]
+        )
+    
+    response = await hubspot_call(
+        "contact_upsert",
+        hubspot_client.crm.contacts.batch_api.upsert_with_http_info,
+        batch_input_simple_public_object_batch_input_upsert=sdk.ContactBatchUpsert(inputs=list(inputs.values()))
+    )
+    
+    # Fall back to the echoed email if the trace ID is missing
+    for result in response.results or []:
+        if not result.object_write_trace_id:
+            result.object_write_trace_id = (result.properties or {}).get("email", "").lower()
+    return route_batch_results(response, [item["email"].lower() for item in items])
+
+
+async def flush_note_creates(items: list) -> list:
+    """Create a batch of notes, each associated with its contact"""
+    sdk = hubspot_sdk()
+    inputs = [
+        sdk.NoteInput(
+            object_write_trace_id=item["trace_id"],
+            properties=item["properties"],
+            associations=[
+                sdk.NoteAssociation(
+                    to={"id": item["contact_id"]},
+                    types=[
+                        sdk.NoteAssociationSpec(
+                            association_category="HUBSPOT_DEFINED",
+                            association_type_id=202  # Note to Contact
+                        )
+                    ]
+                )
+            ]
+        )
+        for item in items
+    ]
+    
+    response = await hubspot_call(
+        "note_create",
+        hubspot_client.crm.objects.notes.batch_api.create_with_http_info,
+        batch_input_simple_public_object_batch_input_for_create=sdk.NoteBatchInput(inputs=inputs)
+    )
+    return route_batch_results(response, [item["trace_id"] for item in items])
+
+
+async def flush_deal_creates(items: list) -> list:
+    """Create a batch of deals, associated with their contact when known"""
+    sdk = hubspot_sdk()
+    inputs = []
+    for item in items:
+        associations = None
+        if item.get("contact_id"):
+            associations = [
+                sdk.DealAssociation(
+                    to={"id": item["contact_id"]},
+                    types=[
+                        sdk.DealAssociationSpec(
+                            association_category="HUBSPOT_DEFINED",
+                            association_type_id=3  # Deal to Contact
+                        )
+                    ]
+                )
+            ]
+        inputs.append(sdk.DealInput(object_write_trace_id=item["trace_id"], properties=item["properties"], associations=associations))
+    
+    response = await hubspot_call(
+        "deal_create",
+        hubspot_client.crm.deals.batch_api.create_with_http_info,
+        batch_input_simple_public_object_batch_input_for_create=sdk.DealBatchInput(inputs=inputs)
+    )
+    return route_batch_results(response, [item["trace_id"] for item in items])
+
+
+def is_not_found(error: Exception) -> bool:
+    """Whether a HubSpot error means the referenced object does not exist"""
+    if getattr(error, "status", None) == 404 or getattr(error, "category", None) == "OBJECT_NOT_FOUND":
+        return True
+    return "OBJECT_NOT_FOUND" in str(getattr(error, "body", None) or "")
+
+
+contact_batcher = MicroBatcher("hubspot_contacts", flush_contact_upserts, max_size=hubspot_batch_size, max_wait=hubspot_batch_wait)
+# A stale contact ID fails the whole create batch; retrying items alone pins the 404 on the item that holds it
+note_batcher = MicroBatcher("hubspot_notes", flush_note_creates, max_size=hubspot_batch_size, max_wait=hubspot_batch_wait,
+                            isolate=is_not_found)
+deal_batcher = MicroBatcher("hubspot_deals", flush_deal_creates, max_size=hubspot_batch_size, max_wait=hubspot_batch_wait,
+                            isolate=is_not_found)
+
+
 async def sync_contact_to_hubspot(name: str, email: str, phone: str = None, company: str = None, interest: str = None):
     """Create or update a contact in HubSpot"""
     if not hubspot_client:
@@ -73,31 +690,11 @@ async def sync_contact_to_hubspot(name: str, email: str, phone: str = None, comp
         if company:
             properties["company"] = company
         
-        # Try to get existing contact by email
-        try:
-            existing = hubspot_client.crm.contacts.basic_api.get_by_id(
-                email,
-                id_property="email"
-            )
-            # Update existing contact
-            update_obj = ContactUpdateInput(properties=properties)
-            response = hubspot_client.crm.contacts.basic_api.update(
-                contact_id=existing.id,
-                simple_public_object_input=update_obj
-            )
-            logging.info(f"Updated HubSpot contact: {existing.id}")
-            return {"hubspot_id": existing.id, "action": "updated"}
-        except Exception as e:
-            if "404" in str(e) or "NOT_FOUND" in str(e).upper():
-                # Contact doesn't exist, create new one
-                create_obj = ContactInput(properties=properties)
-                response = hubspot_client.crm.contacts.basic_api.create(
-                    simple_public_object_input_for_create=create_obj
-                )
-                logging.info(f"Created HubSpot contact: {response.id}")
-                return {"hubspot_id": response.id, "action": "created"}
-            else:
-                raise
+        result = await contact_batcher.submit({"email": email, "properties": properties})
+        action = "created" if result.new else "updated"
+        logging.info(f"Upserted HubSpot contact {result.id} ({action})")
+        await hubspot_ids.set(email.lower(), result.id)
+        return {"hubspot_id": result.id, "action": action}
     
     except Exception as e:
         logging.error(f"Error syncing to HubSpot: {e}")
@@ -115,27 +712,11 @@ async def create_hubspot_note(contact_id: str, note_text: str):
             "hs_timestamp": datetime.utcnow().isoformat() + "Z"
         }
         
-        # Create note with association to contact
-        from hubspot.crm.objects.notes import PublicAssociationsForObject, AssociationSpec
-        
-        associations = [
-            PublicAssociationsForObject(
-                to={"id": contact_id},
-                types=[
-                    AssociationSpec(
-                        association_category="HUBSPOT_DEFINED",
-                        association_type_id=202  # Note to Contact
-                    )
-                ]
-            )
-        ]
-        
-        input_obj = NoteInput(properties=properties, associations=associations)
-        
-        # Create the note with associations
-        response = hubspot_client.crm.objects.notes.basic_api.create(
-            simple_public_object_input_for_create=input_obj
-        )
+        response = await note_batcher.submit({
+            "trace_id": str(uuid.uuid4()),
+            "contact_id": contact_id,
+            "properties": properties
+        })
         
         note_id = response.id
         logging.info(f"Created HubSpot note {note_id} for contact {contact_id}")
@@ -143,25 +724,33 @@ async def create_hubspot_note(contact_id: str, note_text: str):
     
     except Exception as e:
         logging.error(f"Error creating HubSpot note: {e}")
+        if is_not_found(e):
+            # The contact was deleted or merged in HubSpot; forget the stale ID
+            await hubspot_ids.invalidate_value(contact_id)
         return None
 
 
-async def create_hubspot_deal(contact_email: str, deal_name: str, interest: str, amount: float = 0):
+async def create_hubspot_deal(contact_email: str, deal_name: str, interest: str, amount: float = 0, contact_id: str = None):
     """Create a deal in HubSpot for trial signups"""
     if not hubspot_client:
         return None
     
     try:
-        # First get the contact ID
-        contact_id = None
-        try:
-            contact = hubspot_client.crm.contacts.basic_api.get_by_id(
-                contact_email,
-                id_property="email"
-            )
-            contact_id = contact.id
-        except Exception as e:
-            logging.warning(f"Could not find contact for deal association: {e}")
+        # Resolve the contact ID from the cache, looking it up only on a miss
+        if not contact_id:
+            contact_id = await hubspot_ids.get(contact_email.lower())
+        if not contact_id:
+            try:
+                contact = await hubspot_call(
+                    "contact_lookup",
+                    hubspot_client.crm.contacts.basic_api.get_by_id_with_http_info,
+                    contact_email,
+                    id_property="email"
+                )
+                contact_id = contact.id
+                await hubspot_ids.set(contact_email.lower(), contact_id)
+            except Exception as e:
+                logging.warning(f"Could not find contact for deal association: {e}")
         
         properties = {
             "dealname": deal_name,
@@ -170,29 +759,11 @@ async def create_hubspot_deal(contact_email: str, deal_name: str, interest: str,
             "amount": str(amount),
         }
         
-        # Create deal with association if contact exists
-        if contact_id:
-            from hubspot.crm.deals import PublicAssociationsForObject, AssociationSpec
-            
-            associations = [
-                PublicAssociationsForObject(
-                    to={"id": contact_id},
-                    types=[
-                        AssociationSpec(
-                            association_category="HUBSPOT_DEFINED",
-                            association_type_id=3  # Deal to Contact
-                        )
-                    ]
-                )
-            ]
-            input_obj = DealInput(properties=properties, associations=associations)
-        else:
-            input_obj = DealInput(properties=properties)
-        
-        # Create the deal
-        response = hubspot_client.crm.deals.basic_api.create(
-            simple_public_object_input_for_create=input_obj
-        )
+        response = await deal_batcher.submit({
+            "trace_id": str(uuid.uuid4()),
+            "contact_id": contact_id,
+            "properties": properties
+        })
         
         deal_id = response.id
         logging.info(f"Created HubSpot deal: {deal_id}" + (f" (associated with contact {contact_id})" if contact_id else ""))
@@ -200,11 +771,131 @@ async def create_hubspot_deal(contact_email: str, deal_name: str, interest: str,
     
     except Exception as e:
         logging.error(f"Error creating HubSpot deal: {e}")
+        if contact_id and is_not_found(e):
+            await hubspot_ids.invalidate_value(contact_id)
         return None
 
 
 # ============ Cal.com Integration Helpers ============
 
+async def cal_request(http_client: httpx.AsyncClient, operation: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Call the Cal.com API behind its breaker and deadline, counting 4xx/5xx responses as errors"""
+    async def call(deadline: float):
+        with track_integration("cal", operation, **{"http.method": method, "http.url": url}) as span:
+            response = await http_client.request(method, url, timeout=deadline, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 400:
+                span.record_error(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            integration_errors.labels(integration="cal", operation=operation).inc()
+        return response
+    
+    return await cal_guard.call(call, is_failure=lambda response: response.status_code >= 500 or response.status_code == 429)
+
+
+async def fetch_cal_slots(http_client: httpx.AsyncClient, event_type_slug: str, username: str):
+    """Fetch the next week of available slot start times from Cal.com"""
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d")
+    next_week = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
+    
+    slots_response = await cal_request(
+        http_client, "slots", "GET",
+        f"{cal_v1_url}/slots",
+        params={
+            "eventTypeSlug": event_type_slug,
+            "usernameList": username,
+            "startTime": tomorrow,
+            "endTime": next_week,
+            "timeZone": "UTC",
+            "apiKey": cal_api_key
+        }
+    )
+    
+    if slots_response.status_code != 200:
+        logging.error(f"Cal.com slots error: {slots_response.text}")
+        return None
+    
+    available_slots = slots_response.json().get("slots", {})
+    return [slot.get("time") for date in sorted(available_slots) for slot in (available_slots[date] or []) if slot.get("time")]
+
+
+async def fetch_cal_event_type_id(http_client: httpx.AsyncClient, event_type_slug: str):
+    """Resolve an event type slug to its Cal.com ID"""
+    event_types_response = await cal_request(
+        http_client, "event_types", "GET",
+        f"{cal_v1_url}/event-types",
+        params={"apiKey": cal_api_key}
+    )
+    
+    if event_types_response.status_code != 200:
+        logging.error(f"Cal.com event types error: {event_types_response.text}")
+        return None
+    
+    for et in event_types_response.json().get("event_types", []):
+        if et.get("slug") == event_type_slug:
+            return et.get("id")
+    return None
+
+
+async def get_cal_event_type_id(http_client: httpx.AsyncClient, event_type_slug: str, username: str):
+    key = (username, event_type_slug)
+    event_type_id = cal_event_types.get(key)
+    if event_type_id is None:
+        event_type_id = await fetch_cal_event_type_id(http_client, event_type_slug)
+        if event_type_id is not None:
+            cal_event_types.set(key, event_type_id)
+    return event_type_id
+
+
+async def get_cal_slots(http_client: httpx.AsyncClient, event_type_slug: str, username: str):
+    key = (username, event_type_slug)
+    cal_slot_keys.add(key)
+    slots = cal_slots.get(key)
+    if not slots:
+        slots = await fetch_cal_slots(http_client, event_type_slug, username)
+        if slots is not None:
+            cal_slots.set(key, slots)
+    return slots
+
+
+def take_cal_slot(event_type_slug: str, username: str, slot: str):
+    """Drop a booked (or rejected) slot from the cached availability"""
+    key = (username, event_type_slug)
+    slots = cal_slots.get(key)
+    if slots and slot in slots:
+        cal_slots.set(key, [s for s in slots if s != slot])
+
+
+async def refresh_cal_slots():
+    """Keep cached availability warm so the booking path is a single POST"""
+    while True:
+        try:
+            http_client = http_clients.get("cal")
+            for username, event_type_slug in list(cal_slot_keys):
+                slots = await fetch_cal_slots(http_client, event_type_slug, username)
+                if slots is not None:
+                    cal_slots.set((username, event_type_slug), slots)
+        except Exception as e:
+            logging.error(f"Error refreshing Cal.com slots: {e}")
+        await asyncio.sleep(cal_slots_refresh_interval)
+
+
+# Errors Cal.com returns when the requested start time can no longer be booked
+CAL_SLOT_UNAVAILABLE_ERRORS = {"no_available_users_found_error", "booking_time_out_of_bounds_error"}
+
+
+def is_cal_slot_unavailable(response: httpx.Response) -> bool:
+    """Whether a failed booking was rejected because of the slot, rather than the key or the lead"""
+    if response.status_code == 409:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        return response.json().get("message") in CAL_SLOT_UNAVAILABLE_ERRORS
+    except ValueError:
+        return False
+
+
 async def create_cal_booking(name: str, email: str, event_type_slug: str = "30min", username: str = "gretta-ai"):
     """Create a booking in Cal.com using v1 API"""
     if not cal_api_key:
@@ -212,72 +903,34 @@ async def create_cal_booking(name: str, email: str, event_type_slug: str = "30mi
         return None
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            # Use v1 API which works with the API key
-            cal_v1_url = "https://api.cal.com/v1"
-            
-            # Get available slots first
-            tomorrow = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d")
-            next_week = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
-            
-            slots_response = await http_client.get(
-                f"{cal_v1_url}/slots",
-                params={
-                    "eventTypeSlug": event_type_slug,
-                    "usernameList": username,
-                    "startTime": tomorrow,
-                    "endTime": next_week,
-                    "timeZone": "UTC",
-                    "apiKey": cal_api_key
-                }
-            )
-            
-            if slots_response.status_code != 200:
-                logging.error(f"Cal.com slots error: {slots_response.text}")
-                return None
-            
-            slots_data = slots_response.json()
-            available_slots = slots_data.get("slots", {})
-            
-            # Get first available slot
-            first_slot = None
-            for date, slots in available_slots.items():
-                if slots and len(slots) > 0:
-                    first_slot = slots[0].get("time")
-                    break
-            
-            if not first_slot:
-                logging.warning("No available Cal.com slots found")
-                return None
-            
-            logging.info(f"Found available Cal.com slot: {first_slot}")
-            
-            # For v1 API, we need the event type ID - let's get it first
-            event_types_response = await http_client.get(
-                f"{cal_v1_url}/event-types",
-                params={"apiKey": cal_api_key}
-            )
-            
-            if event_types_response.status_code != 200:
-                logging.error(f"Cal.com event types error: {event_types_response.text}")
-                return None
-            
-            event_types_data = event_types_response.json()
-            event_type_id = None
-            
-            for et in event_types_data.get("event_types", []):
-                if et.get("slug") == event_type_slug:
-                    event_type_id = et.get("id")
-                    break
-            
-            if not event_type_id:
-                logging.warning(f"Could not find event type with slug: {event_type_slug}")
+        http_client = http_clients.get("cal")
+        
+        # Availability and the event type ID normally come from cache; on a miss both are fetched at once
+        slots, event_type_id = await asyncio.gather(
+            get_cal_slots(http_client, event_type_slug, username),
+            get_cal_event_type_id(http_client, event_type_slug, username),
+        )
+        if not slots:
+            logging.warning("No available Cal.com slots found")
+            return None
+        
+        if not event_type_id:
+            logging.warning(f"Could not find event type with slug: {event_type_slug}")
+            return None
+        
+        calendar = f"{username}/{event_type_slug}"
+        for _ in range(cal_booking_slot_attempts):
+            reservation = await cal_slot_allocator.reserve(calendar, slots)
+            if reservation is None:
+                logging.warning("All cached Cal.com slots are reserved by other requests")
                 return None
+            slot, holder = reservation
+            logging.info(f"Reserved Cal.com slot: {slot}")
             
             # Create booking using v1 API
             booking_payload = {
                 "eventTypeId": event_type_id,
-                "start": first_slot,
+                "start": slot,
                 "responses": {
                     "name": name,
                     "email": email,
@@ -293,25 +946,236 @@ async def create_cal_booking(name: str, email: str, event_type_slug: str = "30mi
                 }
             }
             
-            response = await http_client.post(
-                f"{cal_v1_url}/bookings",
-                params={"apiKey": cal_api_key},
-                json=booking_payload
-            )
+            try:
+                response = await cal_request(
+                    http_client, "bookings", "POST",
+                    f"{cal_v1_url}/bookings",
+                    params={"apiKey": cal_api_key},
+                    json=booking_payload
+                )
+            except BaseException:
+                await cal_slot_allocator.release(calendar, slot, holder)
+                raise
             
-            if response.status_code >= 400:
-                logging.error(f"Cal.com booking error: {response.text}")
+            if response.status_code < 400:
+                break
+            logging.error(f"Cal.com booking error: {response.text}")
+            if not is_cal_slot_unavailable(response):
+                # Nothing wrong with the slot (bad key, rejected lead, outage); give it back
+                await cal_slot_allocator.release(calendar, slot, holder)
                 return None
-            
-            result = response.json()
-            logging.info(f"Created Cal.com booking: {result}")
-            return result
+            # Cal.com says the slot is no longer free, most likely booked elsewhere; try the next one
+            await cal_slot_allocator.mark_taken(calendar, slot, holder)
+            take_cal_slot(event_type_slug, username, slot)
+            slots = [s for s in slots if s != slot]
+        else:
+            return None
+        
+        result = response.json()
+        await cal_slot_allocator.confirm(calendar, slot, holder, result.get("uid"))
+        take_cal_slot(event_type_slug, username, slot)
+        logging.info(f"Created Cal.com booking: {result}")
+        return result
     
     except Exception as e:
         logging.error(f"Error creating Cal.com booking: {e}")
         return None
 
 
+# ============ Retell Integration Helpers ============
+
+async def create_retell_web_call_session(agent_id: str):
+    """Create a Retell web call, bounded by RETELL_MAX_CONCURRENCY and the Retell breaker and deadline"""
+    async def create():
+        async with retell_slots:
+            return await retell.call.create_web_call(agent_id=agent_id)
+    
+    async def call(deadline: float):
+        with track_integration("retell", "create_web_call"):
+            return await asyncio.wait_for(create(), deadline)
+    
+    return await retell_guard.call(call)
+
+
+# Web call access tokens expire unless the call starts shortly after creation,
+# so pooled sessions live for RETELL_WARM_POOL_TTL seconds (keep it under 30)
+retell_warm_pool = WarmPool(
+    "retell_web_calls",
+    create_retell_web_call_session,
+    size=int(os.environ.get('RETELL_WARM_POOL_SIZE', '0')),
+    ttl=float(os.environ.get('RETELL_WARM_POOL_TTL', '20')),
+)
+
+
+# ============ Outbox Handlers ============
+
+def contact_hubspot_task(contact: Contact) -> dict:
+    return {
+        "name": contact.name,
+        "email": contact.email,
+        "company": contact.company,
+        "interest": contact.message,
+        "note": f"Contact Form Submission\n\nName: {contact.name}\nEmail: {contact.email}\nMessage: {contact.message}",
+    }
+
+
+def demo_hubspot_task(demo_request: DemoRequest) -> dict:
+    return {
+        "name": demo_request.name,
+        "email": demo_request.email,
+        "phone": demo_request.phone,
+        "company": demo_request.company,
+        "interest": demo_request.plan_type,
+        "note": f"Booking/Demo Request\n\nName: {demo_request.name}\nEmail: {demo_request.email}\nPhone: {demo_request.phone}\nCompany: {demo_request.company}\nInterest: {demo_request.plan_type}",
+    }
+
+
+def trial_hubspot_task(trial_signup: TrialSignup) -> dict:
+    return {
+        "name": trial_signup.name,
+        "email": trial_signup.email,
+        "phone": trial_signup.phone,
+        "company": trial_signup.company,
+        "interest": trial_signup.plan_type,
+        "deal_name": f"Trial Signup - {trial_signup.plan_type} - {trial_signup.name}",
+        "note": f"Free Trial Signup\n\nName: {trial_signup.name}\nEmail: {trial_signup.email}\nPhone: {trial_signup.phone}\nCompany: {trial_signup.company}\nPlan: {trial_signup.plan_type}",
+    }
+
+
+async def forget_stale_contact(email: str, progress: dict):
+    """Re-run the contact upsert on the next attempt if its HubSpot ID was invalidated"""
+    if not await hubspot_ids.get(email.lower()):
+        progress.pop("contact", None)
+
+
+def retry_later(guard: IntegrationGuard, message: str) -> RetryLater:
+    """Back off as usual, or wait out an open breaker without spending an attempt"""
+    if guard.breaker.is_open:
+        return RetryLater(
+            f"{message} ({guard.name} circuit open)",
+            delay=guard.breaker.retry_after * random.uniform(1.0, 1.5),
+            consume_attempt=False
+        )
+    return RetryLater(message)
+
+
+async def process_hubspot_sync(entry: dict, progress: dict):
+    """Sync a lead to HubSpot: contact upsert, then the optional deal and note"""
+    payload = entry["payload"]
+    if hubspot_guard.breaker.is_open:
+        raise retry_later(hubspot_guard, "HubSpot unavailable")
+    
+    if "contact" not in progress:
+        contact = await sync_contact_to_hubspot(
+            name=payload["name"],
+            email=payload["email"],
+            phone=payload.get("phone"),
+            company=payload.get("company"),
+            interest=payload.get("interest")
+        )
+        if not contact:
+            raise retry_later(hubspot_guard, "HubSpot contact sync failed")
+        progress["contact"] = contact
+    hubspot_id = progress["contact"]["hubspot_id"]
+    
+    if payload.get("deal_name") and "deal" not in progress:
+        deal = await create_hubspot_deal(
+            contact_email=payload["email"],
+            deal_name=payload["deal_name"],
+            interest=payload.get("interest"),
+            amount=0,
+            contact_id=hubspot_id
+        )
+        if not deal:
+            await forget_stale_contact(payload["email"], progress)
+            raise retry_later(hubspot_guard, "HubSpot deal creation failed")
+        progress["deal"] = deal
+    
+    if payload.get("note") and "note" not in progress:
+        note = await create_hubspot_note(hubspot_id, payload["note"])
+        if not note:
+            await forget_stale_contact(payload["email"], progress)
+            raise retry_later(hubspot_guard, "HubSpot note creation failed")
+        progress["note"] = note
+    
+    return {"hubspot_synced": True, "hubspot_id": hubspot_id}
+
+
+async def process_cal_booking(entry: dict, progress: dict):
+    """Book the demo slot in Cal.com for a demo request"""
+    payload = entry["payload"]
+    if cal_guard.breaker.is_open:
+        raise retry_later(cal_guard, "Cal.com unavailable")
+    booking = await create_cal_booking(name=payload["name"], email=payload["email"])
+    if not booking:
+        raise retry_later(cal_guard, "Cal.com booking failed")
+    
+    booking_data = booking.get("data", booking) if isinstance(booking, dict) else {}
+    return {"cal_booking_created": True, "cal_booking_uid": booking_data.get("uid")}
+
+
+def traced_outbox_handler(kind: str, handler):
+    """Run an outbox handler in a span that continues the trace of the request that queued it"""
+    async def run(entry: dict, progress: dict):
+        with tracer.span(
+            f"outbox.{kind}",
+            kind="consumer",
+            parent=entry.get("traceparent"),
+            **{"outbox.attempt": entry["attempts"], "outbox.lead_collection": entry["lead_collection"]}
+        ):
+            return await handler(entry, progress)
+    return run
+
+
+outbox.register("hubspot", traced_outbox_handler("hubspot", process_hubspot_sync))
+outbox.register("cal_booking", traced_outbox_handler("cal_booking", process_cal_booking))
+
+
+async def run_side_effect(lead_id: str, kind: str) -> dict:
+    """Claim and run one of a lead's outbox entries now, returning its outcome for the response"""
+    entry = await outbox.claim(lead_id, kind)
+    if entry is None:
+        return {"status": "queued"}
+    updates = await outbox.process(entry)
+    if updates is None:
+        return {"status": "retrying"}
+    # Keep the IDs; the hubspot_synced / cal_booking_created flags are implied by "done"
+    return {"status": "done", **{k: v for k, v in updates.items() if not isinstance(v, bool)}}
+
+
+async def run_side_effects(lead_id: str, kinds: list, timeout: float) -> dict:
+    """Run a lead's independent side-effect branches concurrently, each for up to ``timeout`` seconds.
+
+    Branches are not cancelled at the deadline: they keep running in the
+    background (reported as "pending") and record their result through the
+    outbox as usual, so no vendor call is wasted or repeated.
+    """
+    branches = {kind: asyncio.create_task(run_side_effect(lead_id, kind)) for kind in kinds}
+    if not branches:
+        return {}
+    await asyncio.wait(branches.values(), timeout=timeout)
+    outcomes = {}
+    for kind, task in branches.items():
+        if not task.done():
+            inline_side_effects.add(task)
+            task.add_done_callback(inline_side_effects.discard)
+            outcomes[kind] = {"status": "pending"}
+        elif task.exception() is not None:
+            # Outbox bookkeeping failed; the entry's lease lapses and a worker retries it
+            logging.error(f"Inline {kind} side effect for {lead_id} failed: {task.exception()}")
+            outcomes[kind] = {"status": "queued"}
+        else:
+            outcomes[kind] = task.result()
+    return outcomes
+
+
+def side_effects_status(outcomes: dict) -> str:
+    if not outcomes:
+        return "skipped"
+    done = sum(outcome["status"] == "done" for outcome in outcomes.values())
+    return "completed" if done == len(outcomes) else ("partial" if done else "queued")
+
+
 # Health check endpoint
 @api_router.get("/")
 async def root():
@@ -322,27 +1186,20 @@ async def root():
 @api_router.post("/contact", response_model=dict)
 async def create_contact(contact_data: ContactCreate):
     try:
-        contact = Contact(**contact_data.dict())
-        await db.contacts.insert_one(contact.dict())
-        
-        # Sync to HubSpot
-        hubspot_result = await sync_contact_to_hubspot(
-            name=contact_data.name,
-            email=contact_data.email,
-            company=getattr(contact_data, 'company', None),
-            interest=getattr(contact_data, 'message', None)
-        )
+        contact, doc = build_lead(Contact, contact_data, hubspot_synced=False)
         
-        # Add note with form details if contact was created/updated in HubSpot
-        if hubspot_result and hubspot_result.get("hubspot_id"):
-            note_text = f"Contact Form Submission\n\nName: {contact_data.name}\nEmail: {contact_data.email}\nMessage: {getattr(contact_data, 'message', 'N/A')}"
-            await create_hubspot_note(hubspot_result["hubspot_id"], note_text)
+        tasks = {}
+        if hubspot_client:
+            tasks["hubspot"] = contact_hubspot_task(contact)
         
-        return {
+        await outbox.record_lead("contacts", doc, tasks)
+        await record_lead_created("contacts", created_at=contact.created_at)
+        
+        return ORJSONResponse({
             "success": True, 
             "message": "Contact request submitted successfully",
-            "hubspot_synced": hubspot_result is not None
-        }
+            "sync_status": "queued" if tasks else "skipped"
+        })
     except Exception as e:
         logging.error(f"Error creating contact: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit contact request")
@@ -352,14 +1209,23 @@ async def create_contact(contact_data: ContactCreate):
 @api_router.post("/newsletter", response_model=dict)
 async def subscribe_newsletter(newsletter_data: NewsletterCreate):
     try:
-        # Check if email already exists
-        existing = await db.newsletter_subscribers.find_one({"email": newsletter_data.email})
-        if existing:
-            return {"success": True, "message": "You are already subscribed to our newsletter"}
-        
-        subscriber = NewsletterSubscriber(**newsletter_data.dict())
-        await db.newsletter_subscribers.insert_one(subscriber.dict())
-        return {"success": True, "message": "Successfully subscribed to newsletter"}
+        subscriber, doc = build_lead(NewsletterSubscriber, newsletter_data)
+        
+        # One indexed upsert both checks for and records the subscription
+        try:
+            result = await db.newsletter_subscribers.update_one(
+                {"email": subscriber.email},
+                {"$setOnInsert": doc},
+                upsert=True
+            )
+            subscribed = result.upserted_id is not None
+        except DuplicateKeyError:
+            subscribed = False
+        
+        if not subscribed:
+            return ORJSONResponse({"success": True, "message": "You are already subscribed to our newsletter"})
+        await record_lead_created("newsletter_subscribers", created_at=subscriber.subscribed_at)
+        return ORJSONResponse({"success": True, "message": "Successfully subscribed to newsletter"})
     except Exception as e:
         logging.error(f"Error subscribing to newsletter: {e}")
         raise HTTPException(status_code=500, detail="Failed to subscribe to newsletter")
@@ -369,35 +1235,30 @@ async def subscribe_newsletter(newsletter_data: NewsletterCreate):
 @api_router.post("/demo-request", response_model=dict)
 async def create_demo_request(demo_data: DemoRequestCreate):
     try:
-        demo_request = DemoRequest(**demo_data.dict())
-        result = await db.demo_requests.insert_one(demo_request.dict())
-        
-        # Sync to HubSpot
-        hubspot_result = await sync_contact_to_hubspot(
-            name=demo_request.name,
-            email=demo_request.email,
-            phone=demo_request.phone,
-            company=demo_request.company,
-            interest=demo_request.plan_type
-        )
+        demo_request, doc = build_lead(DemoRequest, demo_data, hubspot_synced=False, cal_booking_created=False)
         
-        # Add note with booking details if contact was created/updated in HubSpot
-        if hubspot_result and hubspot_result.get("hubspot_id"):
-            note_text = f"Booking/Demo Request\n\nName: {demo_request.name}\nEmail: {demo_request.email}\nPhone: {demo_request.phone}\nCompany: {demo_request.company}\nInterest: {demo_request.plan_type}"
-            await create_hubspot_note(hubspot_result["hubspot_id"], note_text)
+        tasks = {}
+        if hubspot_client:
+            tasks["hubspot"] = demo_hubspot_task(demo_request)
+        if cal_api_key:
+            tasks["cal_booking"] = {"name": demo_request.name, "email": demo_request.email}
         
-        # Create Cal.com booking
-        cal_booking = await create_cal_booking(
-            name=demo_request.name,
-            email=demo_request.email
-        )
+        inline = demo_side_effect_timeout > 0
+        result = await outbox.record_lead("demo_requests", doc, tasks, notify=not inline)
+        await record_lead_created("demo_requests", created_at=demo_request.created_at, plan_type=demo_request.plan_type)
+        
+        # HubSpot (contact -> note) and Cal.com (availability -> booking) don't depend on each other
+        if inline:
+            side_effects = await run_side_effects(demo_request.id, list(tasks), demo_side_effect_timeout)
+        else:
+            side_effects = {kind: {"status": "queued"} for kind in tasks}
         
         # Return the data in a format suitable for webhooks
-        return {
+        return ORJSONResponse({
             "success": True, 
             "message": "Demo request submitted successfully",
-            "hubspot_synced": hubspot_result is not None,
-            "cal_booking_created": cal_booking is not None,
+            "sync_status": side_effects_status(side_effects),
+            "side_effects": side_effects,
             "data": {
                 "id": str(result.inserted_id),
                 "name": demo_request.name,
@@ -407,35 +1268,90 @@ async def create_demo_request(demo_data: DemoRequestCreate):
                 "interested_in": demo_request.plan_type,
                 "timestamp": demo_request.created_at.isoformat()
             }
-        }
+        })
     except Exception as e:
         logging.error(f"Error creating demo request: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit demo request")
 
 
+# Fields exported to webhook consumers, renamed server-side
+BOOKING_EXPORT_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "name": 1,
+    "email": 1,
+    "phone": 1,
+    "company": 1,
+    "interested_in": "$plan_type",
+    "preferred_time": 1,
+    "created_at": 1,
+}
+
+
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{doc_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    created_at, doc_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    return datetime.fromisoformat(created_at), doc_id
+
+
 # Webhook endpoint for external integrations (HubSpot, Zapier, etc.)
 @api_router.get("/webhook/bookings", response_model=list)
-async def get_bookings_webhook():
-    """Webhook endpoint to fetch recent booking/demo requests for integration with HubSpot/Zapier"""
+async def get_bookings_webhook(
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(default=bookings_page_size, ge=1, le=1000)
+):
+    """Webhook endpoint to fetch recent booking/demo requests for integration with HubSpot/Zapier
+
+    Without ``cursor``/``since`` this returns the newest requests, newest first.
+    With them it returns requests created after that point, oldest first, so a
+    poller only reads what is new. The cursor for the next poll is sent in the
+    ``X-Next-Cursor`` header on every response, including empty ones.
+    """
     try:
-        # Get last 100 demo requests
-        demo_requests = await db.demo_requests.find().sort("created_at", -1).limit(100).to_list(100)
-        
-        # Format for webhook consumption
-        formatted_data = []
-        for req in demo_requests:
-            formatted_data.append({
-                "id": req.get("id"),
-                "name": req.get("name"),
-                "email": req.get("email"),
-                "phone": req.get("phone"),
-                "company": req.get("company"),
-                "interested_in": req.get("plan_type"),
-                "preferred_time": req.get("preferred_time"),
-                "created_at": req.get("created_at")
-            })
-        
-        return formatted_data
+        if cursor:
+            try:
+                after_created_at, after_id = decode_cursor(cursor)
+            except Exception:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            # Cursors minted without a row (see below) carry no id and mean "strictly after created_at"
+            match = {"$or": [
+                {"created_at": {"$gt": after_created_at}},
+                {"created_at": after_created_at, "id": {"$gt": after_id}},
+            ]} if after_id else {"created_at": {"$gt": after_created_at}}
+            sort = {"created_at": 1, "id": 1}
+        elif since:
+            match = {"created_at": {"$gt": as_naive_utc(since)}}
+            sort = {"created_at": 1, "id": 1}
+        else:
+            match = {}
+            sort = {"created_at": -1, "id": -1}
+        
+        # Keyset page on the (created_at, id) index, projected to the exported fields
+        formatted_data = await db.demo_requests.aggregate([
+            {"$match": match},
+            {"$sort": sort},
+            {"$limit": limit},
+            {"$project": BOOKING_EXPORT_PROJECTION},
+        ]).to_list(limit)
+        
+        headers = {}
+        if formatted_data:
+            newest = formatted_data[0] if sort["created_at"] < 0 else formatted_data[-1]
+            headers["X-Next-Cursor"] = encode_cursor(newest["created_at"], newest["id"])
+        elif cursor:
+            headers["X-Next-Cursor"] = cursor
+        else:
+            # Nothing to page from yet: resume from `since`, or from the very first booking
+            headers["X-Next-Cursor"] = encode_cursor(as_naive_utc(since) or datetime.min, "")
+        
+        # Rows are already in their exported shape; orjson encodes the datetimes directly
+        return ORJSONResponse(formatted_data, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching bookings webhook: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch bookings")
@@ -445,68 +1361,370 @@ async def get_bookings_webhook():
 @api_router.post("/trial-signup", response_model=dict)
 async def create_trial_signup(trial_data: TrialSignupCreate):
     try:
-        # Check if email already exists
-        existing = await db.trial_signups.find_one({"email": trial_data.email})
-        if existing:
-            return {"success": True, "message": "You have already signed up for a free trial"}
-        
-        trial_signup = TrialSignup(**trial_data.dict())
-        await db.trial_signups.insert_one(trial_signup.dict())
-        
-        # Sync to HubSpot - create contact
-        hubspot_result = await sync_contact_to_hubspot(
-            name=trial_data.name,
-            email=trial_data.email,
-            phone=trial_data.phone,
-            company=trial_data.company,
-            interest=trial_data.plan_type
-        )
+        trial_signup, doc = build_lead(TrialSignup, trial_data, hubspot_synced=False)
         
-        # Create HubSpot deal for trial signup
-        if hubspot_result:
-            deal_name = f"Trial Signup - {trial_data.plan_type} - {trial_data.name}"
-            deal_result = await create_hubspot_deal(
-                contact_email=trial_data.email,
-                deal_name=deal_name,
-                interest=trial_data.plan_type,
-                amount=0
-            )
-            
-            # Add note with trial details
-            if hubspot_result.get("hubspot_id"):
-                note_text = f"Free Trial Signup\n\nName: {trial_data.name}\nEmail: {trial_data.email}\nPhone: {trial_data.phone}\nCompany: {trial_data.company}\nPlan: {trial_data.plan_type}"
-                await create_hubspot_note(hubspot_result["hubspot_id"], note_text)
+        tasks = {}
+        if hubspot_client:
+            tasks["hubspot"] = trial_hubspot_task(trial_signup)
         
-        return {
+        # Deduplicated on the unique email index; a repeat signup queues nothing
+        result = await outbox.record_lead("trial_signups", doc, tasks, unique_key="email")
+        if result.upserted_id is None:
+            return ORJSONResponse({"success": True, "message": "You have already signed up for a free trial"})
+        await record_lead_created("trial_signups", created_at=trial_signup.created_at, plan_type=trial_signup.plan_type)
+        
+        return ORJSONResponse({
             "success": True, 
             "message": "Free trial signup successful! We'll contact you shortly.",
-            "hubspot_synced": hubspot_result is not None
-        }
+            "sync_status": "queued" if tasks else "skipped"
+        })
     except Exception as e:
         logging.error(f"Error creating trial signup: {e}")
         raise HTTPException(status_code=500, detail="Failed to sign up for trial")
 
 
+# ============ Bulk Lead Ingest ============
+
+# Record type -> (request model, stored model, collection, HubSpot task builder)
+BULK_LEAD_TYPES = {
+    "contact": (ContactCreate, Contact, "contacts", contact_hubspot_task),
+    "demo": (DemoRequestCreate, DemoRequest, "demo_requests", demo_hubspot_task),
+    "trial": (TrialSignupCreate, TrialSignup, "trial_signups", trial_hubspot_task),
+}
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors())
+
+
+# Yielded by read_bulk_rows when an NDJSON stream passes BULK_MAX_BODY_BYTES; nothing after it is read
+BODY_LIMIT_REACHED = object()
+
+
+async def read_bulk_rows(request: Request):
+    """Yield raw records from a JSON array body or an NDJSON stream, reading at most BULK_MAX_BODY_BYTES"""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > bulk_max_body_bytes:
+        raise HTTPException(status_code=413, detail=f"Bulk imports are limited to {bulk_max_body_bytes} bytes")
+    
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        pending = b""
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > bulk_max_body_bytes:
+                # Earlier rows may already be stored, so report the cut-off instead of failing the import
+                yield BODY_LIMIT_REACHED
+                return
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if pending.strip():
+            yield pending
+        return
+    
+    # A JSON array is parsed whole, so an oversized one is refused before anything is written
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > bulk_max_body_bytes:
+            raise HTTPException(status_code=413, detail=f"Bulk imports are limited to {bulk_max_body_bytes} bytes")
+    rows = json.loads(body)
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON body")
+    for row in rows:
+        yield row
+
+
+async def ingest_bulk_chunk(rows: list, default_type: Optional[str], seen: set, results: list):
+    """Validate, de-duplicate and insert one chunk of bulk rows"""
+    by_type = {}
+    for index, raw in rows:
+        try:
+            if isinstance(raw, (bytes, str)):
+                raw = json.loads(raw)
+            if not isinstance(raw, dict):
+                raise ValueError("record must be a JSON object")
+            lead_type = raw.get("type", default_type)
+            if lead_type not in BULK_LEAD_TYPES:
+                raise ValueError(f"unknown record type: {lead_type}")
+            create_model, model, _, _ = BULK_LEAD_TYPES[lead_type]
+            lead, _ = build_lead(model, create_model(**{k: v for k, v in raw.items() if k != "type"}))
+        except ValidationError as e:
+            results.append(BulkLeadResult(row=index, status="invalid", error=format_validation_error(e)))
+            continue
+        except ValueError as e:
+            results.append(BulkLeadResult(row=index, status="invalid", error=str(e)))
+            continue
+        
+        # One pass over the whole import: the first record per (type, email) wins
+        key = (lead_type, lead.email.lower())
+        if key in seen:
+            results.append(BulkLeadResult(row=index, status="duplicate", id=None, error="duplicate email in import"))
+            continue
+        seen.add(key)
+        by_type.setdefault(lead_type, []).append((index, lead))
+    
+    for lead_type, items in by_type.items():
+        _, _, collection, hubspot_task = BULK_LEAD_TYPES[lead_type]
+        docs = [{**lead.__dict__, "hubspot_synced": False} for _, lead in items]
+        if lead_type == "demo":
+            for doc in docs:
+                doc["cal_booking_created"] = False
+        
+        failed = {}
+        try:
+            await db[collection].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = error
+        
+        inserted = []
+        for position, (index, lead) in enumerate(items):
+            error = failed.get(position)
+            if error is None:
+                inserted.append(lead)
+                results.append(BulkLeadResult(row=index, status="created", id=lead.id))
+            elif error.get("code") == 11000:
+                results.append(BulkLeadResult(row=index, status="duplicate", error="email already exists"))
+            else:
+                results.append(BulkLeadResult(row=index, status="error", error=error.get("errmsg")))
+        
+        # CRM sync goes through the outbox, whose workers feed the HubSpot batch API
+        if hubspot_client and inserted:
+            await outbox.enqueue([
+                outbox.make_entry("hubspot", collection, lead.id, hubspot_task(lead))
+                for lead in inserted
+            ])
+        
+        plan_counts = {}
+        for lead in inserted:
+            plan_type = getattr(lead, "plan_type", None)
+            plan_counts[plan_type] = plan_counts.get(plan_type, 0) + 1
+        for plan_type, count in plan_counts.items():
+            await record_lead_created(collection, count=count, plan_type=plan_type)
+
+
+# Bulk import of contact / demo / trial leads (JSON array or NDJSON)
+@api_router.post("/leads/bulk", response_model=BulkIngestReport, dependencies=[Depends(require_admin_key)])
+async def bulk_ingest_leads(request: Request, type: Optional[str] = Query(default=None, pattern="^(contact|demo|trial)$")):
+    """Rows carry their own ``type`` field, or all default to the ``type`` query parameter.
+
+    Bulk demo requests are synced to HubSpot but do not book Cal.com slots.
+    Rows past BULK_MAX_ROWS, or past BULK_MAX_BODY_BYTES in an NDJSON
+    stream, are reported as ``rejected`` rather than failing the rows
+    already stored.
+    """
+    try:
+        results = []
+        seen = set()
+        chunk = []
+        total = 0
+        async for raw in read_bulk_rows(request):
+            if raw is BODY_LIMIT_REACHED:
+                results.append(BulkLeadResult(
+                    row=total, status="rejected",
+                    error=f"body exceeds {bulk_max_body_bytes} bytes; this and later rows were not read"
+                ))
+                total += 1
+                break
+            if total >= bulk_max_rows:
+                results.append(BulkLeadResult(row=total, status="rejected", error=f"over the {bulk_max_rows} row limit"))
+                total += 1
+                continue
+            chunk.append((total, raw))
+            total += 1
+            if len(chunk) >= bulk_chunk_size:
+                await ingest_bulk_chunk(chunk, type, seen, results)
+                chunk = []
+        if chunk:
+            await ingest_bulk_chunk(chunk, type, seen, results)
+        
+        results.sort(key=lambda result: result.row)
+        statuses = [result.status for result in results]
+        return BulkIngestReport(
+            total=total,
+            created=statuses.count("created"),
+            duplicates=statuses.count("duplicate"),
+            invalid=statuses.count("invalid"),
+            failed=statuses.count("error"),
+            rejected=statuses.count("rejected"),
+            results=results
+        )
+    except HTTPException:
+        raise
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    except Exception as e:
+        logging.error(f"Error ingesting bulk leads: {e}")
+        raise HTTPException(status_code=500, detail="Failed to ingest leads")
+
+
 # Get Analytics
 @api_router.get("/analytics", response_model=Analytics)
 async def get_analytics():
     try:
-        total_contacts = await db.contacts.count_documents({})
-        total_demo_requests = await db.demo_requests.count_documents({})
-        total_trial_signups = await db.trial_signups.count_documents({})
-        total_newsletter_subscribers = await db.newsletter_subscribers.count_documents({})
+        totals = None
+        if analytics_mode == "counters":
+            totals = await db.analytics_counters.find_one({"_id": ANALYTICS_COUNTERS_ID})
+        if totals is None:
+            totals = await count_leads(exact=analytics_mode != "estimated")
         
         return Analytics(
-            total_contacts=total_contacts,
-            total_demo_requests=total_demo_requests,
-            total_trial_signups=total_trial_signups,
-            total_newsletter_subscribers=total_newsletter_subscribers
+            total_contacts=totals.get("contacts", 0),
+            total_demo_requests=totals.get("demo_requests", 0),
+            total_trial_signups=totals.get("trial_signups", 0),
+            total_newsletter_subscribers=totals.get("newsletter_subscribers", 0)
         )
     except Exception as e:
         logging.error(f"Error getting analytics: {e}")
         raise HTTPException(status_code=500, detail="Failed to get analytics")
 
 
+# ============ Lead Export ============
+
+EXPORT_MODELS = {
+    "contacts": Contact,
+    "demo_requests": DemoRequest,
+    "trial_signups": TrialSignup,
+    "newsletter_subscribers": NewsletterSubscriber,
+}
+EXPORT_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+async def stream_export(cursor, fields: list, export_format: str, compress: bool):
+    """Yield the export in chunks of one cursor batch, optionally gzip-compressed"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        if compressor is None:
+            return data
+        # Sync-flush so each chunk reaches the client without waiting for the end of the export
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(fields)
+        yield encode(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    
+    rows = 0
+    try:
+        async for doc in cursor:
+            if writer:
+                writer.writerow([export_value(doc.get(field)) for field in fields])
+            else:
+                buffer.write(json.dumps({field: export_value(doc.get(field)) for field in fields}, default=str))
+                buffer.write("\n")
+            rows += 1
+            if rows % export_batch_size == 0:
+                yield encode(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+    except Exception as e:
+        # Headers are already sent; re-raising aborts the chunked response, so the client sees a broken
+        # transfer instead of a well-formed file that is silently missing rows
+        logging.error(f"Error streaming export after {rows} rows: {e}")
+        raise
+    
+    tail = encode(buffer.getvalue()) if buffer.tell() else b""
+    if compressor is not None:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
+# Stream a lead collection as NDJSON or CSV without loading it into memory; needs the admin API key
+@api_router.get("/export/{collection}", dependencies=[Depends(require_admin_key)])
+async def export_leads(
+    collection: str,
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    gzip: bool = False
+):
+    if collection not in EXPORT_MODELS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {collection}")
+    
+    if fields:
+        field_list = [field.strip() for field in fields.split(",") if field.strip()]
+        invalid = [field for field in field_list if not EXPORT_FIELD_PATTERN.match(field)]
+        if invalid or not field_list:
+            raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(invalid) or fields}")
+    else:
+        field_list = list(EXPORT_MODELS[collection].model_fields)
+    
+    time_field = LEAD_FORMS[collection][1]
+    query = {}
+    if start or end:
+        query[time_field] = {}
+        if start:
+            query[time_field]["$gte"] = as_naive_utc(start)
+        if end:
+            query[time_field]["$lt"] = as_naive_utc(end)
+    
+    projection = {"_id": 0, **{field: 1 for field in field_list}}
+    cursor = db[collection].find(query, projection).sort(time_field, 1).batch_size(export_batch_size)
+    
+    extension = "csv" if format == "csv" else "ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="{collection}.{extension}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        stream_export(cursor, field_list, format, gzip),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers=headers
+    )
+
+
+# Leads per hour / day by form and plan, read from the precomputed rollups
+@api_router.get("/analytics/timeseries", response_model=LeadTimeseries)
+async def get_analytics_timeseries(
+    granularity: str = Query(default="day", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    form: Optional[str] = Query(default=None, pattern="^(contact|demo|trial|newsletter)$"),
+    plan_type: Optional[str] = None
+):
+    try:
+        end = as_naive_utc(end) or datetime.utcnow()
+        start = as_naive_utc(start) or end - (timedelta(days=2) if granularity == "hour" else timedelta(days=30))
+        
+        query = {"granularity": granularity, "bucket": {"$gte": rollup_bucket(start, granularity), "$lt": end}}
+        if form:
+            query["form"] = form
+        if plan_type:
+            query["plan_type"] = plan_type
+        
+        rows = await db.lead_rollups.find(query, {"_id": 0, "granularity": 0}).sort("bucket", 1).to_list(None)
+        
+        return LeadTimeseries(
+            granularity=granularity,
+            start=start,
+            end=end,
+            points=[TimeseriesPoint(**row) for row in rows]
+        )
+    except Exception as e:
+        logging.error(f"Error getting analytics timeseries: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get analytics timeseries")
+
+
 # Retell AI Web Call endpoint
 @api_router.post("/retell/web-call")
 async def create_retell_web_call():
@@ -515,13 +1733,10 @@ async def create_retell_web_call():
         if not retell:
             raise HTTPException(status_code=500, detail="Retell AI not configured")
         
-        # Use pre-created agent from dashboard
-        agent_id = "agent_c66728951e5ce6e61b79b01af9"
+        agent_id = retell_agent_id
         
-        # Create web call with the agent
-        web_call_response = retell.call.create_web_call(
-            agent_id=agent_id,
-        )
+        # Create web call with the agent, or take a pre-created one from the warm pool
+        web_call_response = await retell_warm_pool.get(agent_id)
         
         return {
             "access_token": web_call_response.access_token,
@@ -529,14 +1744,125 @@ async def create_retell_web_call():
             "agent_id": agent_id
         }
         
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Voice calls are temporarily unavailable",
+            headers={"Retry-After": str(max(int(e.retry_after), 1))}
+        )
+    except asyncio.TimeoutError:
+        logging.error(f"Timed out creating Retell web call after {retell_guard.timeout.current():.1f}s")
+        raise HTTPException(status_code=504, detail="Timed out creating web call")
     except Exception as e:
         logging.error(f"Error creating Retell web call: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create web call: {str(e)}")
 
 
+# Thread pool usage, for sizing HUBSPOT_POOL_SIZE / HUBSPOT_POOL_QUEUE
+@api_router.get("/health/pools")
+async def get_pool_stats():
+    return {
+        "hubspot": hubspot_executor.stats(),
+        "hubspot_batches": [b.stats() for b in (contact_batcher, note_batcher, deal_batcher)],
+        "hubspot_id_cache": hubspot_ids.stats(),
+        "retell_warm_pool": retell_warm_pool.stats(),
+        "http_clients": http_clients.stats(),
+        "cal_cache": {"event_types": cal_event_types.stats(), "slots": cal_slots.stats()},
+        "circuit_breakers": {guard.name: guard.stats() for guard in integration_guards},
+        "abuse_shield": {"ip": ip_limiter.stats(), "email": email_limiter.stats()},
+        "idempotency": idempotency.stats(),
+        "cal_slot_reservations": await cal_slot_allocator.stats(),
+        "hubspot_rate_limit": await hubspot_governor.stats(),
+        "outbox": await outbox.stats(),
+        "tracing": tracer.stats(),
+        "startup": startup_report.stats()
+    }
+
+
+executor_active = metrics.gauge("executor_active_threads", "Threads busy running blocking SDK calls", ("executor",))
+executor_queued = metrics.gauge("executor_queued_calls", "Calls waiting for a free executor thread", ("executor",))
+batcher_pending = metrics.gauge("batcher_pending_items", "Items waiting for the next batch flush", ("batcher",))
+batcher_in_flight = metrics.gauge("batcher_in_flight_batches", "Batches currently being sent", ("batcher",))
+cache_entries = metrics.gauge("cache_entries", "Entries held by in-process caches", ("cache",))
+# Monotonic counts kept by the components themselves, copied into counters at scrape time
+cache_hits = metrics.counter("cache_hits_total", "Cache hits since startup", ("cache",))
+cache_misses = metrics.counter("cache_misses_total", "Cache misses since startup", ("cache",))
+warm_pool_available = metrics.gauge("warm_pool_available", "Pre-created resources ready to hand out", ("pool",))
+outbox_entries = metrics.gauge("outbox_entries", "Outbox entries by status", ("status",))
+breaker_state = metrics.gauge("circuit_breaker_open", "1 while an integration's circuit breaker is open or half-open", ("integration",))
+breaker_rejections = metrics.counter("circuit_breaker_rejections_total", "Calls rejected by an open breaker since startup", ("integration",))
+integration_timeout = metrics.gauge("integration_timeout_seconds", "Current adaptive deadline per integration", ("integration",))
+rate_limit_remaining = metrics.gauge("rate_limit_remaining", "API budget left in the current window / day", ("integration", "scope"))
+startup_seconds = metrics.gauge("startup_duration_seconds", "Seconds from process import to this phase", ("phase",))
+rate_limit_waiting = metrics.gauge("rate_limit_waiting_calls", "Calls queued for rate-limit budget", ("integration",))
+
+
+async def collect_pool_metrics():
+    executor = hubspot_executor.stats()
+    executor_active.labels(executor=executor["name"]).set(executor["active"])
+    executor_queued.labels(executor=executor["name"]).set(executor["queued"] + executor["waiting"])
+    
+    for batcher in (contact_batcher, note_batcher, deal_batcher):
+        stats = batcher.stats()
+        batcher_pending.labels(batcher=stats["name"]).set(stats["pending"])
+        batcher_in_flight.labels(batcher=stats["name"]).set(stats["in_flight"])
+    
+    caches = {"hubspot_ids": hubspot_ids.stats(), "cal_event_types": cal_event_types.stats(), "cal_slots": cal_slots.stats()}
+    for name, stats in caches.items():
+        cache_entries.labels(cache=name).set(stats["size"])
+        cache_hits.labels(cache=name).set(stats["hits"])
+        cache_misses.labels(cache=name).set(stats["misses"])
+    
+    pool = retell_warm_pool.stats()
+    warm_pool_available.labels(pool=pool["name"]).set(sum(pool["pooled"].values()))
+    
+    for guard in integration_guards:
+        stats = guard.stats()
+        breaker_state.labels(integration=guard.name).set(0 if stats["state"] == "closed" else 1)
+        breaker_rejections.labels(integration=guard.name).set(stats["rejected"])
+        integration_timeout.labels(integration=guard.name).set(stats["timeout"])
+    
+    rate = await hubspot_governor.stats()
+    rate_limit_remaining.labels(integration="hubspot", scope="window").set(rate["window_remaining"])
+    rate_limit_remaining.labels(integration="hubspot", scope="day").set(rate["daily_remaining"])
+    rate_limit_waiting.labels(integration="hubspot").set(rate["waiting"])
+    
+    outbox_stats = await outbox.stats()
+    for status in ("pending", "processing", "done", "dead"):
+        outbox_entries.labels(status=status).set(outbox_stats[status])
+
+
+metrics.add_collector(collect_pool_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(await metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency,
+    paths=("/api/contact", "/api/newsletter", "/api/demo-request", "/api/trial-signup"),
+    requests=idempotency_requests,
+)
+# Inside CORS so browsers can read the 429s. The site is served through one ingress hop, which appends
+# the visitor's IP to X-Forwarded-For; an address still inside ABUSE_TRUSTED_PROXIES gets no per-IP limit
+app.add_middleware(
+    AbuseShieldMiddleware,
+    paths=("/api/contact", "/api/newsletter", "/api/demo-request", "/api/trial-signup", "/api/retell/web-call"),
+    ip_limiter=ip_limiter,
+    email_limiter=email_limiter,
+    rejections=abuse_rejections,
+    max_body_bytes=int(os.environ.get('ABUSE_MAX_BODY_BYTES', '16384')),
+    proxy_hops=int(os.environ.get('ABUSE_PROXY_HOPS', '1')),
+    trusted_proxies=os.environ.get('ABUSE_TRUSTED_PROXIES', '10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,fc00::/7').split(','),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -544,6 +1870,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware, tracer=tracer)
+app.add_middleware(RequestMetricsMiddleware, duration=request_duration, in_flight=requests_in_flight)
 
 # Configure logging
 logging.basicConfig(
@@ -553,6 +1881,58 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
+def create_vendor_clients():
+    """Import and construct the SDK clients for the integrations that are configured"""
+    global hubspot_client, retell
+    # Clients already set (e.g. injected by tests) are kept
+    if hubspot_client is None and hubspot_api_key:
+        with startup_report.step("hubspot_sdk"):
+            from hubspot import HubSpot
+            hubspot_sdk()
+            hubspot_client = HubSpot(access_token=hubspot_api_key, host=hubspot_api_base)
+    if retell is None and retell_api_key:
+        with startup_report.step("retell_sdk"):
+            from retell import AsyncRetell
+            retell = AsyncRetell(api_key=retell_api_key, timeout=retell_timeout, max_retries=1)
+
+
+async def start_services():
+    create_vendor_clients()
+    with startup_report.step("http_clients"):
+        await http_clients.start()
+    await tracer.start()
+    with startup_report.step("indexes"):
+        await ensure_indexes()
+        await hubspot_ids.ensure_indexes()
+        await hubspot_governor.ensure_indexes()
+        await idempotency.ensure_indexes()
+        await cal_slot_allocator.ensure_indexes()
+        await register_live_rollups(datetime.utcnow())
+    with startup_report.step("outbox"):
+        await outbox.start(workers=outbox_workers, batch_size=outbox_claim_batch)
+    background_tasks.append(asyncio.create_task(start_lead_rollups()))
+    if analytics_mode == "counters":
+        background_tasks.append(asyncio.create_task(run_analytics_repair()))
+    if cal_api_key:
+        background_tasks.append(asyncio.create_task(refresh_cal_slots()))
+    if retell:
+        retell_warm_pool.start([retell_agent_id])
+    startup_report.ready()
+    startup_seconds.labels(phase="import").set(startup_report.import_seconds)
+    startup_seconds.labels(phase="ready").set(startup_report.ready_seconds)
+
+
+async def stop_services():
+    for task in background_tasks + list(inline_side_effects):
+        task.cancel()
+    await outbox.stop()
+    await retell_warm_pool.stop()
+    if retell:
+        await retell.close()
+    await tracer.stop()
+    await http_clients.close()
     client.close()
+    hubspot_executor.shutdown()
+
+
+startup_report.imported()
@@ -0,0 +1,126 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+HELD = "held"
+BOOKED = "booked"
+TAKEN = "taken"
+
+
+def slot_start(slot: str) -> Optional[datetime]:
+    """A Cal.com slot time such as ``2024-05-01T09:00:00.000Z`` as a naive UTC datetime"""
+    try:
+        parsed = datetime.fromisoformat(slot.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return parsed.replace(tzinfo=None) - (parsed.utcoffset() or timedelta(0))
+
+
+class SlotAllocator:
+    """Hands out distinct booking slots across workers through MongoDB reservations.
+
+    A reservation is a document keyed by calendar and slot time, so the
+    unique ``_id`` makes claiming a slot a single atomic insert. A ``held``
+    reservation is a lease of ``lease_seconds`` while the booking request is
+    in flight. It becomes ``booked`` on success or ``taken`` when the vendor
+    says someone else has the slot; both last until the slot has passed. A
+    reservation released after a failed booking frees the slot immediately,
+    and an expired lease (its holder died) can be claimed again.
+    """
+
+    def __init__(self, collection, lease_seconds: float = 60.0):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.reserved = 0
+        self.contended = 0
+        self.released = 0
+        self.taken = 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    @staticmethod
+    def _id(calendar: str, slot: str) -> str:
+        return f"{calendar}|{slot}"
+
+    def _until_slot_passes(self, slot: str) -> datetime:
+        start = slot_start(slot)
+        return start + timedelta(hours=1) if start else datetime.utcnow() + timedelta(days=7)
+
+    async def reserve(self, calendar: str, slots: List[str]) -> Optional[tuple]:
+        """Reserve the earliest of ``slots`` nobody else holds; ``(slot, holder)`` or ``None``"""
+        now = datetime.utcnow()
+        ids = {self._id(calendar, slot): slot for slot in slots}
+        # One read skips everything already held or booked instead of an insert per slot
+        active = {
+            doc["_id"]: doc["expires_at"]
+            async for doc in self.collection.find({"_id": {"$in": list(ids)}}, {"expires_at": 1})
+        }
+        holder = str(uuid.uuid4())
+        lease = {"calendar": calendar, "holder": holder, "status": HELD,
+                 "expires_at": now + timedelta(seconds=self.lease_seconds), "reserved_at": now}
+
+        for reservation_id, slot in ids.items():
+            if reservation_id in active and active[reservation_id] > now:
+                continue
+            try:
+                if reservation_id in active:
+                    # Expired but not yet removed by the TTL monitor: take it over if still expired
+                    result = await self.collection.update_one(
+                        {"_id": reservation_id, "expires_at": {"$lte": now}}, {"$set": {"slot": slot, **lease}}
+                    )
+                    if not result.modified_count:
+                        self.contended += 1
+                        continue
+                else:
+                    await self.collection.insert_one({"_id": reservation_id, "slot": slot, **lease})
+            except DuplicateKeyError:
+                # Another worker reserved it since the read
+                self.contended += 1
+                continue
+            self.reserved += 1
+            return slot, holder
+        return None
+
+    async def confirm(self, calendar: str, slot: str, holder: str, booking_uid: Optional[str] = None):
+        await self.collection.update_one(
+            {"_id": self._id(calendar, slot), "holder": holder},
+            {"$set": {"status": BOOKED, "booking_uid": booking_uid, "expires_at": self._until_slot_passes(slot)}}
+        )
+
+    async def mark_taken(self, calendar: str, slot: str, holder: str):
+        """The vendor rejected the slot as unavailable; keep everyone off it"""
+        self.taken += 1
+        await self.collection.update_one(
+            {"_id": self._id(calendar, slot), "holder": holder},
+            {"$set": {"status": TAKEN, "expires_at": self._until_slot_passes(slot)}}
+        )
+
+    async def release(self, calendar: str, slot: str, holder: str):
+        """Give a slot back after a booking failed for reasons unrelated to the slot"""
+        self.released += 1
+        try:
+            await self.collection.delete_one({"_id": self._id(calendar, slot), "holder": holder, "status": HELD})
+        except Exception as e:
+            # The lease runs out on its own
+            logging.warning(f"Failed to release slot reservation {slot}: {e}")
+
+    async def stats(self) -> dict:
+        counts = {HELD: 0, BOOKED: 0, TAKEN: 0}
+        now = datetime.utcnow()
+        async for row in self.collection.aggregate([
+            {"$match": {"expires_at": {"$gt": now}}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]):
+            counts[row["_id"]] = row["count"]
+        return {
+            **counts,
+            "lease_seconds": self.lease_seconds,
+            "reserved": self.reserved,
+            "contended": self.contended,
+            "released": self.released,
+            "rejected_by_vendor": self.taken,
+        }
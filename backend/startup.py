@@ -0,0 +1,42 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StartupReport:
+    """How long a worker took to import and to get through each startup step.
+
+    ``started`` is a ``time.perf_counter()`` reading taken as early as
+    possible in the importing module. Steps are timed with ``step(name)``;
+    ``ready()`` logs a one-line summary once the app can serve requests.
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.import_seconds: Optional[float] = None
+        self.ready_seconds: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+
+    def imported(self):
+        self.import_seconds = time.perf_counter() - self.started
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - started
+
+    def ready(self):
+        self.ready_seconds = time.perf_counter() - self.started
+        steps = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.steps.items())
+        logging.info(f"Startup took {self.ready_seconds:.2f}s (import {self.import_seconds:.2f}s; {steps})")
+
+    def stats(self) -> dict:
+        return {
+            "import_seconds": round(self.import_seconds, 4) if self.import_seconds is not None else None,
+            "ready_seconds": round(self.ready_seconds, 4) if self.ready_seconds is not None else None,
+            "steps": {name: round(seconds, 4) for name, seconds in self.steps.items()},
+        }
@@ -0,0 +1,349 @@
+import asyncio
+import json
+import logging
+import logging.handlers
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import httpx
+from pymongo import monitoring
+
+from metrics import route_template
+
+# OTLP span kinds
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def parse_traceparent(value: Optional[str]):
+    """``(trace_id, parent_span_id, sampled)`` from a W3C traceparent header, or ``None``"""
+    try:
+        version, trace_id, span_id, flags = value.strip().split("-")
+        if len(trace_id) != 32 or len(span_id) != 16 or int(trace_id, 16) == 0:
+            return None
+        return trace_id, span_id, bool(int(flags, 16) & 1)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Span:
+    """One timed operation in a trace. Non-recording spans only carry IDs"""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "recording",
+                 "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], recording: bool):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.recording = recording
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes: Dict[str, Any] = {}
+        self.error = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.recording else '00'}"
+
+    def set_attribute(self, key: str, value: Any):
+        if self.recording and value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_error(self, error: Union[BaseException, str]):
+        if self.recording:
+            self.error = str(error) or error.__class__.__name__
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+class JsonFileExporter:
+    """Appends finished spans as JSON lines to a size-rotated file"""
+
+    name = "file"
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5):
+        self.path = path
+        self._handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def _write(self, spans: List[Span]):
+        for span in spans:
+            self._handler.emit(logging.makeLogRecord({"msg": json.dumps(span.to_dict(), default=str)}))
+
+    async def export(self, spans: List[Span]):
+        await asyncio.to_thread(self._write, spans)
+
+    async def close(self):
+        self._handler.close()
+
+
+class OtlpHttpExporter:
+    """Sends spans to an OpenTelemetry collector with OTLP/HTTP JSON encoding"""
+
+    name = "otlp"
+
+    def __init__(self, endpoint: str, client: Callable[[], httpx.AsyncClient], service_name: str):
+        self.endpoint = endpoint.rstrip("/") + "/v1/traces"
+        self.client = client
+        self.service_name = service_name
+
+    @staticmethod
+    def _value(value: Any) -> dict:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(self, span: Span) -> dict:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": SPAN_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": self._value(value)} for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    async def export(self, spans: List[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "gretta"}, "spans": [self._span(span) for span in spans]}],
+            }]
+        }
+        response = await self.client().post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+    async def close(self):
+        pass
+
+
+class Tracer:
+    """Minimal span tracer: a span per request plus child spans per downstream call.
+
+    The active span lives in a context variable, so child spans nest under
+    whatever request or outbox entry is running, including pymongo callbacks
+    that motor runs on its thread pool. Finished spans are buffered and
+    exported in batches by a background task; when the buffer is full new
+    spans are dropped. Sampling is decided once per trace. Without an
+    exporter every span is non-recording and costs little more than an ID.
+    """
+
+    def __init__(self, service_name: str, exporter=None, sample_rate: float = 1.0, max_queue: int = 10000,
+                 batch_size: int = 512, flush_interval: float = 2.0):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._finished = deque()
+        self._flusher = None
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def current_traceparent(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.traceparent if span is not None else None
+
+    def start_span(self, name: str, kind: str = "internal", parent: Union[Span, str, None] = None,
+                   attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span under ``parent`` (a span or traceparent header), else under the current span"""
+        if parent is None:
+            parent = _current_span.get()
+        if isinstance(parent, str):
+            parent = parse_traceparent(parent)
+            trace_id, parent_id, sampled = parent if parent else (None, None, None)
+        elif parent is not None:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.recording
+        else:
+            trace_id = parent_id = sampled = None
+
+        if trace_id is None:
+            trace_id = _new_id(16)
+            sampled = random.random() < self.sample_rate
+        span = Span(name, kind, trace_id, parent_id, recording=self.enabled and sampled)
+        if attributes:
+            span.set_attributes(attributes)
+        return span
+
+    def end_span(self, span: Span):
+        if not span.recording or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if len(self._finished) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._finished.append(span)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", parent: Union[Span, str, None] = None, **attributes):
+        span = self.start_span(name, kind, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    async def flush(self):
+        while self._finished:
+            batch = []
+            while self._finished and len(batch) < self.batch_size:
+                batch.append(self._finished.popleft())
+            try:
+                await self.exporter.export(batch)
+                self.exported += len(batch)
+            except Exception as e:
+                self.export_errors += 1
+                self.dropped += len(batch)
+                logging.warning(f"Failed to export {len(batch)} spans via {self.exporter.name}: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self.enabled:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self.enabled:
+            await self.flush()
+            await self.exporter.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "exporter": self.exporter.name if self.exporter else None,
+            "sample_rate": self.sample_rate,
+            "queued": len(self._finished),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request.
+
+    An incoming W3C ``traceparent`` header continues the caller's trace.
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            return await self.app(scope, receive, send)
+
+        route = route_template(scope)
+        traceparent = dict(scope.get("headers") or []).get(b"traceparent")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.record_error(f"HTTP {message['status']}")
+            await send(message)
+
+        with self.tracer.span(
+            f"{scope['method']} {route}",
+            kind="server",
+            parent=traceparent.decode("latin-1") if traceparent else None,
+            **{"http.method": scope["method"], "http.route": route, "http.target": scope["path"]},
+        ) as span:
+            await self.app(scope, receive, send_wrapper)
+
+
+class MongoCommandTracing(monitoring.CommandListener):
+    """pymongo command listener adding a client span per command under the current span"""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._spans: Dict[tuple, Span] = {}
+
+    def started(self, event):
+        parent = _current_span.get()
+        if parent is None or not parent.recording:
+            return
+        target = event.command.get(event.command_name)
+        self._spans[(event.connection_id, event.request_id)] = self.tracer.start_span(
+            f"mongo.{event.command_name}",
+            kind="client",
+            parent=parent,
+            attributes={
+                "db.system": "mongodb",
+                "db.name": event.database_name,
+                "db.operation": event.command_name,
+                "db.mongodb.collection": target if isinstance(target, str) else event.command.get("collection"),
+            },
+        )
+
+    def succeeded(self, event):
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            self.tracer.end_span(span)
+
+    def failed(self, event):
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.record_error(event.failure.get("errmsg") if isinstance(event.failure, dict) else event.failure)
+            self.tracer.end_span(span)
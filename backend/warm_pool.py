@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable
+
+
+class WarmPool:
+    """Keep a few pre-created resources per key so callers skip the creation round trip.
+
+    ``get(key)`` hands out a pooled value if one is still within ``ttl`` and
+    schedules a background refill; on a miss it creates one inline. A
+    maintenance task replaces expired values, so every pooled value costs one
+    ``create`` call per ``ttl`` even when nobody takes it; size the pool with
+    that in mind. ``size=0`` disables pooling entirely.
+    """
+
+    def __init__(self, name: str, create: Callable[[Hashable], Awaitable[Any]], size: int = 0, ttl: float = 20.0):
+        self.name = name
+        self.create = create
+        self.size = size
+        self.ttl = ttl
+        self._pools: Dict[Hashable, deque] = {}
+        self._refilling: Dict[Hashable, asyncio.Task] = {}
+        self._maintainer = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _take(self, key: Hashable):
+        pool = self._pools.get(key)
+        now = time.monotonic()
+        while pool:
+            expires_at, value = pool.popleft()
+            if expires_at > now:
+                return value
+            self.expired += 1
+        return None
+
+    def _prune(self, key: Hashable):
+        pool = self._pools.setdefault(key, deque())
+        now = time.monotonic()
+        while pool and pool[0][0] <= now:
+            pool.popleft()
+            self.expired += 1
+        return pool
+
+    async def _refill(self, key: Hashable):
+        try:
+            while len(self._prune(key)) < self.size:
+                value = await self.create(key)
+                self._pools[key].append((time.monotonic() + self.ttl, value))
+        except Exception as e:
+            logging.warning(f"{self.name} warm pool refill failed for {key}: {e}")
+        finally:
+            self._refilling.pop(key, None)
+
+    def _schedule_refill(self, key: Hashable):
+        if self.size > 0 and key not in self._refilling:
+            self._refilling[key] = asyncio.create_task(self._refill(key))
+
+    async def get(self, key: Hashable) -> Any:
+        value = self._take(key) if self.size > 0 else None
+        self._schedule_refill(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return await self.create(key)
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(max(self.ttl / 2, 1.0))
+            for key in list(self._pools):
+                self._schedule_refill(key)
+
+    def start(self, keys: Iterable[Hashable]):
+        if self.size <= 0:
+            return
+        for key in keys:
+            self._schedule_refill(key)
+        self._maintainer = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        tasks = list(self._refilling.values())
+        if self._maintainer is not None:
+            tasks.append(self._maintainer)
+            self._maintainer = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pools.clear()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "ttl": self.ttl,
+            "pooled": {str(key): len(pool) for key, pool in self._pools.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+        }
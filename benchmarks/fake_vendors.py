@@ -0,0 +1,182 @@
+"""
+Local stand-ins for the HubSpot, Cal.com and Retell APIs used by the benchmarks.
+
+Each fake is a threaded HTTP server on 127.0.0.1 that answers the endpoints
+server.py calls with realistic payloads, after an injected latency, and fails
+a configurable fraction of requests.
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class FakeVendor:
+    """Base class: serves ``handle(method, path, body)`` with latency and error injection"""
+
+    name = "vendor"
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 10.0, error_rate: float = 0.0, error_status: int = 500):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = {}
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._server = None
+
+    def next_id(self) -> str:
+        with self._lock:
+            return str(next(self._ids))
+
+    def handle(self, method: str, path: str, body):
+        raise NotImplementedError
+
+    def _make_handler(self):
+        vendor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                path = urlparse(self.path).path
+                with vendor._lock:
+                    vendor.requests[f"{method} {path}"] = vendor.requests.get(f"{method} {path}", 0) + 1
+
+                delay = max(vendor.latency_ms + random.uniform(-vendor.jitter_ms, vendor.jitter_ms), 0) / 1000
+                time.sleep(delay)
+
+                if random.random() < vendor.error_rate:
+                    status, payload = vendor.error_status, {"status": "error", "message": "injected failure"}
+                else:
+                    status, payload = vendor.handle(method, path, json.loads(raw) if raw else None)
+
+                out = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def do_PATCH(self):
+                self._serve("PATCH")
+
+        return Handler
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class FakeHubSpot(FakeVendor):
+    name = "hubspot"
+
+    @staticmethod
+    def _object(object_id: str, item: dict, new: bool = None) -> dict:
+        now = datetime.utcnow().isoformat() + "Z"
+        result = {
+            "id": object_id,
+            "properties": item.get("properties", {}),
+            "createdAt": now,
+            "updatedAt": now,
+            "archived": False,
+        }
+        if item.get("objectWriteTraceId"):
+            result["objectWriteTraceId"] = item["objectWriteTraceId"]
+        if new is not None:
+            result["new"] = new
+        return result
+
+    def handle(self, method, path, body):
+        now = datetime.utcnow().isoformat() + "Z"
+        envelope = {"status": "COMPLETE", "startedAt": now, "completedAt": now}
+
+        if path.endswith("/batch/upsert"):
+            results = [self._object(self.next_id(), item, new=True) for item in body.get("inputs", [])]
+            return 200, {**envelope, "results": results}
+        if path.endswith("/batch/create"):
+            results = [self._object(self.next_id(), item) for item in body.get("inputs", [])]
+            return 201, {**envelope, "results": results}
+        if method == "GET" and path.startswith("/crm/v3/objects/contacts/"):
+            return 200, self._object(self.next_id(), {})
+        if method == "POST" and path.startswith("/crm/v3/objects/"):
+            return 201, self._object(self.next_id(), body or {})
+        return 404, {"status": "error", "category": "OBJECT_NOT_FOUND", "message": f"No fake for {method} {path}"}
+
+
+class FakeCal(FakeVendor):
+    name = "cal"
+    event_type_id = 42
+
+    def handle(self, method, path, body):
+        if path.endswith("/slots"):
+            start = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            slots = {}
+            for day in range(6):
+                date = start + timedelta(days=day)
+                slots[date.strftime("%Y-%m-%d")] = [
+                    {"time": (date + timedelta(minutes=30 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")} for i in range(16)
+                ]
+            return 200, {"slots": slots}
+        if path.endswith("/event-types"):
+            return 200, {"event_types": [{"id": self.event_type_id, "slug": "30min"}, {"id": 43, "slug": "60min"}]}
+        if path.endswith("/bookings") and method == "POST":
+            return 200, {"id": int(self.next_id()), "uid": f"booking-{self.next_id()}", "startTime": body.get("start"), "status": "ACCEPTED"}
+        return 404, {"message": f"No fake for {method} {path}"}
+
+
+class FakeRetell(FakeVendor):
+    name = "retell"
+
+    def handle(self, method, path, body):
+        if path == "/v2/create-web-call":
+            call_id = f"call_{self.next_id()}"
+            return 201, {
+                "call_type": "web_call",
+                "access_token": f"token_{call_id}",
+                "call_id": call_id,
+                "agent_id": body.get("agent_id"),
+                "agent_version": 1,
+                "call_status": "registered",
+            }
+        return 404, {"message": f"No fake for {method} {path}"}
+
+
+def start_fake_vendors(latency_ms: float = 50.0, jitter_ms: float = 10.0, error_rate: float = 0.0) -> dict:
+    """Start all three fakes and return them with the env vars that point server.py at them"""
+    vendors = {cls.name: cls(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate) for cls in (FakeHubSpot, FakeCal, FakeRetell)}
+    urls = {name: vendor.start() for name, vendor in vendors.items()}
+    env = {
+        "HUBSPOT_API_KEY": "fake-hubspot-token",
+        "HUBSPOT_API_BASE": urls["hubspot"],
+        "CAL_API_KEY": "fake-cal-key",
+        "CAL_API_V1_URL": f"{urls['cal']}/v1",
+        "RETELL_API_KEY": "fake-retell-key",
+        "RETELL_BASE_URL": urls["retell"],
+    }
+    return {"vendors": vendors, "env": env}
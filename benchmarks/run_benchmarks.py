@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Load test / latency benchmark for the Gretta AI API.
+
+Runs server.app in-process against local fake HubSpot, Cal.com and Retell
+servers (see fake_vendors.py) and a throwaway MongoDB database, drives every
+/api/* route at the requested concurrency, and reports throughput and
+p50/p95/p99 latency per route. Results are written as JSON so runs can be
+compared across commits.
+
+Examples:
+    python benchmarks/run_benchmarks.py --in-memory --requests 500 --concurrency 50
+    python benchmarks/run_benchmarks.py --mongo-url mongodb://localhost:27017 --vendor-latency-ms 200 \\
+        --vendor-error-rate 0.05 --output bench.json --compare baseline.json
+    python benchmarks/run_benchmarks.py --base-url http://localhost:8001 --routes contact,newsletter
+
+--in-memory needs the mongomock-motor package; otherwise a real MongoDB is used
+and the benchmark database is dropped afterwards.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_vendors import start_fake_vendors  # noqa: E402
+
+_counter = itertools.count()
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}-{next(_counter)}-{uuid.uuid4().hex[:8]}@bench.example.com"
+
+
+# Route name -> (method, path, payload factory or None)
+ROUTES = {
+    "health": ("GET", "/api/", None),
+    "contact": ("POST", "/api/contact", lambda: {
+        "name": "Bench Contact",
+        "email": unique_email("contact"),
+        "message": "Benchmark contact message",
+        "company": "Bench Co",
+    }),
+    "newsletter": ("POST", "/api/newsletter", lambda: {"email": unique_email("newsletter")}),
+    "demo_request": ("POST", "/api/demo-request", lambda: {
+        "name": "Bench Demo",
+        "email": unique_email("demo"),
+        "phone": "+61 400 000 000",
+        "company": "Bench Co",
+        "plan_type": "Inbound + SMS",
+    }),
+    "trial_signup": ("POST", "/api/trial-signup", lambda: {
+        "name": "Bench Trial",
+        "email": unique_email("trial"),
+        "phone": "+61 400 000 000",
+        "company": "Bench Co",
+        "plan_type": "Starter",
+    }),
+    "bulk_leads": ("POST", "/api/leads/bulk?type=contact", lambda: [
+        {"name": "Bench Bulk", "email": unique_email("bulk"), "message": "Imported"} for _ in range(20)
+    ]),
+    "webhook_bookings": ("GET", "/api/webhook/bookings", None),
+    "analytics": ("GET", "/api/analytics", None),
+    "analytics_timeseries": ("GET", "/api/analytics/timeseries?granularity=hour", None),
+    "export_contacts": ("GET", "/api/export/contacts?format=csv", None),
+    "retell_web_call": ("POST", "/api/retell/web-call", None),
+}
+
+
+def admin_headers() -> dict:
+    """The bulk import and export routes need the deployment's ADMIN_API_KEY"""
+    return {"X-API-Key": os.environ["ADMIN_API_KEY"]} if os.environ.get("ADMIN_API_KEY") else {}
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count, 2) if count else 0.0,
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+    }
+
+
+async def drive(client: httpx.AsyncClient, routes: list, total_requests: int, concurrency: int) -> dict:
+    """Issue ``total_requests`` per route, round-robin, from ``concurrency`` workers"""
+    queue = asyncio.Queue()
+    for _ in range(total_requests):
+        for name in routes:
+            queue.put_nowait(name)
+
+    latencies = {name: [] for name in routes}
+    errors = {name: 0 for name in routes}
+    all_latencies = []
+
+    async def worker():
+        while True:
+            try:
+                name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            method, path, payload = ROUTES[name]
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload() if payload else None)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            latencies[name].append(elapsed_ms)
+            all_latencies.append(elapsed_ms)
+            if failed:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "routes": {name: summarize(latencies[name], errors[name], elapsed) for name in routes},
+    }
+
+
+async def wait_for_outbox(server, timeout: float) -> Optional[float]:
+    """Seconds until every queued side effect has been processed, or ``None`` if ``timeout`` ran out first"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        stats = await server.outbox.stats()
+        if stats.get("pending", 0) + stats.get("processing", 0) == 0:
+            return round(time.perf_counter() - started, 3)
+        await asyncio.sleep(0.1)
+    return None
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'route':<22}{'count':>7}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    if baseline:
+        header += f"{'Δp50':>9}{'Δp95':>9}{'Δp99':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(results["routes"].items()) + [("ALL", results["overall"])]
+    for name, stats in rows:
+        line = (f"{name:<22}{stats['count']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9.1f}"
+                f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+        if baseline:
+            before = baseline["overall"] if name == "ALL" else baseline.get("routes", {}).get(name)
+            if before:
+                line += "".join(f"{stats[key] - before[key]:>+9.1f}" for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(line)
+    if "outbox_drain_s" in results:
+        if results["outbox_drain_s"] is None:
+            print(f"\noutbox not drained (timeout after {results['meta']['config']['drain_timeout_s']}s)")
+        else:
+            print(f"\noutbox drained {results['outbox_drain_s']}s after the load finished")
+
+
+async def run(args) -> dict:
+    routes = [name.strip() for name in args.routes.split(",")] if args.routes else list(ROUTES)
+    unknown = [name for name in routes if name not in ROUTES]
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(unknown)} (choose from {', '.join(ROUTES)})")
+
+    config = {
+        "requests_per_route": args.requests,
+        "concurrency": args.concurrency,
+        "routes": routes,
+        "vendor_latency_ms": args.vendor_latency_ms,
+        "vendor_jitter_ms": args.vendor_jitter_ms,
+        "vendor_error_rate": args.vendor_error_rate,
+        "mongo": "live server" if args.base_url else ("in-memory" if args.in_memory else args.mongo_url),
+        "drain_timeout_s": args.drain_timeout,
+    }
+    results = {"meta": {"timestamp": datetime.utcnow().isoformat() + "Z", "git_commit": git_commit(), "config": config}}
+
+    if args.base_url:
+        # The target deployment must already be configured with its own vendors / database
+        async with httpx.AsyncClient(base_url=args.base_url, headers=admin_headers(), timeout=60.0) as client:
+            results.update(await drive(client, routes, args.requests, args.concurrency))
+        return results
+
+    fakes = start_fake_vendors(args.vendor_latency_ms, args.vendor_jitter_ms, args.vendor_error_rate)
+    os.environ.update(fakes["env"])
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = f"gretta_bench_{uuid.uuid4().hex[:8]}"
+    os.environ.setdefault("OUTBOX_BASE_DELAY", "0.2")
+    # The load generator is a single client; don't let the flood shield throttle it
+    os.environ.setdefault("ABUSE_IP_LIMIT", "0")
+    os.environ.setdefault("ABUSE_EMAIL_LIMIT", "0")
+    os.environ.setdefault("ADMIN_API_KEY", "bench-admin-key")
+
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("--in-memory needs mongomock-motor (pip install mongomock-motor)")
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+
+    import server
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    try:
+        async with server.app.router.lifespan_context(server.app):
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=admin_headers(),
+                                         timeout=60.0) as client:
+                results.update(await drive(client, routes, args.requests, args.concurrency))
+            results["outbox_drain_s"] = await wait_for_outbox(server, args.drain_timeout)
+            results["vendor_requests"] = {name: dict(vendor.requests) for name, vendor in fakes["vendors"].items()}
+            if not args.in_memory:
+                await server.client.drop_database(os.environ["DB_NAME"])
+    finally:
+        for vendor in fakes["vendors"].values():
+            vendor.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Gretta AI API against local vendor stand-ins")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--routes", help=f"comma-separated subset of: {', '.join(ROUTES)}")
+    parser.add_argument("--vendor-latency-ms", type=float, default=50.0)
+    parser.add_argument("--vendor-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--vendor-error-rate", type=float, default=0.0)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of a MongoDB server")
+    parser.add_argument("--base-url", help="benchmark an already running deployment instead of the in-process app")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="max seconds to wait for the outbox to drain")
+    parser.add_argument("--verbose", action="store_true", help="keep the server's INFO logging")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(results, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the request / response serialization path.
+
+For every lead model in backend/models.py this times building the stored
+model and its MongoDB document from an already validated create payload, the
+old way (``Model(**create.dict())`` then ``.dict()``) against
+``serialization.build_lead``. For the other models and for each route's
+response it times encoding to bytes with FastAPI's ``serialize_response`` /
+``jsonable_encoder`` plus ``JSONResponse`` against the orjson path the app
+now uses. No server, database or network is involved.
+
+Examples:
+    python benchmarks/serialization_benchmarks.py
+    python benchmarks/serialization_benchmarks.py --number 50000 --output serialization.json
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from models import (  # noqa: E402
+    Analytics, BulkIngestReport, BulkLeadResult, Contact, ContactCreate, DemoRequest, DemoRequestCreate,
+    LeadTimeseries, NewsletterCreate, NewsletterSubscriber, TimeseriesPoint, TrialSignup, TrialSignupCreate,
+)
+from serialization import build_lead  # noqa: E402
+
+# Lead model -> (create model, sample payload, extra document fields)
+LEAD_MODELS = {
+    "Contact": (Contact, ContactCreate, {
+        "name": "Bench Contact", "email": "contact@bench.example.com", "phone": "+61 400 000 000",
+        "message": "Benchmark contact message", "company": "Bench Co",
+    }, {"hubspot_synced": False}),
+    "NewsletterSubscriber": (NewsletterSubscriber, NewsletterCreate, {"email": "news@bench.example.com"}, {}),
+    "DemoRequest": (DemoRequest, DemoRequestCreate, {
+        "name": "Bench Demo", "email": "demo@bench.example.com", "phone": "+61 400 000 000",
+        "company": "Bench Co", "plan_type": "Inbound + SMS", "preferred_time": "morning",
+    }, {"hubspot_synced": False, "cal_booking_created": False}),
+    "TrialSignup": (TrialSignup, TrialSignupCreate, {
+        "name": "Bench Trial", "email": "trial@bench.example.com", "phone": "+61 400 000 000",
+        "company": "Bench Co", "plan_type": "Starter",
+    }, {"hubspot_synced": False}),
+}
+
+
+def sample_models() -> dict:
+    now = datetime.utcnow()
+    return {
+        "Analytics": (Analytics, Analytics(
+            total_contacts=1200, total_demo_requests=340, total_trial_signups=210, total_newsletter_subscribers=5400,
+        )),
+        "LeadTimeseries": (LeadTimeseries, LeadTimeseries(
+            granularity="hour", start=now - timedelta(days=7), end=now,
+            points=[TimeseriesPoint(bucket=now - timedelta(hours=i), form="demo", plan_type="Starter", count=i)
+                    for i in range(168)],
+        )),
+        "BulkIngestReport": (BulkIngestReport, BulkIngestReport(
+            total=500, created=490, duplicates=5, invalid=5, failed=0,
+            results=[BulkLeadResult(row=i, status="created", id=str(uuid.uuid4())) for i in range(500)],
+        )),
+    }
+
+
+def route_payloads() -> dict:
+    """Route -> (response_model the route declares, a typical response body)"""
+    now = datetime.utcnow()
+    booking = {
+        "id": str(uuid.uuid4()), "name": "Bench Demo", "email": "demo@bench.example.com",
+        "phone": "+61 400 000 000", "company": "Bench Co", "interested_in": "Inbound + SMS",
+        "preferred_time": None, "created_at": now,
+    }
+    queued = {"success": True, "message": "Contact request submitted successfully", "sync_status": "queued"}
+    return {
+        "contact": (dict, queued),
+        "newsletter": (dict, {"success": True, "message": "Successfully subscribed to newsletter"}),
+        "demo_request": (dict, {**queued, "data": {**booking, "timestamp": now.isoformat()}}),
+        "trial_signup": (dict, queued),
+        "webhook_bookings": (list, [{**booking, "id": str(uuid.uuid4())} for _ in range(100)]),
+    }
+
+
+async def fastapi_encode(field, content) -> bytes:
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def orjson_encode(field, content) -> bytes:
+    return ORJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def time_op(fn, number: int, repeat: int) -> float:
+    """Best-of-``repeat`` microseconds per call"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def time_async_op(fn, number: int, repeat: int) -> float:
+    def run():
+        coroutine = fn()
+        try:
+            coroutine.send(None)
+        except StopIteration:
+            pass
+    return time_op(run, number, repeat)
+
+
+def run(number: int, repeat: int) -> dict:
+    results = {}
+
+    for name, (model, create_model, payload, extra) in LEAD_MODELS.items():
+        create = create_model(**payload)
+        results[f"model:{name}:persist"] = (
+            time_op(lambda: {**model(**create.model_dump()).model_dump(), **extra}, number, repeat),
+            time_op(lambda: build_lead(model, create, **extra), number, repeat),
+        )
+        stored = model(**create.model_dump())
+        results[f"model:{name}:encode"] = (
+            time_op(lambda: JSONResponse(jsonable_encoder(stored)).body, number, repeat),
+            time_op(lambda: ORJSONResponse(stored.model_dump()).body, number, repeat),
+        )
+
+    for name, (model, instance) in sample_models().items():
+        results[f"model:{name}:encode"] = (
+            time_op(lambda: JSONResponse(jsonable_encoder(instance)).body, number, repeat),
+            time_op(lambda: ORJSONResponse(instance.model_dump()).body, number, repeat),
+        )
+        # Routes declaring a response_model still validate through it; only the encoder changed
+        field = create_response_field(name="response", type_=model)
+        results[f"route:{name}"] = (
+            time_async_op(lambda: fastapi_encode(field, instance), number, repeat),
+            time_async_op(lambda: orjson_encode(field, instance), number, repeat),
+        )
+
+    for name, (response_model, content) in route_payloads().items():
+        field = create_response_field(name="response", type_=response_model)
+        results[f"route:{name}"] = (
+            time_async_op(lambda: fastapi_encode(field, content), number, repeat),
+            time_op(lambda: ORJSONResponse(content).body, number, repeat),
+        )
+
+    return {
+        name: {"before_us": round(before, 2), "after_us": round(after, 2), "speedup": round(before / after, 2)}
+        for name, (before, after) in results.items()
+    }
+
+
+def print_report(results: dict):
+    header = f"{'benchmark':<36}{'before µs':>12}{'after µs':>12}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        print(f"{name:<36}{stats['before_us']:>12.2f}{stats['after_us']:>12.2f}{stats['speedup']:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per benchmark; the best is reported")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    print_report(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
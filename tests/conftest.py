@@ -0,0 +1,120 @@
+"""
+Shared fixtures: every test gets a freshly imported ``server`` module bound to
+its own in-memory MongoDB (mongomock-motor) and to in-process fake HubSpot,
+Cal.com and Retell clients, served through ``httpx.ASGITransport``.
+
+Nothing leaves the process, so tests are independent of each other and the
+suite can run in parallel with ``pytest -n auto`` (pytest-xdist).
+"""
+
+import asyncio
+import importlib
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import motor.motor_asyncio
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from retell import AsyncRetell
+
+from tests.fakes import FakeCal, FakeHubSpot, FakeRetell
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Empty keys keep backend/.env from configuring the real vendors; fakes are injected instead
+TEST_ENV = {
+    "MONGO_URL": "mongodb://localhost:27017",
+    "HUBSPOT_API_KEY": "",
+    "CAL_API_KEY": "",
+    "RETELL_API_KEY": "",
+    "OUTBOX_BASE_DELAY": "0.05",
+    "HUBSPOT_BATCH_WAIT_MS": "5",
+    "ANALYTICS_REPAIR_INTERVAL": "3600",
+    "CAL_SLOTS_REFRESH_INTERVAL": "3600",
+    # Every test client shares one IP; test_abuse.py turns the limits back on
+    "ABUSE_IP_LIMIT": "0",
+    "ABUSE_EMAIL_LIMIT": "0",
+    "ADMIN_API_KEY": "test-admin-key",
+}
+
+
+def demo_payload(email: str) -> dict:
+    """A valid ``/api/demo-request`` body for ``email``"""
+    return {"name": "Lisa Wang", "email": email, "phone": "+1-555-0654", "company": "HealthCare", "plan_type": "enterprise"}
+
+
+class Harness:
+    """The app under test plus handles on its fakes"""
+
+    def __init__(self, server, client: httpx.AsyncClient, hubspot: FakeHubSpot, cal: FakeCal, retell: FakeRetell):
+        self.server = server
+        self.client = client
+        self.hubspot = hubspot
+        self.cal = cal
+        self.retell = retell
+
+    @property
+    def db(self):
+        return self.server.db
+
+    async def drain_outbox(self, timeout: float = 5.0) -> dict:
+        """Wait until no outbox entry is pending or processing"""
+        deadline = time.monotonic() + timeout
+        while True:
+            stats = await self.server.outbox.stats()
+            if stats["pending"] + stats["processing"] == 0:
+                return stats
+            if time.monotonic() > deadline:
+                raise AssertionError(f"outbox did not drain within {timeout}s: {stats}")
+            await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def load_server(monkeypatch):
+    """Import a fresh copy of server.py with the given extra environment"""
+
+    def load(**env):
+        for key, value in {**TEST_ENV, "DB_NAME": f"gretta_test_{uuid.uuid4().hex[:8]}", **env}.items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.setattr(motor.motor_asyncio, "AsyncIOMotorClient", AsyncMongoMockClient)
+        # bootstrap holds the import clock; a fresh copy restarts it for this import
+        for module in ("bootstrap", "server"):
+            sys.modules.pop(module, None)
+        return importlib.import_module("server")
+
+    yield load
+    for module in ("bootstrap", "server"):
+        sys.modules.pop(module, None)
+
+
+@pytest.fixture
+async def api(load_server):
+    server = load_server()
+    hubspot, cal, retell = FakeHubSpot(), FakeCal(), FakeRetell()
+
+    # Retries become due within milliseconds; poll for them just as quickly
+    server.outbox.poll_interval = 0.02
+    server.hubspot_client = hubspot
+    server.cal_api_key = "test-cal-key"
+    server.cal_v1_url = "https://cal.test/v1"
+    server.http_clients.register("cal", transport=httpx.MockTransport(cal.handle))
+    server.retell = AsyncRetell(
+        api_key="test-retell-key",
+        base_url="https://retell.test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(retell.handle)),
+    )
+
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield Harness(server, client, hubspot, cal, retell)
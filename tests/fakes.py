@@ -0,0 +1,221 @@
+"""
+In-process stand-ins for the HubSpot SDK and the Cal.com / Retell HTTP APIs.
+
+FakeHubSpot mimics the parts of ``hubspot.HubSpot`` that server.py calls and
+is swapped in for ``server.hubspot_client``. FakeCal and FakeRetell are
+``httpx.MockTransport`` handlers, so the real httpx / Retell SDK code paths
+run without a network.
+"""
+
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+
+
+class FakeHubSpotError(Exception):
+    """Shaped like ``hubspot.crm.*.ApiException``: carries an HTTP ``status`` and response ``headers``"""
+
+    def __init__(self, status: int, reason: str, headers: dict = None):
+        super().__init__(f"({status}) {reason}")
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+
+class _Api:
+    """SDK API object: each method also gets a ``*_with_http_info`` twin returning (data, status, headers)"""
+
+    def __init__(self, owner: "FakeHubSpot", **methods):
+        for name, method in methods.items():
+            setattr(self, name, method)
+            setattr(self, f"{name}_with_http_info", owner._with_http_info(method))
+
+
+class FakeHubSpot:
+    """Records every SDK call and keeps contacts, notes and deals in memory.
+
+    ``fail(method, times, status)`` makes the next ``times`` calls of
+    ``method`` ("contacts.upsert", "notes.create", "deals.create",
+    "contacts.get_by_id") raise ``FakeHubSpotError``; a 429 carries a
+    ``Retry-After`` of ``retry_after`` seconds. Successful calls return the
+    rate-limit headers a private app gets, counting ``rate_remaining`` down.
+    Every call takes ``latency`` seconds. A note or deal batch associated
+    with an ID in ``deleted_contact_ids`` fails as a whole with a 404.
+    """
+
+    def __init__(self):
+        self.contacts = {}
+        self.notes = []
+        self.deals = []
+        self.calls = []
+        self._failures = {}
+        self._ids = itertools.count(1000)
+        self._lock = threading.RLock()
+        self.rate_limit = 100
+        self.rate_remaining = 100
+        self.retry_after = 0
+        self.latency = 0.0
+        self.deleted_contact_ids = set()
+
+        self.crm = SimpleNamespace(
+            contacts=SimpleNamespace(
+                batch_api=_Api(self, upsert=self._upsert_contacts),
+                basic_api=_Api(self, get_by_id=self._get_contact),
+            ),
+            objects=SimpleNamespace(notes=SimpleNamespace(batch_api=_Api(self, create=self._create_notes))),
+            deals=SimpleNamespace(batch_api=_Api(self, create=self._create_deals)),
+        )
+
+    def fail(self, method: str, times: int = 1, status: int = 500):
+        self._failures[method] = (times, status)
+
+    def calls_to(self, method: str) -> list:
+        return [args for name, args in self.calls if name == method]
+
+    def _with_http_info(self, method):
+        def call(*args, **kwargs):
+            data = method(*args, **kwargs)
+            with self._lock:
+                self.rate_remaining = max(self.rate_remaining - 1, 0)
+                headers = {
+                    "X-HubSpot-RateLimit-Max": str(self.rate_limit),
+                    "X-HubSpot-RateLimit-Remaining": str(self.rate_remaining),
+                    "X-HubSpot-RateLimit-Interval-Milliseconds": "10000",
+                }
+            return data, 200, headers
+        return call
+
+    def _record(self, method: str, args):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((method, args))
+            times, status = self._failures.get(method, (0, 0))
+            if times:
+                self._failures[method] = (times - 1, status)
+                headers = {"Retry-After": str(self.retry_after)} if status == 429 else None
+                raise FakeHubSpotError(status, f"injected {method} failure", headers)
+
+    def _result(self, object_id: str, item, new: bool = None):
+        return SimpleNamespace(
+            id=object_id,
+            object_write_trace_id=item.object_write_trace_id,
+            properties=dict(item.properties or {}),
+            new=new,
+        )
+
+    def _upsert_contacts(self, batch_input_simple_public_object_batch_input_upsert, **kwargs):
+        inputs = batch_input_simple_public_object_batch_input_upsert.inputs
+        self._record("contacts.upsert", [item.id for item in inputs])
+        results = []
+        with self._lock:
+            for item in inputs:
+                email = item.id.lower()
+                new = email not in self.contacts
+                if new:
+                    self.contacts[email] = str(next(self._ids))
+                results.append(self._result(self.contacts[email], item, new=new))
+        return SimpleNamespace(results=results, errors=None)
+
+    def _get_contact(self, contact_id, id_property=None, **kwargs):
+        self._record("contacts.get_by_id", contact_id)
+        if contact_id.lower() not in self.contacts:
+            raise FakeHubSpotError(404, "OBJECT_NOT_FOUND")
+        return SimpleNamespace(id=self.contacts[contact_id.lower()])
+
+    def _associated_ids(self, item) -> list:
+        return [association.to["id"] for association in (item.associations or [])]
+
+    def _check_associations(self, inputs):
+        for item in inputs:
+            if self.deleted_contact_ids.intersection(self._associated_ids(item)):
+                raise FakeHubSpotError(404, "OBJECT_NOT_FOUND")
+
+    def _create_notes(self, batch_input_simple_public_object_batch_input_for_create, **kwargs):
+        inputs = batch_input_simple_public_object_batch_input_for_create.inputs
+        self._record("notes.create", len(inputs))
+        self._check_associations(inputs)
+        results = []
+        for item in inputs:
+            note_id = str(next(self._ids))
+            self.notes.append({"id": note_id, "contact_ids": self._associated_ids(item), **item.properties})
+            results.append(self._result(note_id, item))
+        return SimpleNamespace(results=results, errors=None)
+
+    def _create_deals(self, batch_input_simple_public_object_batch_input_for_create, **kwargs):
+        inputs = batch_input_simple_public_object_batch_input_for_create.inputs
+        self._record("deals.create", len(inputs))
+        self._check_associations(inputs)
+        results = []
+        for item in inputs:
+            deal_id = str(next(self._ids))
+            self.deals.append({"id": deal_id, "contact_ids": self._associated_ids(item), **item.properties})
+            results.append(self._result(deal_id, item))
+        return SimpleNamespace(results=results, errors=None)
+
+
+class FakeCal:
+    """Cal.com v1: /slots, /event-types and POST /bookings"""
+
+    event_type_id = 42
+
+    def __init__(self):
+        self.requests = []
+        self.bookings = []
+        self.booking_status = 200
+        # Slot times booked outside the app; booking one (or any booked slot) is a 409
+        self.taken = set()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(f"{request.method} {path}")
+
+        if path.endswith("/slots"):
+            start = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            slots = {
+                (start + timedelta(days=day)).strftime("%Y-%m-%d"): [
+                    {"time": (start + timedelta(days=day, minutes=30 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+                    for i in range(8)
+                ]
+                for day in range(3)
+            }
+            return httpx.Response(200, json={"slots": slots})
+        if path.endswith("/event-types"):
+            return httpx.Response(200, json={"event_types": [{"id": self.event_type_id, "slug": "30min"}]})
+        if path.endswith("/bookings") and request.method == "POST":
+            if self.booking_status != 200:
+                return httpx.Response(self.booking_status, json={"message": "injected failure"})
+            payload = json.loads(request.content)
+            if payload["start"] in self.taken or any(b["startTime"] == payload["start"] for b in self.bookings):
+                return httpx.Response(409, json={"message": "no_available_users_found_error"})
+            booking = {"id": len(self.bookings) + 1, "uid": f"booking-{len(self.bookings) + 1}", "startTime": payload["start"]}
+            self.bookings.append({**booking, "payload": payload})
+            return httpx.Response(200, json=booking)
+        return httpx.Response(404, json={"message": f"No fake for {request.method} {path}"})
+
+
+class FakeRetell:
+    """Retell: POST /v2/create-web-call"""
+
+    def __init__(self):
+        self.web_calls = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v2/create-web-call":
+            body = json.loads(request.content)
+            call_id = f"call_{len(self.web_calls) + 1}"
+            self.web_calls.append(body)
+            return httpx.Response(201, json={
+                "call_type": "web_call",
+                "access_token": f"token_{call_id}",
+                "call_id": call_id,
+                "agent_id": body["agent_id"],
+                "agent_version": 1,
+                "call_status": "registered",
+            })
+        return httpx.Response(404, json={"message": f"No fake for {request.method} {request.url.path}"})
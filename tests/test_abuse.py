@@ -0,0 +1,99 @@
+"""Flood shedding in front of the form endpoints"""
+
+import pytest
+
+from abuse import AbuseShieldMiddleware, SlidingWindowLimiter, extract_email
+
+pytestmark = pytest.mark.anyio
+
+
+def contact(email: str) -> dict:
+    return {"name": "Flood", "email": email, "message": "Buy now"}
+
+
+async def test_ip_flood_is_rejected_before_any_write(api):
+    api.server.ip_limiter.limit = 3
+
+    statuses = [(await api.client.post("/api/contact", json=contact(f"bot{i}@example.com"))).status_code for i in range(6)]
+    assert statuses == [200, 200, 200, 429, 429, 429]
+
+    response = await api.client.post("/api/newsletter", json={"email": "bot@example.com"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert await api.db.contacts.count_documents({}) == 3
+    assert await api.db.newsletter_subscribers.count_documents({}) == 0
+
+
+async def test_repeated_email_is_rejected_across_forms(api):
+    api.server.email_limiter.limit = 2
+
+    assert (await api.client.post("/api/contact", json=contact("victim@example.com"))).status_code == 200
+    assert (await api.client.post("/api/newsletter", json={"email": "victim@example.com"})).status_code == 200
+    response = await api.client.post("/api/contact", json=contact("Victim@Example.com"))
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+    assert (await api.client.post("/api/contact", json=contact("someone.else@example.com"))).status_code == 200
+
+
+async def test_escaped_or_repeated_email_still_counts(api):
+    api.server.email_limiter.limit = 1
+    headers = {"Content-Type": "application/json"}
+
+    assert (await api.client.post("/api/newsletter", json={"email": "bot@x.com"})).status_code == 200
+    escaped = b'{"email": "b\\u006ft@x.com"}'
+    assert (await api.client.post("/api/newsletter", content=escaped, headers=headers)).status_code == 429
+    repeated = b'{"email": "decoy@x.com", "email": "bot@x.com"}'
+    assert (await api.client.post("/api/newsletter", content=repeated, headers=headers)).status_code == 429
+
+
+def test_extract_email_matches_what_the_handler_decodes():
+    assert extract_email(b'{"name": "a", "email": "a@x.com"}') == "a@x.com"
+    assert extract_email(b'{"\\u0065mail": "b\\u006ft@x.com"}') == "bot@x.com"
+    assert extract_email(b'{"name": "no email"}') is None
+    assert extract_email(b'not json \\') is None
+
+
+async def test_oversized_body_is_rejected(api):
+    response = await api.client.post("/api/contact", json={**contact("big@example.com"), "message": "x" * 20000})
+    assert response.status_code == 413
+    assert await api.db.contacts.count_documents({}) == 0
+
+
+def test_client_ip_counts_proxy_hops_from_the_right():
+    shield = AbuseShieldMiddleware(None, (), None, None, None, proxy_hops=1)
+    scope = {"client": ("10.0.0.5", 1234), "headers": [(b"x-forwarded-for", b"6.6.6.6, 203.0.113.7")]}
+    assert shield.client_ip(scope) == "203.0.113.7"
+    assert shield.client_ip({"client": ("10.0.0.5", 1234), "headers": []}) == "10.0.0.5"
+    assert AbuseShieldMiddleware(None, (), None, None, None).client_ip(scope) == "10.0.0.5"
+
+
+def test_sliding_window_weights_previous_window():
+    limiter = SlidingWindowLimiter("test", limit=4, window=10)
+    for _ in range(4):
+        assert limiter.hit("a", now=5) == 0
+    assert limiter.hit("a", now=9) == pytest.approx(1)
+
+    # Half of the previous window still overlaps: 4 * 0.5 = 2 of 4 used
+    assert limiter.hit("a", now=15) == 0
+    assert limiter.hit("a", now=15) == 0
+    assert limiter.hit("a", now=15) > 0
+
+
+def test_tracked_keys_are_bounded():
+    limiter = SlidingWindowLimiter("test", limit=1, window=60, max_keys=100)
+    for i in range(1000):
+        limiter.hit(f"10.0.{i // 256}.{i % 256}", now=1)
+    assert limiter.stats()["tracked_keys"] == 100
+
+
+async def test_unresolved_proxy_address_skips_the_ip_limit(api):
+    api.server.ip_limiter.limit = 2
+    behind_proxy = {"X-Forwarded-For": "10.1.2.3"}
+
+    statuses = [(await api.client.post("/api/contact", json=contact(f"launch{i}@example.com"), headers=behind_proxy)).status_code
+                for i in range(4)]
+    assert statuses == [200] * 4
+    statuses = [(await api.client.post("/api/contact", json=contact(f"bot{i}@example.com"), headers={"X-Forwarded-For": "203.0.113.9"})).status_code
+                for i in range(3)]
+    assert statuses == [200, 200, 429]
@@ -0,0 +1,84 @@
+"""Idempotency-Key handling on the lead endpoints"""
+
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from idempotency import IdempotencyConflict, IdempotencyStore
+
+pytestmark = pytest.mark.anyio
+
+DEMO = {"name": "Retry Lead", "email": "retry@example.com", "phone": "555-0100", "company": "Acme", "plan_type": "growth"}
+
+
+async def test_retried_demo_request_is_replayed(api):
+    headers = {"Idempotency-Key": "demo-1"}
+    first = await api.client.post("/api/demo-request", json=DEMO, headers=headers)
+    second = await api.client.post("/api/demo-request", json=DEMO, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    await api.drain_outbox()
+    assert await api.db.demo_requests.count_documents({}) == 1
+    assert len(api.cal.bookings) == 1
+    assert len(api.hubspot.notes) == 1
+
+
+async def test_concurrent_duplicates_wait_for_the_original(api):
+    headers = {"Idempotency-Key": "contact-burst"}
+    body = {"name": "Burst", "email": "burst@example.com", "message": "Hi"}
+    responses = await asyncio.gather(*(api.client.post("/api/contact", json=body, headers=headers) for _ in range(5)))
+
+    assert {r.status_code for r in responses} == {200}
+    assert sum(r.headers.get("Idempotent-Replayed") == "true" for r in responses) == 4
+    assert await api.db.contacts.count_documents({}) == 1
+
+
+async def test_key_reused_with_different_body_is_rejected(api):
+    headers = {"Idempotency-Key": "reused"}
+    assert (await api.client.post("/api/newsletter", json={"email": "a@example.com"}, headers=headers)).status_code == 200
+    response = await api.client.post("/api/newsletter", json={"email": "b@example.com"}, headers=headers)
+    assert response.status_code == 422
+    assert await api.db.newsletter_subscribers.count_documents({}) == 1
+
+
+async def test_server_errors_are_not_stored(api, monkeypatch):
+    record_lead = api.server.outbox.record_lead
+
+    async def failing(*args, **kwargs):
+        monkeypatch.setattr(api.server.outbox, "record_lead", record_lead)
+        raise RuntimeError("mongo down")
+
+    monkeypatch.setattr(api.server.outbox, "record_lead", failing)
+    headers = {"Idempotency-Key": "after-error"}
+    body = {"name": "Err", "email": "err@example.com", "message": "Hi"}
+    assert (await api.client.post("/api/contact", json=body, headers=headers)).status_code == 500
+
+    response = await api.client.post("/api/contact", json=body, headers=headers)
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+    assert await api.db.contacts.count_documents({}) == 1
+
+
+async def test_workers_share_stored_responses_and_take_over_stale_leases():
+    collection = AsyncMongoMockClient()["test"]["idempotency_keys"]
+    first = IdempotencyStore(collection, lease_ttl=0.2, poll_interval=0.01)
+    second = IdempotencyStore(collection, lease_ttl=0.2, poll_interval=0.01)
+
+    assert await first.begin("k", "fp") is None
+    waiting = asyncio.create_task(second.begin("k", "fp"))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+    await first.complete("k", "fp", 200, [["content-type", "application/json"]], b'{"ok": true}')
+    stored = await asyncio.wait_for(waiting, 1)
+    assert stored["response"]["status"] == 200
+    with pytest.raises(IdempotencyConflict):
+        await second.begin("k", "other")
+
+    # A worker that died holding the lease doesn't block the key forever
+    assert await first.begin("crashed", "fp") is None
+    assert await asyncio.wait_for(second.begin("crashed", "fp"), 1) is None
@@ -0,0 +1,233 @@
+"""Lead capture endpoints: validation, deduplication and analytics counts"""
+
+import asyncio
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_health(api):
+    response = await api.client.get("/api/")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Gretta AI API is running"}
+
+
+@pytest.mark.parametrize("payload", [
+    {
+        "name": "Sarah Johnson",
+        "email": "sarah.johnson@techcorp.com",
+        "phone": "+1-555-0123",
+        "message": "I'm interested in implementing Gretta AI for our customer service team.",
+        "company": "TechCorp Solutions",
+    },
+    {"name": "Mike Chen", "email": "mike.chen@startup.io", "message": "Looking for AI voice solutions."},
+])
+async def test_contact_form(api, payload):
+    response = await api.client.post("/api/contact", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] and "successfully" in data["message"].lower()
+    assert data["sync_status"] == "queued"
+    assert await api.db.contacts.count_documents({"email": payload["email"]}) == 1
+
+
+@pytest.mark.parametrize("payload", [
+    {"name": "Test User", "email": "invalid-email-format", "message": "Test message"},
+    {"name": "Test User"},
+])
+async def test_contact_form_validation(api, payload):
+    response = await api.client.post("/api/contact", json=payload)
+    assert response.status_code == 422
+    assert await api.db.contacts.count_documents({}) == 0
+
+
+async def test_trial_signup_deduplicates_email(api):
+    signup = {
+        "name": "Emma Rodriguez",
+        "email": "emma.rodriguez@retailchain.com",
+        "phone": "+1-555-0456",
+        "company": "RetailChain Inc",
+        "plan_type": "professional",
+    }
+    response = await api.client.post("/api/trial-signup", json=signup)
+    assert response.status_code == 200
+    assert "successful" in response.json()["message"].lower()
+
+    duplicate = {**signup, "name": "Emma Rodriguez Duplicate", "plan_type": "enterprise"}
+    response = await api.client.post("/api/trial-signup", json=duplicate)
+    assert response.status_code == 200
+    assert "already signed up" in response.json()["message"].lower()
+
+    assert await api.db.trial_signups.count_documents({}) == 1
+    assert await api.db.outbox.count_documents({"kind": "hubspot"}) == 1
+
+
+async def test_trial_signup_accepts_free_form_phone(api):
+    response = await api.client.post("/api/trial-signup", json={
+        "name": "Test User", "email": "test.phone@example.com", "phone": "invalid-phone", "plan_type": "starter"
+    })
+    assert response.status_code == 200
+
+    signup = await api.db.trial_signups.find_one({"email": "test.phone@example.com"})
+    assert signup["phone"] == "invalid-phone"
+
+
+async def test_newsletter_deduplicates_email(api):
+    response = await api.client.post("/api/newsletter", json={"email": "newsletter.subscriber@example.com"})
+    assert response.status_code == 200
+    assert "subscribed" in response.json()["message"].lower()
+
+    response = await api.client.post("/api/newsletter", json={"email": "newsletter.subscriber@example.com"})
+    assert response.status_code == 200
+    assert "already subscribed" in response.json()["message"].lower()
+
+    response = await api.client.post("/api/newsletter", json={"email": "not-an-email"})
+    assert response.status_code == 422
+
+    assert await api.db.newsletter_subscribers.count_documents({}) == 1
+
+
+@pytest.mark.parametrize("payload", [
+    {
+        "name": "Lisa Wang",
+        "email": "lisa.wang@healthcare.org",
+        "phone": "+1-555-0654",
+        "company": "HealthCare Solutions",
+        "plan_type": "enterprise",
+        "preferred_time": "Next Tuesday 2-4 PM EST",
+    },
+    {"name": "John Smith", "email": "john.smith@company.com", "phone": "+1-555-0987", "plan_type": "professional"},
+])
+async def test_demo_request(api, payload):
+    response = await api.client.post("/api/demo-request", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] and "successfully" in data["message"].lower()
+    assert data["data"]["email"] == payload["email"]
+    assert data["data"]["interested_in"] == payload["plan_type"]
+
+
+async def test_analytics_counts_new_leads(api):
+    response = await api.client.get("/api/analytics")
+    assert response.status_code == 200
+    initial = response.json()
+    assert all(initial[field] == 0 for field in (
+        "total_contacts", "total_demo_requests", "total_trial_signups", "total_newsletter_subscribers"
+    ))
+
+    await api.client.post("/api/contact", json={"name": "Analytics Test", "email": "analytics.test@example.com", "message": "Hi"})
+    await api.client.post("/api/newsletter", json={"email": "analytics.test@example.com"})
+    await api.client.post("/api/newsletter", json={"email": "analytics.test@example.com"})
+
+    updated = (await api.client.get("/api/analytics")).json()
+    assert updated["total_contacts"] == 1
+    assert updated["total_newsletter_subscribers"] == 1
+
+
+async def test_rollup_backfill_keeps_live_counts(api):
+    server = api.server
+    await asyncio.sleep(0.05)  # let the startup backfill finish, then start over with fixed times
+    await api.db.analytics_counters.delete_one({"_id": server.ROLLUP_STATE_ID})
+    await api.db.lead_rollups.delete_many({})
+
+    live_since = datetime(2030, 1, 1, 10, 30)
+    await api.db.contacts.insert_many([
+        {"id": "old", "email": "old@example.com", "created_at": datetime(2030, 1, 1, 8, 15)},
+        {"id": "early", "email": "early@example.com", "created_at": datetime(2030, 1, 1, 10, 5)},
+        {"id": "live", "email": "live@example.com", "created_at": datetime(2030, 1, 1, 10, 40)},
+    ])
+    # Two workers start; the later one saw leads arrive before the backfill ran
+    await server.register_live_rollups(live_since)
+    await server.register_live_rollups(live_since + timedelta(minutes=5))
+    await server.record_lead_created("contacts", created_at=datetime(2030, 1, 1, 10, 40))
+    await asyncio.gather(server.start_lead_rollups(), server.start_lead_rollups())
+
+    counts = {(row["granularity"], row["bucket"]): row["count"] async for row in api.db.lead_rollups.find({"form": "contact"})}
+    assert counts == {
+        ("hour", datetime(2030, 1, 1, 8)): 1,
+        ("hour", datetime(2030, 1, 1, 10)): 2,
+        ("day", datetime(2030, 1, 1)): 3,
+    }
+
+
+async def test_timeseries_window_honours_utc_offset(api):
+    await api.client.post("/api/contact", json={"name": "Offset Test", "email": "offset@example.com", "message": "Hi"})
+    now = datetime.now(timezone(timedelta(hours=2)))
+    response = await api.client.get("/api/analytics/timeseries", params={
+        "granularity": "hour", "form": "contact",
+        "start": (now - timedelta(hours=1)).isoformat(), "end": (now + timedelta(hours=1)).isoformat(),
+    })
+    assert [point["count"] for point in response.json()["points"]] == [1]
+
+
+ADMIN = {"X-API-Key": "test-admin-key"}
+
+
+async def test_bulk_import_requires_admin_key(api):
+    rows = [{"name": "Bulk Lead", "email": "bulk@example.com", "message": "Imported"}]
+    assert (await api.client.post("/api/leads/bulk?type=contact", json=rows)).status_code == 401
+    assert (await api.client.post("/api/leads/bulk?type=contact", json=rows, headers={"X-API-Key": "wrong"})).status_code == 401
+    assert await api.db.contacts.count_documents({}) == 0
+
+    response = await api.client.post("/api/leads/bulk?type=contact", json=rows, headers=ADMIN)
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+
+
+async def test_bulk_import_reports_rows_over_the_limit(api):
+    api.server.bulk_max_rows = 3
+    api.server.bulk_chunk_size = 2
+    rows = [{"name": f"Bulk {i}", "email": f"bulk{i}@example.com", "message": "Imported"} for i in range(5)]
+    response = await api.client.post("/api/leads/bulk?type=contact", json=rows, headers=ADMIN)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["created"], report["rejected"]) == (5, 3, 2)
+    assert [result["status"] for result in report["results"]] == ["created"] * 3 + ["rejected"] * 2
+    assert await api.db.contacts.count_documents({}) == 3
+
+
+async def test_bulk_import_refuses_oversized_body_before_writing(api):
+    api.server.bulk_max_body_bytes = 200
+    rows = [{"name": f"Bulk {i}", "email": f"bulk{i}@example.com", "message": "Imported"} for i in range(5)]
+    response = await api.client.post("/api/leads/bulk?type=contact", json=rows, headers=ADMIN)
+    assert response.status_code == 413
+    assert await api.db.contacts.count_documents({}) == 0
+
+
+async def test_export_requires_admin_key_and_honours_utc_offset(api):
+    await api.client.post("/api/contact", json={"name": "Export Test", "email": "export@example.com", "message": "Hi"})
+    now = datetime.now(timezone(timedelta(hours=2)))
+    params = {"fields": "email", "start": (now - timedelta(minutes=5)).isoformat(), "end": (now + timedelta(minutes=5)).isoformat()}
+    assert (await api.client.get("/api/export/contacts", params=params)).status_code == 401
+
+    response = await api.client.get("/api/export/contacts", params=params, headers=ADMIN)
+    assert response.status_code == 200
+    assert response.text.splitlines() == ['{"email": "export@example.com"}']
+
+
+async def test_export_aborts_when_the_cursor_fails(api):
+    class FailingCursor:
+        def __init__(self):
+            self.rows = iter([{"email": "first@example.com"}])
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self.rows)
+            except StopIteration:
+                raise RuntimeError("cursor killed")
+
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in api.server.stream_export(FailingCursor(), ["email"], "ndjson", compress=True):
+            chunks.append(chunk)
+    # The gzip stream was never finished, so the client can't mistake it for a complete file
+    decompressor = zlib.decompressobj(31)
+    decompressor.decompress(b"".join(chunks))
+    assert not decompressor.eof
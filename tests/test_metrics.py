@@ -0,0 +1,44 @@
+"""/metrics exposition"""
+
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_cover_routes_integrations_and_queues(api):
+    await api.client.post("/api/contact", json={"name": "Metrics", "email": "metrics@example.com", "message": "Hi"})
+    await api.client.post("/api/contact", json={"name": "Metrics"})
+    await api.drain_outbox()
+
+    response = await api.client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/contact",status="200"} 1' in body
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/contact",status="422"} 1' in body
+    assert 'integration_call_duration_seconds_count{integration="hubspot",operation="contact_upsert"} 1' in body
+    assert 'integration_call_duration_seconds_count{integration="hubspot",operation="note_create"} 1' in body
+    assert 'outbox_entries{status="done"} 1' in body
+    assert 'batcher_pending_items{batcher="hubspot_contacts"} 0' in body
+    assert "# TYPE cache_hits_total counter" in body
+    assert 'circuit_breaker_rejections_total{integration="hubspot"} 0' in body
+
+
+async def test_integration_errors_are_counted(api):
+    api.hubspot.fail("contacts.upsert", times=1)
+    api.cal.booking_status = 503
+    await api.client.post("/api/demo-request", json={
+        "name": "Lisa Wang", "email": "lisa@example.com", "phone": "+1-555-0654", "plan_type": "enterprise"
+    })
+    while "POST /v1/bookings" not in api.cal.requests:
+        await asyncio.sleep(0.01)
+    api.cal.booking_status = 200
+    await api.drain_outbox()
+
+    body = (await api.client.get("/metrics")).text
+    assert 'integration_call_errors_total{integration="hubspot",operation="contact_upsert"} 1' in body
+    assert 'integration_call_errors_total{integration="cal",operation="bookings"}' in body
+    assert 'http_requests_in_flight{method="POST",route="/api/demo-request"} 0' in body
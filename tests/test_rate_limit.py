@@ -0,0 +1,67 @@
+"""HubSpot rate-limit governor: shared budget, 429 back-off and reporting"""
+
+import asyncio
+import time
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from rate_limit import RateGovernor
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_429_is_retried_without_spending_an_attempt(api):
+    api.server.hubspot_governor.interval = 0.2
+    api.hubspot.fail("contacts.upsert", times=2, status=429)
+
+    response = await api.client.post("/api/contact", json={"name": "Rate Limited", "email": "limited@example.com", "message": "Hi"})
+    assert response.status_code == 200
+
+    stats = await api.drain_outbox()
+    assert stats["done"] >= 1 and stats["dead"] == 0
+    assert "limited@example.com" in api.hubspot.contacts
+    assert len(api.hubspot.calls_to("contacts.upsert")) == 3
+    assert api.server.hubspot_guard.breaker.stats()["recent_failures"] == 0
+    assert api.server.hubspot_governor.throttled == 2
+    entries = await api.db.outbox.find({"kind": "hubspot"}).to_list(None)
+    assert entries
+    assert all(entry["attempts"] == 1 for entry in entries)
+
+
+async def test_spent_window_queues_calls_across_workers():
+    collection = AsyncMongoMockClient()["test"]["rate_limits"]
+    workers = [RateGovernor("vendor", collection, limit=4, interval=0.25, lease_size=2, safety_margin=1) for _ in range(2)]
+
+    started = time.monotonic()
+    await asyncio.gather(*(workers[i % 2].acquire() for i in range(10)))
+    elapsed = time.monotonic() - started
+
+    # 10 calls at 4 per window spill into a third window, a full window after the first ends
+    assert elapsed >= 0.25
+    assert sum(worker.calls for worker in workers) == 10
+    async for doc in collection.find({"_id": {"$regex": "^vendor:window:"}}):
+        assert doc["used"] <= 4
+
+
+async def test_throttle_pauses_every_worker():
+    collection = AsyncMongoMockClient()["test"]["rate_limits"]
+    first, second = (RateGovernor("vendor", collection, limit=100, interval=0.5, lease_size=5) for _ in range(2))
+
+    await first.throttle({"Retry-After": "0"})
+    assert (await second.stats())["window_remaining"] == 0
+
+
+async def test_remaining_budget_is_reported(api):
+    response = await api.client.post("/api/contact", json={"name": "Budget", "email": "budget@example.com", "message": "Hi"})
+    assert response.status_code == 200
+    await api.drain_outbox()
+
+    pools = (await api.client.get("/api/health/pools")).json()
+    rate = pools["hubspot_rate_limit"]
+    assert rate["calls"] >= 1
+    assert rate["window_remaining"] < rate["limit"]
+    assert rate["vendor_remaining"] is not None
+
+    metrics = (await api.client.get("/metrics")).text
+    assert 'rate_limit_remaining{integration="hubspot",scope="window"}' in metrics
@@ -0,0 +1,107 @@
+"""Circuit breakers and adaptive deadlines around the external integrations"""
+
+import asyncio
+import time
+
+import pytest
+
+from resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError, IntegrationGuard
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+async def test_hubspot_outage_defers_sync_without_spending_attempts(api):
+    breaker = api.server.hubspot_guard.breaker
+    breaker.failure_threshold = 2
+    breaker.reset_timeout = 0.3
+    api.hubspot.fail("contacts.upsert", times=1000)
+
+    for i in range(3):
+        started = time.monotonic()
+        response = await api.client.post("/api/contact", json={"name": f"Lead {i}", "email": f"lead{i}@example.com", "message": "Hi"})
+        assert response.status_code == 200
+        assert time.monotonic() - started < 1.0
+    await wait_for(lambda: breaker.opened >= 1)
+
+    upserts_while_open = len(api.hubspot.calls_to("contacts.upsert"))
+    await asyncio.sleep(0.1)
+    assert len(api.hubspot.calls_to("contacts.upsert")) == upserts_while_open
+
+    api.hubspot.fail("contacts.upsert", times=0)
+    stats = await api.drain_outbox()
+    assert stats["done"] == 3 and stats["dead"] == 0
+    assert breaker.state == "closed"
+    async for entry in api.db.outbox.find({}):
+        assert entry["attempts"] <= 3
+
+
+async def test_retell_fails_fast_while_open(api):
+    breaker = api.server.retell_guard.breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    response = await api.client.post("/api/retell/web-call")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert api.retell.web_calls == []
+
+
+async def test_half_open_probe_closes_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    await asyncio.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_adaptive_timeout_tracks_observed_latency():
+    timeout = AdaptiveTimeout(maximum=10.0, minimum=0.5, min_samples=5)
+    assert timeout.current() == 10.0
+    for _ in range(10):
+        timeout.observe(0.1)
+    assert timeout.current() == 0.5
+    for _ in range(10):
+        timeout.observe(2.0)
+    assert timeout.current() == 4.0
+
+
+async def test_deadline_widens_when_a_healthy_vendor_slows_down():
+    guard = IntegrationGuard(
+        "test",
+        CircuitBreaker("test", failure_threshold=3, reset_timeout=0.05),
+        AdaptiveTimeout(maximum=1.0, minimum=0.02, min_samples=5),
+    )
+    latency = 0.001
+
+    async def call(deadline: float):
+        return await asyncio.wait_for(asyncio.sleep(latency, "ok"), deadline)
+
+    for _ in range(20):
+        await guard.call(call)
+    assert guard.timeout.current() == 0.02
+
+    latency = 0.05
+    successes = 0
+    for _ in range(30):
+        try:
+            await guard.call(call)
+            successes += 1
+        except (asyncio.TimeoutError, CircuitOpenError):
+            await asyncio.sleep(0.02)
+    assert successes >= 20
+    assert guard.breaker.state == "closed"
+    assert guard.timeout.current() >= latency
@@ -0,0 +1,37 @@
+"""Stored documents and responses built without pydantic round trips"""
+
+from datetime import datetime
+
+import pytest
+
+from models import DemoRequest, DemoRequestCreate
+from serialization import build_lead
+
+pytestmark = pytest.mark.anyio
+
+
+def test_build_lead_matches_revalidated_model():
+    create = DemoRequestCreate(name="Ada", email="ada@example.com", phone="555", plan_type="Starter")
+    lead, doc = build_lead(DemoRequest, create, hubspot_synced=False)
+
+    assert isinstance(lead, DemoRequest)
+    assert set(doc) == set(DemoRequest.model_fields) | {"hubspot_synced"}
+    assert isinstance(doc["created_at"], datetime) and doc["id"]
+    assert {k: v for k, v in doc.items() if k not in ("id", "created_at", "hubspot_synced")} == create.model_dump()
+    assert DemoRequest(**doc).model_dump() == lead.model_dump()
+
+
+async def test_stored_lead_and_bookings_response(api):
+    response = await api.client.post("/api/demo-request", json={
+        "name": "Ada", "email": "ada@example.com", "phone": "555", "plan_type": "Starter",
+    })
+    assert response.status_code == 200
+    stored = await api.db.demo_requests.find_one({"email": "ada@example.com"}, {"_id": 0})
+    assert stored["id"] and "cal_booking_created" in stored
+
+    bookings = await api.client.get("/api/webhook/bookings")
+    assert bookings.headers["content-type"] == "application/json"
+    assert "X-Next-Cursor" in bookings.headers
+    row = bookings.json()[0]
+    assert row["interested_in"] == "Starter"
+    assert datetime.fromisoformat(row["created_at"]) == stored["created_at"]
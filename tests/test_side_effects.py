@@ -0,0 +1,234 @@
+"""Outbox-driven HubSpot / Cal.com side effects and the Retell web call endpoint"""
+
+import asyncio
+import time
+from datetime import timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import demo_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_contact_syncs_contact_and_note(api):
+    await api.client.post("/api/contact", json={"name": "Sarah Johnson", "email": "Sarah@TechCorp.com", "message": "Demo please"})
+    stats = await api.drain_outbox()
+    assert stats["done"] == 1 and stats["dead"] == 0
+
+    hubspot_id = api.hubspot.contacts["sarah@techcorp.com"]
+    assert len(api.hubspot.notes) == 1
+    assert api.hubspot.notes[0]["contact_ids"] == [hubspot_id]
+    assert "Demo please" in api.hubspot.notes[0]["hs_note_body"]
+
+    lead = await api.db.contacts.find_one({})
+    assert lead["hubspot_synced"] is True
+    assert lead["hubspot_id"] == hubspot_id
+
+
+async def test_trial_signup_creates_deal_without_contact_lookup(api):
+    await api.client.post("/api/trial-signup", json={
+        "name": "Emma Rodriguez", "email": "emma@retailchain.com", "phone": "+1-555-0456", "plan_type": "professional"
+    })
+    await api.drain_outbox()
+
+    assert len(api.hubspot.deals) == 1
+    assert api.hubspot.deals[0]["dealname"] == "Trial Signup - professional - Emma Rodriguez"
+    assert api.hubspot.deals[0]["contact_ids"] == [api.hubspot.contacts["emma@retailchain.com"]]
+    assert api.hubspot.calls_to("contacts.get_by_id") == []
+
+
+async def test_concurrent_leads_share_batch_calls(api):
+    responses = await asyncio.gather(*(
+        api.client.post("/api/contact", json={"name": f"Lead {i}", "email": f"lead{i}@example.com", "message": "Hi"})
+        for i in range(20)
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    await api.drain_outbox()
+
+    assert len(api.hubspot.contacts) == 20
+    assert len(api.hubspot.notes) == 20
+    assert len(api.hubspot.calls_to("contacts.upsert")) < 20
+
+
+async def test_failed_sync_is_retried_without_repeating_steps(api):
+    api.hubspot.fail("notes.create", times=2)
+    await api.client.post("/api/contact", json={"name": "Retry Me", "email": "retry@example.com", "message": "Hi"})
+    stats = await api.drain_outbox()
+
+    assert stats["done"] == 1
+    assert len(api.hubspot.notes) == 1
+    # The contact upsert succeeded on the first attempt and is not repeated
+    assert len(api.hubspot.calls_to("contacts.upsert")) == 1
+    entry = await api.db.outbox.find_one({"kind": "hubspot"})
+    assert entry["attempts"] == 3
+
+
+async def test_demo_request_books_cal_slot(api):
+    await api.client.post("/api/demo-request", json=demo_payload("lisa@healthcare.org"))
+    await api.drain_outbox()
+
+    assert len(api.cal.bookings) == 1
+    booking = api.cal.bookings[0]
+    assert booking["payload"]["eventTypeId"] == api.cal.event_type_id
+    assert booking["payload"]["responses"]["email"] == "lisa@healthcare.org"
+
+    lead = await api.db.demo_requests.find_one({"email": "lisa@healthcare.org"})
+    assert lead["cal_booking_created"] is True
+    assert lead["cal_booking_uid"] == booking["uid"]
+
+
+async def test_demo_booking_retries_when_cal_is_down(api):
+    api.cal.booking_status = 503
+    await api.client.post("/api/demo-request", json=demo_payload("later@example.com"))
+    await asyncio.sleep(0.2)
+    assert api.cal.bookings == []
+    assert api.cal.requests.count("POST /v1/bookings") >= 1
+
+    api.cal.booking_status = 200
+    await api.drain_outbox()
+    assert len(api.cal.bookings) == 1
+    lead = await api.db.demo_requests.find_one({"email": "later@example.com"})
+    assert lead["cal_booking_created"] is True
+
+
+async def test_demo_request_queues_side_effects_by_default(api):
+    api.hubspot.latency = 0.5
+
+    started = time.monotonic()
+    response = await api.client.post("/api/demo-request", json=demo_payload("queued@example.com"))
+    elapsed = time.monotonic() - started
+
+    data = response.json()
+    assert data["sync_status"] == "queued"
+    assert data["side_effects"] == {"hubspot": {"status": "queued"}, "cal_booking": {"status": "queued"}}
+    assert elapsed < 0.3
+
+    await api.drain_outbox()
+    lead = await api.db.demo_requests.find_one({"email": "queued@example.com"})
+    assert lead["hubspot_synced"] is True and lead["cal_booking_created"] is True
+
+
+async def test_demo_side_effects_run_concurrently_and_are_reported(api, monkeypatch):
+    api.server.demo_side_effect_timeout = 3
+    api.hubspot.latency = 0.15
+    cal_request = api.server.cal_request
+
+    async def slow_cal_request(http_client, operation, *args, **kwargs):
+        if operation == "bookings":
+            await asyncio.sleep(0.3)
+        return await cal_request(http_client, operation, *args, **kwargs)
+
+    monkeypatch.setattr(api.server, "cal_request", slow_cal_request)
+
+    started = time.monotonic()
+    response = await api.client.post("/api/demo-request", json=demo_payload("fanout@example.com"))
+    elapsed = time.monotonic() - started
+
+    data = response.json()
+    assert data["sync_status"] == "completed"
+    assert data["side_effects"]["hubspot"] == {"status": "done", "hubspot_id": api.hubspot.contacts["fanout@example.com"]}
+    assert data["side_effects"]["cal_booking"] == {"status": "done", "cal_booking_uid": api.cal.bookings[0]["uid"]}
+    # HubSpot contact -> note (~0.3s) alongside the Cal.com booking (~0.3s), not after it
+    assert elapsed < 0.55
+
+
+async def test_slow_branch_finishes_in_the_background(api):
+    api.server.demo_side_effect_timeout = 0.05
+    api.hubspot.latency = 0.2
+    api.cal.booking_status = 503
+
+    response = await api.client.post("/api/demo-request", json=demo_payload("slow@example.com"))
+    data = response.json()
+    assert data["sync_status"] == "queued"
+    assert data["side_effects"] == {"hubspot": {"status": "pending"}, "cal_booking": {"status": "retrying"}}
+
+    api.cal.booking_status = 200
+    await api.drain_outbox()
+    assert len(api.hubspot.calls_to("contacts.upsert")) == 1
+    lead = await api.db.demo_requests.find_one({"email": "slow@example.com"})
+    assert lead["hubspot_synced"] is True and lead["cal_booking_created"] is True
+
+
+async def test_bookings_feed_cursor_returns_only_new_requests(api):
+    for i in range(3):
+        await api.client.post("/api/demo-request", json=demo_payload(f"feed{i}@example.com"))
+
+    first = await api.client.get("/api/webhook/bookings", params={"since": "2000-01-01T00:00:00", "limit": 2})
+    assert [row["email"] for row in first.json()] == ["feed0@example.com", "feed1@example.com"]
+
+    second = await api.client.get("/api/webhook/bookings", params={"cursor": first.headers["X-Next-Cursor"]})
+    assert [row["email"] for row in second.json()] == ["feed2@example.com"]
+
+    empty = await api.client.get("/api/webhook/bookings", params={"cursor": second.headers["X-Next-Cursor"]})
+    assert empty.json() == []
+
+
+async def test_empty_bookings_poll_still_returns_a_cursor(api):
+    empty = await api.client.get("/api/webhook/bookings", params={"since": "2000-01-01T00:00:00"})
+    assert empty.json() == []
+
+    await api.client.post("/api/demo-request", json=demo_payload("later@example.com"))
+    later = await api.client.get("/api/webhook/bookings", params={"cursor": empty.headers["X-Next-Cursor"]})
+    assert [row["email"] for row in later.json()] == ["later@example.com"]
+
+
+async def test_bookings_feed_since_honours_utc_offset(api):
+    await api.client.post("/api/demo-request", json=demo_payload("offset@example.com"))
+    created_at = (await api.db.demo_requests.find_one({"email": "offset@example.com"}))["created_at"]
+    plus_two = timezone(timedelta(hours=2))
+
+    before = (created_at - timedelta(minutes=1)).replace(tzinfo=timezone.utc).astimezone(plus_two)
+    after = (created_at + timedelta(minutes=1)).replace(tzinfo=timezone.utc).astimezone(plus_two)
+    assert [row["email"] for row in (await api.client.get("/api/webhook/bookings", params={"since": before.isoformat()})).json()] \
+        == ["offset@example.com"]
+    assert (await api.client.get("/api/webhook/bookings", params={"since": after.isoformat()})).json() == []
+
+
+async def test_retell_web_call(api):
+    response = await api.client.post("/api/retell/web-call")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["agent_id"] == api.server.retell_agent_id
+    assert data["access_token"].startswith("token_call_")
+    assert api.retell.web_calls == [{"agent_id": api.server.retell_agent_id}]
+
+
+async def test_stale_contact_id_only_evicts_its_own_cache_entry(api):
+    server = api.server
+    await server.hubspot_ids.set("stale@example.com", "111")
+    await server.hubspot_ids.set("fresh@example.com", "222")
+    api.hubspot.deleted_contact_ids.add("111")
+
+    stale, fresh = await asyncio.gather(server.create_hubspot_note("111", "stale"), server.create_hubspot_note("222", "fresh"))
+
+    assert stale is None and fresh is not None
+    assert [note["contact_ids"] for note in api.hubspot.notes] == [["222"]]
+    assert await server.hubspot_ids.get("stale@example.com") is None
+    assert await server.hubspot_ids.get("fresh@example.com") == "222"
+
+
+async def test_batch_errors_are_routed_to_their_items(api):
+    response = SimpleNamespace(
+        results=[SimpleNamespace(object_write_trace_id="a", id="1")],
+        errors=[SimpleNamespace(message="Contact 9 not found", category="OBJECT_NOT_FOUND", context={"objectWriteTraceId": ["b"]}),
+                SimpleNamespace(message="Rate limited", category="RATE_LIMITS", context=None)],
+    )
+    found, missing, unknown = api.server.route_batch_results(response, ["a", "b", "c"])
+    assert found.id == "1"
+    assert api.server.is_not_found(missing)
+    assert not api.server.is_not_found(unknown) and "Rate limited" in str(unknown)
+
+
+async def test_bulk_import_fills_hubspot_batches(api):
+    rows = [{"name": f"Bulk {i}", "email": f"bulk{i}@example.com", "message": "Imported"} for i in range(120)]
+    response = await api.client.post("/api/leads/bulk?type=contact", json=rows, headers={"X-API-Key": "test-admin-key"})
+    assert response.json()["created"] == 120
+    stats = await api.drain_outbox()
+
+    assert stats["done"] == 120
+    assert len(api.hubspot.contacts) == 120 and len(api.hubspot.notes) == 120
+    # 50-item batches: a handful of calls rather than one per outbox worker turn
+    assert len(api.hubspot.calls_to("contacts.upsert")) <= 6
+    assert len(api.hubspot.calls_to("notes.create")) <= 6
@@ -0,0 +1,85 @@
+"""Cal.com slot reservations shared across workers"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from slot_allocator import SlotAllocator
+from tests.conftest import demo_payload
+
+pytestmark = pytest.mark.anyio
+
+SLOTS = [f"2030-01-0{day}T09:00:00.000Z" for day in range(1, 6)]
+
+
+async def test_concurrent_demo_requests_book_distinct_slots(api):
+    responses = await asyncio.gather(*(api.client.post("/api/demo-request", json=demo_payload(f"demo{i}@example.com"))
+                                       for i in range(6)))
+    assert all(response.status_code == 200 for response in responses)
+    await api.drain_outbox()
+
+    starts = [booking["startTime"] for booking in api.cal.bookings]
+    assert len(starts) == 6
+    assert len(set(starts)) == 6
+    assert api.cal.requests.count("POST /v1/bookings") == 6
+    assert (await api.server.cal_slot_allocator.stats())["booked"] == 6
+
+
+async def test_workers_sharing_reservations_never_pick_the_same_slot(api):
+    workers = [SlotAllocator(api.db.cal_slot_reservations) for _ in range(3)]
+    reservations = await asyncio.gather(*(workers[i % 3].reserve("gretta-ai/30min", SLOTS) for i in range(7)))
+
+    granted = [reservation[0] for reservation in reservations if reservation]
+    assert sorted(granted) == SLOTS
+    assert reservations.count(None) == 2
+
+
+async def test_slot_taken_elsewhere_moves_to_the_next_one(api):
+    first = (await api.server.get_cal_slots(api.server.http_clients.get("cal"), "30min", "gretta-ai"))[0]
+    api.cal.taken.add(first)
+
+    await api.client.post("/api/demo-request", json=demo_payload("next@example.com"))
+    await api.drain_outbox()
+
+    assert len(api.cal.bookings) == 1
+    assert api.cal.bookings[0]["startTime"] != first
+    stats = await api.server.cal_slot_allocator.stats()
+    assert stats["taken"] == 1 and stats["booked"] == 1
+
+
+async def test_failed_booking_releases_its_reservation(api):
+    api.cal.booking_status = 503
+    await api.client.post("/api/demo-request", json=demo_payload("down@example.com"))
+    while "POST /v1/bookings" not in api.cal.requests:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    assert (await api.server.cal_slot_allocator.stats())["held"] == 0
+
+    api.cal.booking_status = 200
+    await api.drain_outbox()
+    assert len(api.cal.bookings) == 1
+
+
+async def test_expired_lease_is_taken_over(api):
+    crashed, survivor = SlotAllocator(api.db.cal_slot_reservations), SlotAllocator(api.db.cal_slot_reservations)
+    slot, _ = await crashed.reserve("gretta-ai/30min", SLOTS[:1])
+    assert await survivor.reserve("gretta-ai/30min", SLOTS[:1]) is None
+
+    await api.db.cal_slot_reservations.update_one({"slot": slot}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+    assert (await survivor.reserve("gretta-ai/30min", SLOTS[:1]))[0] == slot
+
+
+async def test_rejected_key_gives_the_slot_back(api):
+    first = (await api.server.get_cal_slots(api.server.http_clients.get("cal"), "30min", "gretta-ai"))[0]
+    api.cal.booking_status = 401
+    await api.client.post("/api/demo-request", json=demo_payload("badkey@example.com"))
+    while "POST /v1/bookings" not in api.cal.requests:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+
+    assert (await api.server.cal_slot_allocator.stats())["taken"] == 0
+
+    api.cal.booking_status = 200
+    await api.drain_outbox()
+    assert [booking["startTime"] for booking in api.cal.bookings] == [first]
@@ -0,0 +1,59 @@
+"""Lazy vendor SDK loading and the startup report"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import BACKEND_DIR, TEST_ENV
+
+pytestmark = pytest.mark.anyio
+
+VENDOR_SDKS = ("hubspot", "retell")
+
+
+def import_server(**env) -> dict:
+    """Import server.py in a fresh interpreter and report which vendor SDKs got loaded"""
+    script = (
+        "import sys, server; "
+        f"print(__import__('json').dumps({{m: m in sys.modules for m in {VENDOR_SDKS!r}}}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **TEST_ENV, "DB_NAME": "gretta_import_test", **env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_importing_server_does_not_load_vendor_sdks():
+    # Even with keys set, the SDKs are only imported by the lifespan handler
+    assert import_server(HUBSPOT_API_KEY="pat-test", RETELL_API_KEY="key-test") == {sdk: False for sdk in VENDOR_SDKS}
+
+
+async def test_configured_vendors_are_created_at_startup(load_server):
+    server = load_server(HUBSPOT_API_KEY="pat-test", RETELL_API_KEY="key-test")
+    assert server.hubspot_client is None and server.retell is None
+
+    async with server.app.router.lifespan_context(server.app):
+        assert server.hubspot_client is not None
+        assert server.retell is not None
+        report = server.startup_report.stats()
+        assert report["import_seconds"] > 0 and report["ready_seconds"] >= report["import_seconds"]
+        assert {"hubspot_sdk", "retell_sdk", "indexes", "outbox"} <= set(report["steps"])
+
+
+async def test_startup_report_is_exposed(api):
+    pools = (await api.client.get("/api/health/pools")).json()
+    assert pools["startup"]["ready_seconds"] is not None
+    # Vendors injected by the harness are not rebuilt
+    assert "hubspot_sdk" not in pools["startup"]["steps"]
+
+    metrics = (await api.client.get("/metrics")).text
+    assert 'startup_duration_seconds{phase="import"}' in metrics
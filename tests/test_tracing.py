@@ -0,0 +1,48 @@
+"""Request tracing: one trace per request, continued by its outbox side effects"""
+
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_demo_request_trace_covers_downstream_calls(api, tmp_path):
+    from tracing import JsonFileExporter
+
+    path = tmp_path / "traces.jsonl"
+    api.server.tracer.exporter = JsonFileExporter(str(path))
+
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    response = await api.client.post("/api/demo-request", headers={"traceparent": traceparent}, json={
+        "name": "Lisa Wang", "email": "lisa@example.com", "phone": "+1-555-0654", "plan_type": "enterprise"
+    })
+    assert response.status_code == 200
+    await api.drain_outbox()
+    await api.server.tracer.flush()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert {span["trace_id"] for span in spans} == {"0af7651916cd43dd8448eb211c80319c"}
+
+    request_span = by_name["POST /api/demo-request"]
+    assert request_span["parent_id"] == "b7ad6b7169203331"
+    assert request_span["attributes"]["http.status_code"] == 200
+
+    hubspot = by_name["outbox.hubspot"]
+    cal = by_name["outbox.cal_booking"]
+    assert hubspot["parent_id"] == request_span["span_id"]
+    assert cal["parent_id"] == request_span["span_id"]
+    assert hubspot["attributes"]["outbox.attempt"] == 1
+
+    booking = by_name["cal.bookings"]
+    assert booking["parent_id"] == cal["span_id"]
+    assert booking["attributes"]["http.status_code"] == 200
+    assert "hubspot.contact_upsert" in by_name and "hubspot.note_create" in by_name
+
+
+async def test_tracing_disabled_by_default(api):
+    response = await api.client.post("/api/newsletter", json={"email": "quiet@example.com"})
+    assert response.status_code == 200
+    stats = (await api.client.get("/api/health/pools")).json()["tracing"]
+    assert stats["enabled"] is False and stats["queued"] == 0